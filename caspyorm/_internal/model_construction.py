@@ -1,7 +1,11 @@
 # caspyorm/_internal/model_construction.py # caspyorm/_internal/model_construction.py
 
-from typing import Any, Dict
+import sys
+from typing import Any, Dict, Tuple
 from ..fields import BaseField
+from .query_builder import build_insert_cql
+from .schema_sync import build_create_table_cql, schema_fingerprint
+from .serialization import build_pydantic_field_specs, compile_model_to_dict
 
 class ModelMetaclass(type):
     """
@@ -39,6 +43,11 @@ class ModelMetaclass(type):
         if not model_fields:
             raise TypeError(f'O modelo "{name}" não definiu nenhum campo.')
 
+        # Nomes vindos do corpo da classe já são internados pelo compilador; os
+        # de modelos dinâmicos (create_model) não. Internar todos garante que as
+        # buscas por nome de campo comparem ponteiros antes de comparar strings.
+        model_fields = {sys.intern(key): value for key, value in model_fields.items()}
+
         # Define o nome da tabela (pode ser sobrescrito com __table_name__)
         table_name = attrs.get('__table_name__', name.lower() + 's')
         attrs['__table_name__'] = table_name
@@ -49,11 +58,62 @@ class ModelMetaclass(type):
 
         # Armazena os campos para fácil acesso
         attrs['model_fields'] = model_fields
+        # Ordem dos campos e das chaves primárias como tuplas, para os laços quentes
+        attrs['__caspy_field_names__'] = tuple(model_fields)
+        attrs['__caspy_pk_names__'] = tuple(schema['primary_keys'])
+        # Campos filtráveis sem ALLOW FILTERING, para o teste de pertinência em filter()
+        attrs['__caspy_indexed_names__'] = frozenset(schema['primary_keys']) | frozenset(schema.get('indexes', ()))
+
+        # Serializador para dict compilado uma única vez por conjunto de campos
+        attrs['__caspy_to_dict__'] = compile_model_to_dict(tuple(model_fields))
+
+        # O INSERT depende só do schema: formatado uma vez por modelo
+        attrs['__caspy_insert_cql__'] = build_insert_cql(schema)
+        # Idem para o CREATE TABLE e a impressão digital usados por sync_table()
+        attrs['__caspy_create_table_cql__'] = build_create_table_cql(table_name, schema)
+        attrs['__caspy_schema_fingerprint__'] = schema_fingerprint(schema)
+
+        # Tipos/defaults Pydantic dos campos e modelos gerados por as_pydantic()
+        attrs['__caspy_pydantic_specs__'] = (tuple(model_fields.items()), build_pydantic_field_specs(model_fields))
+        attrs['__caspy_pydantic_cache__'] = {}
+
+        # Plano de inicialização usado por Model.__init__
+        attrs['__caspy_init_plan__'] = mcs.build_init_plan(model_fields)
+
+        # Cada campo vira um slot: os valores não ficam num dict por instância.
+        # '__dict__' (criado sob demanda) mantém atributos extras funcionando.
+        if '__slots__' not in attrs and all(key.isidentifier() for key in model_fields):
+            extra_slots = []
+            if not any(base.__dictoffset__ for base in bases):
+                extra_slots.append('__dict__')
+            if not any(base.__weakrefoffset__ for base in bases):
+                extra_slots.append('__weakref__')
+            attrs['__slots__'] = tuple(model_fields) + ('_data',) + tuple(extra_slots)
 
         # Cria a classe final
         new_class = super().__new__(mcs, name, bases, attrs)
         return new_class
 
+    @staticmethod
+    def build_init_plan(fields: Dict[str, BaseField]) -> Tuple[tuple, ...]:
+        """
+        Pré-calcula, por campo, tudo o que `Model.__init__` consulta a cada
+        instância: (nome, default, default é chamável, required, tipo Python,
+        é coleção, conversor).
+        """
+        return tuple(
+            (
+                name,
+                field.default,
+                callable(field.default),
+                field.required,
+                field.python_type,
+                field.python_type in (list, set, dict),
+                field.to_python,
+            )
+            for name, field in fields.items()
+        )
+
     @staticmethod
     def build_schema(table_name: str, fields: Dict[str, BaseField]) -> Dict[str, Any]:
         """
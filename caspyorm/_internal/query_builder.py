@@ -1,6 +1,7 @@
 # caspyorm/_internal/query_builder.py
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Tuple, List, Optional
 
 logger = logging.getLogger(__name__)
@@ -15,50 +16,79 @@ def build_insert_cql(schema: Dict[str, Any]) -> str:
     
     return f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
 
-def build_select_cql(schema: Dict[str, Any], columns: Optional[List[str]] = None, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, ordering: Optional[List[str]] = None) -> Tuple[str, List[Any]]:
-    """Constrói uma query SELECT ... WHERE ... ORDER BY ... LIMIT com suporte a operadores."""
-    table_name = schema['table_name']
-    
-    # Seleciona colunas específicas ou '*'
-    select_clause = ", ".join(columns) if columns else "*"
-    cql = f"SELECT {select_clause} FROM {table_name}"
+def model_insert_cql(model_cls: Any) -> str:
+    """
+    Retorna o INSERT do modelo, formatado pela metaclasse; só é refeito se
+    `__table_name__` foi reatribuído depois da criação da classe.
+    """
+    table_name = model_cls.__table_name__
+    schema = model_cls.__caspy_schema__
+    if schema['table_name'] == table_name:
+        return model_cls.__caspy_insert_cql__
+    return build_insert_cql({**schema, 'table_name': table_name})
+
+# Mapeamento de nossos operadores para operadores CQL
+_OPERATOR_MAP = {
+    'exact': '=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'in': 'IN',
+}
+
+def _split_filters(filters: Dict[str, Any]) -> Tuple[Tuple[Tuple[str, Optional[int]], ...], List[Any]]:
+    """
+    Separa os filtros em uma assinatura hashable (chave e, para `__in`, a
+    quantidade de valores) e na lista de parâmetros posicionais.
+    A assinatura é o que determina o texto da query; os valores só são ligados.
+    """
+    spec = []
     params: List[Any] = []
-    
-    if filters:
-        # Mapeamento de nossos operadores para operadores CQL
-        operator_map = {
-            'exact': '=',
-            'gt': '>',
-            'gte': '>=',
-            'lt': '<',
-            'lte': '<=',
-            'in': 'IN',
-        }
-        
-        where_clauses = []
-        for key, value in filters.items():
-            # Separa o nome do campo e o operador
-            parts = key.split('__')
-            field_name = parts[0]
-            op = parts[1] if len(parts) > 1 else 'exact'
+    for key, value in filters.items():
+        if key.endswith('__in'):
+            if not isinstance(value, (list, tuple, set)):
+                raise TypeError(f"O valor para o filtro '__in' deve ser uma lista, tupla ou set, recebido: {type(value)}")
+            spec.append((key, len(value)))
+            params.extend(value)
+        else:
+            spec.append((key, None))
+            params.append(value)
+    return tuple(spec), params
 
-            if op not in operator_map:
-                raise ValueError(f"Operador de filtro não suportado: '{op}'. Operadores válidos: {list(operator_map.keys())}")
+@lru_cache(maxsize=1024)
+def _compile_where(spec: Tuple[Tuple[str, Optional[int]], ...]) -> str:
+    """Gera a cláusula WHERE para uma assinatura de filtros (uma vez por assinatura)."""
+    where_clauses = []
+    for key, in_size in spec:
+        # Separa o nome do campo e o operador
+        parts = key.split('__')
+        field_name = parts[0]
+        op = parts[1] if len(parts) > 1 else 'exact'
 
-            cql_operator = operator_map[op]
+        if op not in _OPERATOR_MAP:
+            raise ValueError(f"Operador de filtro não suportado: '{op}'. Operadores válidos: {list(_OPERATOR_MAP.keys())}")
 
-            # O operador IN espera uma tupla de placeholders
-            if cql_operator == 'IN':
-                if not isinstance(value, (list, tuple, set)):
-                    raise TypeError(f"O valor para o filtro '__in' deve ser uma lista, tupla ou set, recebido: {type(value)}")
-                placeholders = ', '.join(['?'] * len(value))
-                where_clauses.append(f"{field_name} IN ({placeholders})")
-                params.extend(value)
-            else:
-                where_clauses.append(f"{field_name} {cql_operator} ?")
-                params.append(value)
-        
-        cql += " WHERE " + " AND ".join(where_clauses)
+        cql_operator = _OPERATOR_MAP[op]
+
+        # O operador IN espera uma tupla de placeholders
+        if cql_operator == 'IN':
+            placeholders = ', '.join(['?'] * in_size)
+            where_clauses.append(f"{field_name} IN ({placeholders})")
+        else:
+            where_clauses.append(f"{field_name} {cql_operator} ?")
+
+    return " WHERE " + " AND ".join(where_clauses)
+
+@lru_cache(maxsize=1024)
+def _compile_select(table_name: str, columns: Optional[Tuple[str, ...]], spec: Tuple[Tuple[str, Optional[int]], ...], has_limit: bool, ordering: Tuple[str, ...]) -> str:
+    """Gera o texto do SELECT para uma combinação de colunas/filtros/ordenação/limite."""
+    # Seleciona colunas específicas ou '*'
+    select_clause = ", ".join(columns) if columns else "*"
+    cql = f"SELECT {select_clause} FROM {table_name}"
+
+    if spec:
+        cql += _compile_where(spec)
 
     # --- LÓGICA DE ORDENAÇÃO ---
     if ordering:
@@ -66,24 +96,46 @@ def build_select_cql(schema: Dict[str, Any], columns: Optional[List[str]] = None
         for field in ordering:
             direction = "DESC" if field.startswith('-') else "ASC"
             field_name = field.lstrip('-')
-            
-            # Verificar se o campo é uma chave de clusterização (se disponível no schema)
-            clustering_keys = schema.get('clustering_keys', [])
-            if clustering_keys and field_name not in clustering_keys:
-                logger.warning(f"AVISO: Ordenando por '{field_name}', que não é uma chave de clusterização. A query pode falhar se não for permitida.")
-
             order_clauses.append(f"{field_name} {direction}")
             
         cql += " ORDER BY " + ", ".join(order_clauses)
     # ---------------------------
 
-    if limit:
-        cql += f" LIMIT ?"
-        params.append(limit)
+    if has_limit:
+        cql += " LIMIT ?"
 
     # Adicionar ALLOW FILTERING quando há filtros
-    if filters:
+    if spec:
         cql += " ALLOW FILTERING"
+
+    return cql
+
+def build_select_cql(schema: Dict[str, Any], columns: Optional[List[str]] = None, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, ordering: Optional[List[str]] = None) -> Tuple[str, List[Any]]:
+    """
+    Constrói uma query SELECT ... WHERE ... ORDER BY ... LIMIT com suporte a operadores.
+    O texto da query é gerado uma única vez por formato (colunas, chaves dos
+    filtros, ordenação, presença de LIMIT); chamadas seguintes só montam os parâmetros.
+    """
+    spec, params = _split_filters(filters) if filters else ((), [])
+    clustering_keys = tuple(schema.get('clustering_keys', []))
+
+    # Fora do _compile_select (em cache): o aviso sai a cada query, não só na primeira
+    if ordering and clustering_keys:
+        for field in ordering:
+            field_name = field.lstrip('-')
+            if field_name not in clustering_keys:
+                logger.warning(f"AVISO: Ordenando por '{field_name}', que não é uma chave de clusterização. A query pode falhar se não for permitida.")
+
+    cql = _compile_select(
+        schema['table_name'],
+        tuple(columns) if columns else None,
+        spec,
+        bool(limit),
+        tuple(ordering) if ordering else ()
+    )
+
+    if limit:
+        params.append(limit)
             
     return cql, params
 
@@ -164,40 +216,8 @@ def build_count_cql(schema: Dict[str, Any], filters: Optional[Dict[str, Any]] =
     params: List[Any] = []
     
     if filters:
-        # Mapeamento de nossos operadores para operadores CQL
-        operator_map = {
-            'exact': '=',
-            'gt': '>',
-            'gte': '>=',
-            'lt': '<',
-            'lte': '<=',
-            'in': 'IN',
-        }
-        
-        where_clauses = []
-        for key, value in filters.items():
-            # Separa o nome do campo e o operador
-            parts = key.split('__')
-            field_name = parts[0]
-            op = parts[1] if len(parts) > 1 else 'exact'
-
-            if op not in operator_map:
-                raise ValueError(f"Operador de filtro não suportado: '{op}'. Operadores válidos: {list(operator_map.keys())}")
-
-            cql_operator = operator_map[op]
-
-            # O operador IN espera uma tupla de placeholders
-            if cql_operator == 'IN':
-                if not isinstance(value, (list, tuple, set)):
-                    raise TypeError(f"O valor para o filtro '__in' deve ser uma lista, tupla ou set, recebido: {type(value)}")
-                placeholders = ', '.join(['?'] * len(value))
-                where_clauses.append(f"{field_name} IN ({placeholders})")
-                params.extend(value)
-            else:
-                where_clauses.append(f"{field_name} {cql_operator} ?")
-                params.append(value)
-        
-        cql += " WHERE " + " AND ".join(where_clauses)
+        spec, params = _split_filters(filters)
+        cql += _compile_where(spec)
         cql += " ALLOW FILTERING"  # Necessário para filtros em campos não-PK
 
     logger.debug(f"Query COUNT gerada: {cql} com parâmetros: {params}")
@@ -1,8 +1,10 @@
 # caspyorm/_internal/schema_sync.py
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Type, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, Type, TYPE_CHECKING
 
 from ..connection import get_session
+from . import stmt_cache
 
 if TYPE_CHECKING:
     from cassandra.cluster import Session
@@ -47,6 +49,47 @@ def _get_cql_type(field_type: str) -> str:
     base_type = field_type.split('<')[0].split('(')[0].lower()
     return type_mapping.get(base_type, 'text')
 
+# Tipos CQL do banco -> tipos usados na comparação com o modelo
+_DB_TYPE_MAPPING = {
+    'text': 'text',
+    'varchar': 'text',
+    'int': 'int',
+    'bigint': 'int',
+    'float': 'float',
+    'double': 'float',
+    'boolean': 'boolean',
+    'uuid': 'uuid',
+    'timestamp': 'timestamp',
+    'date': 'date',
+    'time': 'time',
+    'blob': 'blob',
+    'decimal': 'decimal',
+    'varint': 'int',
+    'inet': 'inet',
+    'list': 'list',
+    'set': 'set',
+    'map': 'map',
+    'tuple': 'tuple',
+    'frozen': 'frozen',
+    'counter': 'counter',
+    'duration': 'duration',
+    'smallint': 'int',
+    'tinyint': 'int',
+    'timeuuid': 'uuid',
+    'ascii': 'text',
+    'json': 'text'
+}
+
+def _add_db_column(schema: Dict[str, Any], column_name: str, column_type: str, column_kind: str) -> None:
+    """Registra uma coluna do banco no dicionário de schema usado na comparação."""
+    # Simplificar tipos complexos para comparação
+    base_type = column_type.split('<')[0].split('(')[0].lower()
+    schema['fields'][column_name] = {
+        'type': _DB_TYPE_MAPPING.get(base_type, base_type),
+        'cql_type': column_type,
+        'kind': column_kind
+    }
+
 def get_cassandra_table_schema(session: Session, keyspace: str, table_name: str) -> Optional[Dict[str, Any]]:
     """
     Obtém o schema atual de uma tabela no Cassandra.
@@ -74,49 +117,8 @@ def get_cassandra_table_schema(session: Session, keyspace: str, table_name: str)
         
         for row in rows:
             column_name = row.column_name
-            column_type = row.type
             column_kind = row.kind
-            
-            # Mapear tipos CQL para tipos Python
-            type_mapping = {
-                'text': 'text',
-                'varchar': 'text',
-                'int': 'int',
-                'bigint': 'int',
-                'float': 'float',
-                'double': 'float',
-                'boolean': 'boolean',
-                'uuid': 'uuid',
-                'timestamp': 'timestamp',
-                'date': 'date',
-                'time': 'time',
-                'blob': 'blob',
-                'decimal': 'decimal',
-                'varint': 'int',
-                'inet': 'inet',
-                'list': 'list',
-                'set': 'set',
-                'map': 'map',
-                'tuple': 'tuple',
-                'frozen': 'frozen',
-                'counter': 'counter',
-                'duration': 'duration',
-                'smallint': 'int',
-                'tinyint': 'int',
-                'timeuuid': 'uuid',
-                'ascii': 'text',
-                'json': 'text'
-            }
-            
-            # Simplificar tipos complexos para comparação
-            base_type = column_type.split('<')[0].split('(')[0].lower()
-            mapped_type = type_mapping.get(base_type, base_type)
-            
-            schema['fields'][column_name] = {
-                'type': mapped_type,
-                'cql_type': column_type,
-                'kind': column_kind
-            }
+            _add_db_column(schema, column_name, row.type, column_kind)
             
             # Classificar chaves
             if column_kind == 'partition_key':
@@ -132,6 +134,37 @@ def get_cassandra_table_schema(session: Session, keyspace: str, table_name: str)
         logger.error(f"Erro ao obter schema da tabela {table_name}: {e}")
         return None
 
+def cached_table_schema(session: Session, keyspace: str, table_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Mesmo formato de `get_cassandra_table_schema`, montado a partir dos
+    metadados de schema que o driver mantém em memória, sem round-trip.
+    Retorna None se a tabela não estiver nos metadados.
+    """
+    try:
+        keyspace_meta = session.cluster.metadata.keyspaces.get(keyspace)
+        table_meta = keyspace_meta.tables.get(table_name) if keyspace_meta else None
+        if table_meta is None:
+            return None
+        partition_keys = [column.name for column in table_meta.partition_key]
+        clustering_keys = [column.name for column in table_meta.clustering_key]
+        schema = {
+            'fields': {},
+            'primary_keys': partition_keys + clustering_keys,
+            'partition_keys': partition_keys,
+            'clustering_keys': clustering_keys
+        }
+        for column_name, column in table_meta.columns.items():
+            if column_name in partition_keys:
+                kind = 'partition_key'
+            elif column_name in clustering_keys:
+                kind = 'clustering'
+            else:
+                kind = 'static' if column.is_static else 'regular'
+            _add_db_column(schema, column_name, column.cql_type, kind)
+        return schema
+    except Exception:
+        return None
+
 def apply_schema_changes(session: Session, table_name: str, model_schema: Dict[str, Any], db_schema: Dict[str, Any]) -> None:
     """
     Aplica as mudanças necessárias no schema da tabela.
@@ -236,6 +269,9 @@ def create_indexes_for_table(session: Session, table_name: str, model_schema: Di
     
     logger.info(f"Criando índices para a tabela '{table_name}'...")
     
+    # Os CREATE INDEX são enviados juntos e aguardados depois: as esperas por
+    # acordo de schema se sobrepõem em vez de somar uma por índice.
+    pending = []
     for field_name in model_schema['indexes']:
         index_name = f"{table_name}_{field_name}_idx"
         
@@ -248,7 +284,13 @@ def create_indexes_for_table(session: Session, table_name: str, model_schema: Di
         try:
             if verbose:
                 logger.info(f"  [+] Executando: {create_index_query}")
-            session.execute(create_index_query)
+            pending.append((index_name, session.execute_async(create_index_query)))
+        except Exception as e:
+            logger.error(f"  [!] ERRO ao criar índice '{index_name}': {e}")
+    
+    for index_name, future in pending:
+        try:
+            future.result()
             logger.info(f"  [✓] Índice '{index_name}' criado com sucesso")
         except Exception as e:
             logger.error(f"  [!] ERRO ao criar índice '{index_name}': {e}")
@@ -257,6 +299,72 @@ def create_indexes_for_table(session: Session, table_name: str, model_schema: Di
     
     logger.info("Criação de índices concluída.")
 
+# Prefixo do comentário da tabela que guarda a impressão digital do schema
+SCHEMA_COMMENT_PREFIX = 'caspyorm:'
+
+def schema_fingerprint(model_schema: Dict[str, Any]) -> str:
+    """Hash estável do schema do modelo (colunas, tipos, chaves e índices)."""
+    description = (
+        sorted((name, info['type']) for name, info in model_schema['fields'].items()),
+        model_schema['partition_keys'],
+        model_schema['clustering_keys'],
+        sorted(model_schema.get('indexes', [])),
+    )
+    return hashlib.blake2s(repr(description).encode(), digest_size=16).hexdigest()
+
+def _model_ddl(model_cls: Type["Model"]) -> Tuple[str, str]:
+    """
+    Retorna (impressão digital, CREATE TABLE) do modelo. Ambos são calculados
+    pela metaclasse; só são refeitos se `__table_name__` foi reatribuído.
+    """
+    table_name = model_cls.__table_name__
+    if model_cls.__caspy_schema__['table_name'] == table_name:
+        return model_cls.__caspy_schema_fingerprint__, model_cls.__caspy_create_table_cql__
+    model_schema = model_cls.__caspy_schema__
+    return schema_fingerprint(model_schema), build_create_table_cql(table_name, model_schema)
+
+def get_table_comment(session: Session, keyspace: str, table_name: str) -> Optional[str]:
+    """Retorna o comentário da tabela, ou None se ela não existir."""
+    try:
+        query = f"""
+            SELECT comment FROM system_schema.tables
+            WHERE keyspace_name = '{keyspace}'
+            AND table_name = '{table_name}'
+        """
+        row = session.execute(query).one()
+        return row.comment if row else None
+    except Exception as e:
+        logger.warning(f"Erro ao obter comentário da tabela '{table_name}': {e}")
+        return None
+
+def cached_table_comment(session: Session, keyspace: str, table_name: str) -> Optional[str]:
+    """
+    Comentário da tabela segundo os metadados de schema que o driver mantém em
+    memória (atualizados por eventos de schema e após cada DDL desta sessão).
+    Não faz round-trip; retorna None se os metadados não estiverem disponíveis.
+    """
+    try:
+        keyspace_meta = session.cluster.metadata.keyspaces.get(keyspace)
+        table_meta = keyspace_meta.tables.get(table_name) if keyspace_meta else None
+        comment = table_meta.options.get('comment') if table_meta is not None else None
+    except Exception:
+        return None
+    return comment if isinstance(comment, str) else None
+
+def mark_table_schema(session: Session, table_name: str, fingerprint: str, current_comment: Optional[str]) -> None:
+    """
+    Grava a impressão digital do schema no comentário da tabela, para que o
+    próximo sync_table() compare com os metadados em memória do driver em vez
+    de consultar o system_schema. Comentários definidos pelo usuário são
+    preservados.
+    """
+    if current_comment and not current_comment.startswith(SCHEMA_COMMENT_PREFIX):
+        return
+    try:
+        session.execute(f"ALTER TABLE {table_name} WITH comment = '{SCHEMA_COMMENT_PREFIX}{fingerprint}'")
+    except Exception as e:
+        logger.warning(f"Não foi possível registrar o schema no comentário da tabela '{table_name}': {e}")
+
 def sync_table(model_cls: Type["Model"], auto_apply: bool = False, verbose: bool = True) -> None:
     """
     Sincroniza o schema do modelo com a tabela no Cassandra.
@@ -278,12 +386,24 @@ def sync_table(model_cls: Type["Model"], auto_apply: bool = False, verbose: bool
     keyspace = session.keyspace
     if not keyspace:
         raise RuntimeError("Keyspace não está definido na sessão")
-    db_schema = get_cassandra_table_schema(session, keyspace, table_name)
+    
+    # O comentário da tabela registra o último schema sincronizado. É só uma
+    # dica: quando bate, a comparação abaixo usa os metadados que o driver já
+    # tem em memória (atualizados por eventos de schema, inclusive de DDL
+    # feito fora da CaspyORM) em vez de consultar o system_schema.
+    fingerprint, create_table_query = _model_ddl(model_cls)
+    expected_comment = f"{SCHEMA_COMMENT_PREFIX}{fingerprint}"
+    comment = cached_table_comment(session, keyspace, table_name)
+    db_schema = None
+    if comment == expected_comment:
+        db_schema = cached_table_schema(session, keyspace, table_name)
+    if db_schema is None:
+        comment = get_table_comment(session, keyspace, table_name)
+        db_schema = get_cassandra_table_schema(session, keyspace, table_name)
     
     if db_schema is None:
         # Tabela não existe, criar
         logger.info(f"Tabela '{table_name}' não encontrada. Criando...")
-        create_table_query = build_create_table_cql(table_name, model_schema)
         
         if verbose:
             logger.info(f"Executando CQL para criar tabela:\n{create_table_query}")
@@ -291,9 +411,12 @@ def sync_table(model_cls: Type["Model"], auto_apply: bool = False, verbose: bool
         try:
             session.execute(create_table_query)
             logger.info("Tabela criada com sucesso.")
+            # Uma tabela recriada (ex.: após DROP) invalida os statements antigos
+            stmt_cache.invalidate_table(session, table_name)
             
             # Criar índices após criar a tabela
             create_indexes_for_table(session, table_name, model_schema, verbose)
+            mark_table_schema(session, table_name, fingerprint, None)
             
         except Exception as e:
             logger.error(f"Erro ao criar tabela: {e}")
@@ -326,6 +449,9 @@ def sync_table(model_cls: Type["Model"], auto_apply: bool = False, verbose: bool
     
     if not has_changes:
         logger.info(f"✅ Schema da tabela '{table_name}' está sincronizado.")
+        # Gravar o comentário é DDL: só quando o chamador permitiu alterações
+        if auto_apply and comment != expected_comment:
+            mark_table_schema(session, table_name, fingerprint, comment)
         return
     
     # Há diferenças
@@ -354,7 +480,12 @@ def sync_table(model_cls: Type["Model"], auto_apply: bool = False, verbose: bool
     # Aplicar mudanças se solicitado
     if auto_apply:
         apply_schema_changes(session, table_name, model_schema, db_schema)
+        stmt_cache.invalidate_table(session, table_name)
         # Criar índices após aplicar mudanças
         create_indexes_for_table(session, table_name, model_schema, verbose)
+        # Remoções, mudanças de tipo e de chave não são aplicadas: nesses casos
+        # a tabela continua diferente do modelo e não recebe a impressão digital
+        if not (fields_to_remove or type_mismatches or pk_mismatch):
+            mark_table_schema(session, table_name, fingerprint, comment)
     else:
         logger.info("\nExecute sync_table(auto_apply=True) para aplicar as mudanças automaticamente.")
\ No newline at end of file
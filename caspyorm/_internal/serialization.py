@@ -1,8 +1,12 @@
 # caspyorm/_internal/serialization.py
 import json
+import keyword
 import uuid
+import weakref
 from datetime import datetime
-from typing import Any, Dict, List, Type, Optional
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple, Type, Optional
 import logging
 
 # Importação do Model para tipagem
@@ -12,31 +16,56 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-# Lidar com a importação opcional do Pydantic
-try:
-    import pydantic
-    from pydantic import BaseModel, create_model, Field
-    
-    # Detectar versão do Pydantic
-    PYDANTIC_V2 = pydantic.VERSION.startswith('2')
-    
-    if PYDANTIC_V2:
-        # Pydantic v2 imports
-        from pydantic import ConfigDict
-        from pydantic.fields import FieldInfo
-    else:
-        # Pydantic v1 imports
-        ConfigDict = None
-        FieldInfo = None
-        
-except ImportError:
-    PYDANTIC_V2 = False
-    # Definir stubs para evitar erros se pydantic não estiver instalado
-    class BaseModel: pass
-    def create_model(*args, **kwargs): return None
-    def Field(*args, **kwargs): pass
-    ConfigDict = None
-    FieldInfo = None
+# O Pydantic é opcional e pesado de importar (dezenas de ms); só é carregado
+# na primeira chamada que realmente precisa dele (as_pydantic e afins).
+_PYDANTIC_MISSING = "A funcionalidade de integração com Pydantic requer que o pacote 'pydantic' seja instalado."
+_PYDANTIC_V2_REQUIRED = "A funcionalidade de integração com Pydantic requer o Pydantic v2 (versão instalada: {version})."
+
+@lru_cache(maxsize=None)
+def _pydantic() -> Optional[SimpleNamespace]:
+    """Importa o Pydantic v2 sob demanda; None se ausente ou de outra versão."""
+    try:
+        import pydantic
+    except ImportError:
+        return None
+    if not pydantic.VERSION.startswith('2'):
+        return None
+    from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+    class CaspyPydanticBase(BaseModel):
+        """
+        Base comum dos modelos gerados por `as_pydantic()`, com uma única
+        configuração compartilhada. O core-schema só é montado no primeiro uso
+        (validação, schema JSON), então gerar muitos modelos na inicialização
+        não paga o custo de construção de cada um.
+        """
+        model_config = ConfigDict(extra='ignore', defer_build=True)
+
+    return SimpleNamespace(CaspyBase=CaspyPydanticBase, Field=Field, TypeAdapter=TypeAdapter, create_model=create_model)
+
+def _require_pydantic() -> SimpleNamespace:
+    """Como `_pydantic()`, mas levanta ImportError dizendo se falta o pacote ou se a versão não é a 2."""
+    p = _pydantic()
+    if p is None:
+        try:
+            import pydantic
+        except ImportError:
+            raise ImportError(_PYDANTIC_MISSING) from None
+        raise ImportError(_PYDANTIC_V2_REQUIRED.format(version=pydantic.VERSION))
+    return p
+
+def __getattr__(name: str) -> Any:
+    # PYDANTIC_V2 continua disponível como atributo do módulo, resolvido sob demanda
+    if name == 'PYDANTIC_V2':
+        return _pydantic() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# TypeAdapter(List[modelo]) por modelo Pydantic gerado, criado na primeira
+# serialização em lote; a referência fraca deixa o adapter morrer com o modelo
+_list_adapter_cache: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+# Chave de exclude do caso comum (nenhum campo excluído), sem criar um frozenset por chamada
+_NO_EXCLUDE: frozenset = frozenset()
 
 class CaspyJSONEncoder(json.JSONEncoder):
     """Encoder JSON customizado para tipos da CaspyORM."""
@@ -48,13 +77,57 @@ class CaspyJSONEncoder(json.JSONEncoder):
         # Adicione outros tipos aqui se necessário
         return super().default(obj)
 
+@lru_cache(maxsize=None)
+def compile_model_to_dict(field_names: Tuple[str, ...]) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """
+    Gera uma função que monta o dicionário com acesso direto aos atributos,
+    sem iterar sobre `model_fields` a cada chamada. Modelos com os mesmos
+    nomes de campo (na mesma ordem) compartilham a função compilada.
+    Retorna None se algum nome de campo não puder ser usado como atributo.
+    """
+    if not all(name.isidentifier() and not keyword.iskeyword(name) for name in field_names):
+        return None
+    items = ", ".join(f"{name!r}: self.{name}" for name in field_names)
+    namespace: Dict[str, Any] = {}
+    exec(f"def _to_dict(self):\n    return {{{items}}}", namespace)
+    return namespace['_to_dict']
+
+def build_pydantic_field_specs(model_fields: Dict[str, Any]) -> Tuple[Tuple[str, Any, Any, bool], ...]:
+    """
+    Resolve, uma vez por modelo, a anotação e o default Pydantic de cada campo:
+    tuplas (nome, anotação, default, é_factory) prontas para `create_model`, com
+    `...` marcando campos obrigatórios. Defaults chamáveis (`uuid.uuid4`,
+    `datetime.now`) são marcados como factory. Só usa `typing`, então não exige
+    o Pydantic. Se o tipo de um campo não puder ser resolvido, a anotação é None
+    e o default guarda o erro, reportado quando o modelo Pydantic for gerado.
+    """
+    specs = []
+    for field_name, field_obj in model_fields.items():
+        try:
+            python_type = field_obj.get_pydantic_type()
+        except (ImportError, TypeError) as e:
+            specs.append((field_name, None, e, False))
+            continue
+        if field_obj.required:
+            specs.append((field_name, python_type, ..., False))
+        elif field_obj.default is not None:
+            default = field_obj.default
+            specs.append((field_name, python_type, default, callable(default)))
+        else:
+            # Campo opcional sem default
+            specs.append((field_name, Optional[python_type], None, False))
+    return tuple(specs)
+
 def model_to_dict(instance: "Model", by_alias: bool = False) -> Dict[str, Any]:
     """Serializa uma instância de modelo para um dicionário."""
     # `by_alias` será usado no futuro
-    data = {}
-    for key in instance.model_fields.keys():
-        data[key] = getattr(instance, key, None)
-    return data
+    model_cls = type(instance)
+    to_dict = getattr(model_cls, '__caspy_to_dict__', None)
+    if to_dict is not None:
+        return to_dict(instance)
+    # Campos com nomes que não são identificadores: leitura genérica, com a
+    # classe e os nomes resolvidos uma única vez fora do laço
+    return {key: getattr(instance, key, None) for key in model_cls.__caspy_field_names__}
 
 def model_to_json(instance: "Model", by_alias: bool = False, indent: Optional[int] = None) -> str:
     """Serializa uma instância de modelo para uma string JSON."""
@@ -70,65 +143,71 @@ def generate_pydantic_model(
     exclude: Optional[List[str]] = None
 ) -> Type:
     """
-    Gera dinamicamente um modelo Pydantic a partir de um modelo CaspyORM.
-    Suporta tanto Pydantic v1 quanto v2.
+    Gera dinamicamente um modelo Pydantic (v2) a partir de um modelo CaspyORM.
+    O resultado é memorizado por classe; se os campos do modelo mudarem, a
+    assinatura muda e um novo modelo é gerado.
     """
-    if not PYDANTIC_V2:
-        raise ImportError("A funcionalidade de integração com Pydantic requer que o pacote 'pydantic' seja instalado.")
+    p = _require_pydantic()
 
-    exclude = exclude or []
-    
-    pydantic_fields: Dict[str, Any] = {}
+    # Normalizado uma vez: serve de chave de cache e de teste de pertinência O(1)
+    exclude_set = frozenset(exclude) if exclude else _NO_EXCLUDE
     caspy_fields = model_cls.model_fields  # Usar a propriedade da classe
 
-    for field_name, field_obj in caspy_fields.items():
-        if field_name in exclude:
+    # Modelos já gerados ficam num dict da própria classe (criado pela
+    # metaclasse), que morre junto com ela. Construir o core-schema do Pydantic
+    # é caro, então cada combinação (nome, exclude, campos) é gerada uma vez;
+    # os objetos de campo entram na chave por identidade.
+    cache = model_cls.__dict__.get('__caspy_pydantic_cache__')
+    fields_signature = tuple(caspy_fields.items())
+    cache_key = (name, exclude_set, fields_signature)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    # Tipos e defaults resolvidos pela metaclasse; aqui só filtramos o exclude.
+    # Se os campos mudaram desde a criação da classe, as specs são refeitas.
+    precomputed = model_cls.__dict__.get('__caspy_pydantic_specs__')
+    if precomputed is not None and precomputed[0] == fields_signature:
+        specs = precomputed[1]
+    else:
+        specs = build_pydantic_field_specs(caspy_fields)
+    
+    pydantic_fields: Dict[str, Any] = {}
+    for field_name, annotation, default, is_factory in specs:
+        if field_name in exclude_set:
             continue
-        
-        # Usa o método get_pydantic_type() que implementamos nos fields
-        try:
-            python_type = field_obj.get_pydantic_type()
-        except (ImportError, TypeError) as e:
-            logger.warning(f"Não foi possível obter o tipo Pydantic para o campo '{field_name}'. Erro: {e}")
+        if annotation is None:
+            logger.warning(f"Não foi possível obter o tipo Pydantic para o campo '{field_name}'. Erro: {default}")
             continue
-        
-        # Configurar campo baseado na versão do Pydantic
-        if PYDANTIC_V2:
-            # Pydantic v2: usar Field() para configurações
-            if field_obj.required:
-                pydantic_fields[field_name] = (python_type, Field())
-            elif field_obj.default is not None:
-                pydantic_fields[field_name] = (python_type, Field(default=field_obj.default))
-            else:
-                # Campo opcional sem default
-                from typing import Optional as OptionalType
-                pydantic_fields[field_name] = (OptionalType[python_type], Field(default=None))
-        else:
-            # Pydantic v1: usar sintaxe antiga
-            if field_obj.required:
-                pydantic_fields[field_name] = (python_type, ...)
-            elif field_obj.default is not None:
-                pydantic_fields[field_name] = (python_type, field_obj.default)
-            else:
-                # Campo opcional sem default
-                from typing import Optional as OptionalType
-                pydantic_fields[field_name] = (OptionalType[python_type], None)
+        if is_factory:
+            # Passado como default literal, o Pydantic usaria a própria função
+            # como valor; como factory, ela é chamada a cada instância
+            default = p.Field(default_factory=default)
+        pydantic_fields[field_name] = (annotation, default)
 
     model_name = name or f"{model_cls.__name__}Pydantic"
     
-    # Criar modelo com configurações específicas da versão
-    if PYDANTIC_V2:
-        # Pydantic v2: usar ConfigDict
-        pydantic_model = create_model(
-            model_name, 
-            __base__=BaseModel,
-            **pydantic_fields
-        )
-    else:
-        # Pydantic v1: sintaxe padrão
-        pydantic_model = create_model(model_name, **pydantic_fields)
-    
-    if pydantic_model is None:
-        raise RuntimeError("Falha ao criar modelo Pydantic")
+    # Só o Pydantic v2 chega aqui: a versão é verificada uma vez, em _pydantic()
+    pydantic_model = p.create_model(
+        model_name, 
+        __base__=p.CaspyBase,
+        **pydantic_fields
+    )
     
-    return pydantic_model 
\ No newline at end of file
+    if cache is not None:
+        cache[cache_key] = pydantic_model
+    return pydantic_model 
+
+def pydantic_list_adapter(pydantic_model: Type) -> Any:
+    """
+    Retorna o TypeAdapter(List[pydantic_model]) reutilizável do modelo. Montar
+    os validadores/serializadores do adapter é caro; com ele em cache, uma
+    lista de linhas vai para JSON (`dump_json`) ou é validada numa única chamada.
+    """
+    p = _require_pydantic()
+    adapter = _list_adapter_cache.get(pydantic_model)
+    if adapter is None:
+        adapter = p.TypeAdapter(List[pydantic_model])
+        _list_adapter_cache[pydantic_model] = adapter
+    return adapter
@@ -0,0 +1,73 @@
+# caspyorm/_internal/stmt_cache.py
+
+import logging
+import re
+import threading
+import weakref
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Um cache por sessão (a sessão pertence a um único cluster). Usar a própria
+# sessão como chave fraca evita reaproveitar statements de uma sessão já
+# encerrada cujo id() tenha sido reciclado.
+_cache: "weakref.WeakKeyDictionary[Any, Dict[Tuple[Any, str], Any]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+def get_or_prepare(session: Any, cql: str) -> Any:
+    """
+    Retorna o PreparedStatement de `cql` para a sessão, preparando-o apenas
+    na primeira vez. Re-preparar a mesma query a cada chamada custa um
+    round-trip e trabalho extra no coordenador.
+    """
+    key = (getattr(session, 'keyspace', None), cql)
+    with _lock:
+        statements = _cache.get(session)
+        if statements is not None:
+            prepared = statements.get(key)
+            if prepared is not None:
+                return prepared
+
+    # Preparar fora do lock: é I/O de rede. Em caso de corrida, duas threads
+    # preparam a mesma query e a última escrita prevalece, o que é inofensivo.
+    prepared = session.prepare(cql)
+    with _lock:
+        _cache.setdefault(session, {})[key] = prepared
+    logger.debug(f"Statement preparado e armazenado em cache: {cql}")
+    return prepared
+
+# Tabela referenciada por um statement: o identificador após FROM/INTO/UPDATE,
+# com prefixo `keyspace.` opcional; cada parte pode estar entre aspas
+_TABLE_REF = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+(?:(?:"[^"]+"|\w+)\s*\.\s*)?("[^"]+"|\w+)', re.IGNORECASE)
+
+def _normalize_identifier(identifier: str) -> str:
+    """Identificador CQL comparável: entre aspas mantém a caixa; sem aspas vira minúsculo."""
+    if len(identifier) > 1 and identifier[0] == identifier[-1] == '"':
+        return identifier[1:-1]
+    return identifier.lower()
+
+def _referenced_tables(cql: str) -> set:
+    """Tabelas (sem keyspace, normalizadas) referenciadas pelo statement."""
+    return {_normalize_identifier(name) for name in _TABLE_REF.findall(cql)}
+
+def invalidate_table(session: Any, table_name: str) -> None:
+    """
+    Descarta os statements da sessão que referenciam `table_name`, com ou sem
+    keyspace. Chamado após DDL na tabela, já que statements preparados guardam
+    os metadados antigos.
+    """
+    target = _normalize_identifier(table_name.rsplit('.', 1)[-1])
+    with _lock:
+        statements = _cache.get(session)
+        if not statements:
+            return
+        stale = [key for key in statements if target in _referenced_tables(key[1])]
+        for key in stale:
+            del statements[key]
+    if stale:
+        logger.debug(f"{len(stale)} statement(s) da tabela '{table_name}' removido(s) do cache.")
+
+def clear() -> None:
+    """Descarta todos os statements em cache."""
+    with _lock:
+        _cache.clear()
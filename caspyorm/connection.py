@@ -9,6 +9,9 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Reatores do driver implementados em Python puro (fallback quando o libev não está disponível)
+_PURE_PYTHON_REACTORS = frozenset({'AsyncoreConnection', 'AsyncioConnection'})
+
 class ConnectionManager:
     """Gerencia a conexão com o cluster Cassandra."""
     
@@ -19,6 +22,7 @@ class ConnectionManager:
         self.keyspace: Optional[str] = None
         self._is_connected = False
         self._is_async_connected = False  # Flag para conexão assíncrona
+        self._cluster_config: Optional[Dict[str, Any]] = None  # Parâmetros do cluster atual
     
     def connect(
         self, 
@@ -45,13 +49,17 @@ class ConnectionManager:
             if username and password:
                 auth_provider = PlainTextAuthProvider(username=username, password=password)
             
-            # Criar cluster
-            self.cluster = Cluster(
-                contact_points=contact_points,
-                port=port,
-                auth_provider=auth_provider,
-                **kwargs
-            )
+            # Reaproveitar o cluster da conexão assíncrona quando os parâmetros são os mesmos
+            config = self._config_of(contact_points, port, username, password, kwargs)
+            if not (self._is_async_connected and self.cluster is not None and self._cluster_config == config):
+                self.cluster = Cluster(
+                    contact_points=contact_points,
+                    port=port,
+                    auth_provider=auth_provider,
+                    **kwargs
+                )
+                self._cluster_config = config
+                self._log_io_reactor(self.cluster)
             
             # Conectar e obter sessão
             self.session = self.cluster.connect()
@@ -92,13 +100,19 @@ class ConnectionManager:
             if username and password:
                 auth_provider = PlainTextAuthProvider(username=username, password=password)
             
-            # Criar cluster
-            self.cluster = Cluster(
-                contact_points=contact_points,
-                port=port,
-                auth_provider=auth_provider,
-                **kwargs
-            )
+            # Reaproveitar o cluster da conexão síncrona quando os parâmetros são os
+            # mesmos: um novo Cluster refaz a conexão de controle e a leitura de
+            # topologia e metadados de schema.
+            config = self._config_of(contact_points, port, username, password, kwargs)
+            if not (self._is_connected and self.cluster is not None and self._cluster_config == config):
+                self.cluster = Cluster(
+                    contact_points=contact_points,
+                    port=port,
+                    auth_provider=auth_provider,
+                    **kwargs
+                )
+                self._cluster_config = config
+                self._log_io_reactor(self.cluster)
             
             # Conectar e obter sessão (usar a mesma sessão para operações assíncronas)
             self.async_session = self.cluster.connect()
@@ -114,6 +128,40 @@ class ConnectionManager:
             logger.error(f"Erro ao conectar ao Cassandra (async): {e}")
             raise
     
+    @staticmethod
+    def _config_of(
+        contact_points: List[str],
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Parâmetros que identificam um cluster, para decidir se ele pode ser reaproveitado."""
+        return {
+            'contact_points': list(contact_points),
+            'port': port,
+            'username': username,
+            'password': password,
+            'options': dict(kwargs),
+        }
+    
+    @staticmethod
+    def _log_io_reactor(cluster: Cluster) -> None:
+        """
+        Registra o reator de I/O usado pelo driver. Sem o libev, o driver cai
+        para um reator em Python puro (asyncore/asyncio), com bem mais overhead
+        por requisição em cargas com muitas consultas concorrentes.
+        """
+        reactor = cluster.connection_class.__name__
+        if reactor in _PURE_PYTHON_REACTORS:
+            logger.info(
+                f"cassandra-driver usando o reator em Python puro ({reactor}). Para cargas "
+                f"concorrentes, instale o libev (ex.: libev-dev) e reinstale o cassandra-driver "
+                f"para usar o LibevConnection."
+            )
+        else:
+            logger.debug(f"Reator de I/O do cassandra-driver: {reactor}")
+
     def use_keyspace(self, keyspace: str) -> None:
         """Define o keyspace ativo (síncrono)."""
         if not self.session:
@@ -197,9 +245,11 @@ class ConnectionManager:
             self.session.shutdown()
             self.session = None
         
-        if self.cluster:
+        # O cluster só é encerrado se a sessão assíncrona não o estiver usando
+        if self.cluster and not self._is_async_connected:
             self.cluster.shutdown()
             self.cluster = None
+            self._cluster_config = None
         
         self._is_connected = False
         self.keyspace = None
@@ -212,9 +262,11 @@ class ConnectionManager:
             self.async_session.shutdown()
             self.async_session = None
         
-        if self.cluster:
+        # O cluster só é encerrado se a sessão síncrona não o estiver usando
+        if self.cluster and not self._is_connected:
             self.cluster.shutdown()
             self.cluster = None
+            self._cluster_config = None
         
         self._is_async_connected = False
         self.keyspace = None
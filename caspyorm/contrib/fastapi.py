@@ -114,6 +114,25 @@ def get_async_session():
         )
 
 
+def _response_field_names(
+    model_cls: Type[Model],
+    exclude: Optional[List[str]],
+    include: Optional[List[str]]
+) -> Optional[tuple]:
+    """
+    Nomes dos campos da resposta, na ordem do modelo, ou None se não houver
+    filtro. Permite ler só esses atributos em vez de montar o dict completo e
+    depois filtrá-lo.
+    """
+    if include:
+        selected = set(include)
+        return tuple(name for name in model_cls.__caspy_field_names__ if name in selected)
+    if exclude:
+        excluded = set(exclude)
+        return tuple(name for name in model_cls.__caspy_field_names__ if name not in excluded)
+    return None
+
+
 def as_response_model(
     model_instance: Optional[Model],
     exclude: Optional[List[str]] = None,
@@ -133,16 +152,11 @@ def as_response_model(
     if model_instance is None:
         return None
     
-    data = model_instance.model_dump()
-    
-    if include:
-        # Incluir apenas os campos especificados
-        return {k: v for k, v in data.items() if k in include}
-    elif exclude:
-        # Excluir os campos especificados
-        return {k: v for k, v in data.items() if k not in exclude}
-    
-    return data
+    names = _response_field_names(type(model_instance), exclude, include)
+    if names is None:
+        # Caso comum (sem filtro): o dict do próprio model_dump
+        return model_instance.model_dump()
+    return {name: getattr(model_instance, name, None) for name in names}
 
 
 def as_response_models(
@@ -161,11 +175,20 @@ def as_response_models(
     Returns:
         Lista de dicionários com os dados dos modelos
     """
+    # Campos resolvidos uma vez por classe, não a cada instância
+    names_by_class: Dict[type, Optional[tuple]] = {}
     result = []
     for instance in model_instances:
-        response = as_response_model(instance, exclude=exclude, include=include)
-        if response is not None:
-            result.append(response)
+        if instance is None:
+            continue
+        model_cls = type(instance)
+        if model_cls not in names_by_class:
+            names_by_class[model_cls] = _response_field_names(model_cls, exclude, include)
+        names = names_by_class[model_cls]
+        if names is None:
+            result.append(instance.model_dump())
+        else:
+            result.append({name: getattr(instance, name, None) for name in names})
     return result
 
 
@@ -193,14 +216,17 @@ def create_response_model(
     # Obter o modelo Pydantic base
     pydantic_model = model_class.as_pydantic()
     
-    # Filtrar campos se necessário
+    # Filtrar campos se necessário: acesso direto por nome em model_fields.
+    # O FieldInfo é repassado inteiro para manter default_factory e afins.
+    pydantic_fields = pydantic_model.model_fields
+    names = _response_field_names(model_class, exclude, include)
     fields = {}
-    for field_name, field_info in pydantic_model.model_fields.items():
-        if include and field_name not in include:
-            continue
-        if exclude and field_name in exclude:
+    for field_name in (pydantic_fields if names is None else names):
+        field_info = pydantic_fields.get(field_name)
+        if field_info is None:
+            # Campo sem tipo Pydantic (já reportado em as_pydantic)
             continue
-        fields[field_name] = (field_info.annotation, field_info.default)
+        fields[field_name] = (field_info.annotation, field_info)
     
     # Criar nome do modelo
     model_name = name or f"{model_class.__name__}Response"
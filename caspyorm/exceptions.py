@@ -22,4 +22,31 @@ class ValidationError(CaspyORMException):
 
 class QueryError(CaspyORMException):
     """Levantada quando há um erro na construção ou execução de uma query."""
-    pass 
\ No newline at end of file
+    pass
+
+class _FieldError:
+    """
+    Descritor leve de um erro de validação de campo. Caminhos internos (em lote)
+    o retornam em vez de levantar; só a API pública o converte em exceção.
+    """
+    __slots__ = ('field', 'code', 'cause')
+
+    def __init__(self, field: str, code: str, cause: Exception = None):
+        self.field = field
+        self.code = code
+        self.cause = cause
+
+    def message(self) -> str:
+        """Formata a mensagem usada pela ValidationError correspondente."""
+        if self.code == 'required':
+            return f"Campo '{self.field}' é obrigatório e não foi fornecido."
+        return f"Campo '{self.field}' inválido: {self.cause}"
+
+    def exception(self) -> Exception:
+        """
+        Exceção levantada pela API pública: o erro original da conversão
+        (TypeError/ValueError), se houver, ou uma ValidationError.
+        """
+        if self.cause is not None:
+            return self.cause
+        return ValidationError(self.message())
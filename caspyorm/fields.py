@@ -3,6 +3,19 @@
 import uuid
 from datetime import datetime
 from typing import Any, Type
+# Aliases: List/Set/Map abaixo são os campos CaspyORM, não os genéricos do typing
+from typing import Dict as DictType, List as ListType, Set as SetType
+
+# Tipos Python dos campos de coleção (itens desses tipos sempre passam pelo conversor)
+_COLLECTION_TYPES = (list, set, dict)
+
+# Strings aceitas por Boolean.to_python (comparadas em minúsculas)
+_TRUE_STRINGS = frozenset(('true', '1', 'yes', 'on'))
+_FALSE_STRINGS = frozenset(('false', '0', 'no', 'off'))
+
+def _exact_item_type(field: "BaseField") -> Any:
+    """Tipo exato aceito sem conversão para itens de uma coleção, ou None."""
+    return None if field.python_type in _COLLECTION_TYPES else field.python_type
 
 class BaseField:
     """Classe base para todos os tipos de campo da CaspyORM."""
@@ -82,7 +95,7 @@ class UUID(BaseField):
     def __init__(self, **kwargs):
         # Se for chave primária e não tiver default, gerar UUID automaticamente
         if kwargs.get('primary_key', False) and 'default' not in kwargs:
-            kwargs['default'] = lambda: uuid.uuid4()
+            kwargs['default'] = uuid.uuid4
         super().__init__(**kwargs)
 
 class Integer(BaseField):
@@ -103,9 +116,10 @@ class Boolean(BaseField):
         if isinstance(value, bool):
             return value
         if isinstance(value, str):
-            if value.lower() in ('true', '1', 'yes', 'on'):
+            lowered = value.lower()
+            if lowered in _TRUE_STRINGS:
                 return True
-            elif value.lower() in ('false', '0', 'no', 'off'):
+            elif lowered in _FALSE_STRINGS:
                 return False
             else:
                 raise TypeError(f"Não foi possível converter string '{value}' para boolean")
@@ -164,6 +178,7 @@ class List(BaseField):
             raise TypeError("O campo interno de uma Lista deve ser uma instância de BaseField (ex: fields.Text()).")
         
         self.inner_field = inner_field
+        self._item_type = _exact_item_type(inner_field)
         super().__init__(**kwargs)
 
     def get_cql_definition(self) -> str:
@@ -176,6 +191,11 @@ class List(BaseField):
             if self.required:
                 raise ValueError(f"Campo é obrigatório mas recebeu None")
             return []  # Retorna lista vazia por conveniência
+        # Caminho rápido: se todos os itens já são do tipo exato, o all() (em C)
+        # dispensa a conversão item a item; o laço abaixo só roda para achar o erro
+        item_type = self._item_type
+        if item_type is not None and isinstance(value, (list, tuple)) and all(type(item) is item_type for item in value):
+            return list(value)
         result = []
         for item in value:
             try:
@@ -198,7 +218,6 @@ class List(BaseField):
 
     def get_pydantic_type(self) -> Type[Any]:
         """Retorna o tipo Pydantic/Python equivalente para este campo."""
-        from typing import List as ListType
         return ListType[self.inner_field.get_pydantic_type()]
 
 class Set(BaseField):
@@ -213,6 +232,7 @@ class Set(BaseField):
         if not isinstance(inner_field, BaseField):
             raise TypeError("O campo interno de um Set deve ser uma instância de BaseField (ex: fields.Text()).")
         self.inner_field = inner_field
+        self._item_type = _exact_item_type(inner_field)
         super().__init__(**kwargs)
 
     def get_cql_definition(self) -> str:
@@ -223,6 +243,9 @@ class Set(BaseField):
             if self.required:
                 raise ValueError(f"Campo é obrigatório mas recebeu None")
             return set()
+        item_type = self._item_type
+        if item_type is not None and isinstance(value, (set, frozenset, list, tuple)) and all(type(item) is item_type for item in value):
+            return set(value)
         result = set()
         for item in value:
             try:
@@ -243,7 +266,6 @@ class Set(BaseField):
         return result
 
     def get_pydantic_type(self) -> Type[Any]:
-        from typing import Set as SetType
         return SetType[self.inner_field.get_pydantic_type()]
 
 class Map(BaseField):
@@ -259,6 +281,8 @@ class Map(BaseField):
             raise TypeError("Os campos de chave e valor de um Map devem ser instâncias de BaseField.")
         self.key_field = key_field
         self.value_field = value_field
+        self._key_type = _exact_item_type(key_field)
+        self._value_type = _exact_item_type(value_field)
         super().__init__(**kwargs)
 
     def get_cql_definition(self) -> str:
@@ -269,6 +293,11 @@ class Map(BaseField):
             if self.required:
                 raise ValueError(f"Campo é obrigatório mas recebeu None")
             return {}
+        key_type, value_type = self._key_type, self._value_type
+        if (key_type is not None and value_type is not None and isinstance(value, dict)
+                and all(type(k) is key_type for k in value)
+                and all(type(v) is value_type for v in value.values())):
+            return dict(value)
         result = {}
         for k, v in value.items():
             try:
@@ -299,7 +328,6 @@ class Map(BaseField):
         return result
 
     def get_pydantic_type(self) -> Type[Any]:
-        from typing import Dict as DictType
         return DictType[self.key_field.get_pydantic_type(), self.value_field.get_pydantic_type()]
 
 # Adicione mais tipos conforme necessário, como Set, Map, etc.
\ No newline at end of file
@@ -1,15 +1,17 @@
 # caspyorm/model.py (REVISADO)
 
-from typing import Any, ClassVar, Dict, Optional, List, Type
+from typing import Any, ClassVar, Dict, Iterable, Optional, List, Sequence, Tuple, Type, Union
 from typing_extensions import Self
 import json
 import logging
+from cassandra import ConsistencyLevel
 
 from ._internal.model_construction import ModelMetaclass
 from ._internal.schema_sync import sync_table
-from ._internal.serialization import generate_pydantic_model, model_to_dict, model_to_json
+from ._internal.serialization import generate_pydantic_model, model_to_dict, model_to_json, pydantic_list_adapter
+from ._internal import stmt_cache
 from .query import QuerySet, get_one, filter_query, save_instance
-from caspyorm.exceptions import ValidationError
+from caspyorm.exceptions import ValidationError, _FieldError
 
 logger = logging.getLogger(__name__)
 
@@ -19,40 +21,51 @@ class Model(metaclass=ModelMetaclass):
     __table_name__: ClassVar[str]
     __caspy_schema__: ClassVar[Dict[str, Any]]
     model_fields: ClassVar[Dict[str, Any]]
+    __caspy_init_plan__: ClassVar[tuple]
+    __caspy_insert_cql__: ClassVar[str]
+    __caspy_field_names__: ClassVar[tuple]
+    __caspy_pk_names__: ClassVar[tuple]
+
+    # Os campos de cada modelo são declarados como slots pela metaclasse
+    __slots__ = ()
 
     # --- Métodos de API Pública ---
     def __init__(self, **kwargs: Any):
-        self.__dict__["_data"] = {}
-        for key, field_obj in self.model_fields.items():
-            value = kwargs.get(key)
-            if value is None and field_obj.default is not None:
-                value = field_obj.default() if callable(field_obj.default) else field_obj.default
-            # Validação de campo required
-            if value is None and field_obj.required:
-                raise ValidationError(f"Campo '{key}' é obrigatório e não foi fornecido.")
-            # Inicialização de coleções vazias
-            if value is None and hasattr(field_obj, 'python_type') and field_obj.python_type in (list, set, dict):
-                if field_obj.python_type is list:
-                    value = []
-                elif field_obj.python_type is set:
-                    value = set()
-                elif field_obj.python_type is dict:
-                    value = {}
-            # Validação de tipo para coleções
-            if hasattr(field_obj, 'python_type') and field_obj.python_type in (list, set, dict) and value is not None:
+        error = self._init_fields(kwargs)
+        if error is not None:
+            raise error.exception()
+
+    def _init_fields(self, kwargs: Dict[str, Any]) -> Optional[_FieldError]:
+        """
+        Preenche os campos da instância a partir de `kwargs`. Erros de
+        validação são retornados como _FieldError em vez de levantados, para que
+        caminhos em lote possam agregá-los sem o custo de criar exceções.
+        """
+        return self._init_values(map(kwargs.get, self.__caspy_field_names__))
+
+    def _init_values(self, values: Iterable[Any]) -> Optional[_FieldError]:
+        """Como `_init_fields`, mas com os valores na ordem de `__caspy_field_names__`."""
+        set_field = object.__setattr__
+        set_field(self, '_data', {})
+        # O plano é montado uma vez pela metaclasse (ver build_init_plan)
+        for (key, default, default_is_callable, required, python_type, is_collection, to_python), value in zip(self.__caspy_init_plan__, values):
+            if value is None and default is not None:
+                value = default() if default_is_callable else default
+            if value is None:
+                # Validação de campo required
+                if required:
+                    return _FieldError(key, 'required')
+                # Coleção ausente: um container vazio novo, sem passar pelo conversor
+                set_field(self, key, python_type() if is_collection else None)
+                continue
+            # Coleções sempre passam pelo conversor (validação dos itens)
+            if is_collection or not isinstance(value, python_type):
                 try:
-                    value = field_obj.to_python(value)
-                except TypeError as e:
-                    raise TypeError(str(e))
-            elif value is not None and not isinstance(value, field_obj.python_type):
-                value = field_obj.to_python(value)
-            self.__dict__[key] = value
-
-    def __setattr__(self, key: str, value: Any):
-        if key in self.model_fields:
-            self.__dict__[key] = value
-        else:
-            super().__setattr__(key, value)
+                    value = to_python(value)
+                except (TypeError, ValueError) as e:
+                    return _FieldError(key, 'invalid', e)
+            set_field(self, key, value)
+        return None
 
     def model_dump(self, by_alias: bool = False) -> Dict[str, Any]:
         return model_to_dict(self, by_alias=by_alias)
@@ -62,7 +75,7 @@ class Model(metaclass=ModelMetaclass):
 
     def save(self) -> Self:
         # VALIDAÇÃO ADICIONADA: Garante que as chaves primárias não são nulas ao salvar.
-        for pk_name in self.__caspy_schema__['primary_keys']:
+        for pk_name in self.__caspy_pk_names__:
             if getattr(self, pk_name, None) is None:
                 raise ValidationError(f"Primary key '{pk_name}' cannot be None before saving.")
         save_instance(self)
@@ -71,7 +84,7 @@ class Model(metaclass=ModelMetaclass):
     async def save_async(self) -> Self:
         """Salva (insere ou atualiza) a instância no Cassandra (assíncrono)."""
         # VALIDAÇÃO ADICIONADA: Garante que as chaves primárias não são nulas ao salvar.
-        for pk_name in self.__caspy_schema__['primary_keys']:
+        for pk_name in self.__caspy_pk_names__:
             if getattr(self, pk_name, None) is None:
                 raise ValidationError(f"Primary key '{pk_name}' cannot be None before saving.")
         
@@ -114,13 +127,13 @@ class Model(metaclass=ModelMetaclass):
         cql, params = build_update_cql(
             self.__caspy_schema__,
             update_data=validated_data,
-            pk_filters={pk: getattr(self, pk) for pk in self.__caspy_schema__['primary_keys']}
+            pk_filters={pk: getattr(self, pk) for pk in self.__caspy_pk_names__}
         )
         
         try:
             from .connection import get_session
             session = get_session()
-            prepared = session.prepare(cql)
+            prepared = stmt_cache.get_or_prepare(session, cql)
             session.execute(prepared, params)
             logger.info(f"Instância atualizada: {self.__class__.__name__} com campos: {list(validated_data.keys())}")
         except Exception as e:
@@ -164,14 +177,13 @@ class Model(metaclass=ModelMetaclass):
         cql, params = build_update_cql(
             self.__caspy_schema__,
             update_data=validated_data,
-            pk_filters={pk: getattr(self, pk) for pk in self.__caspy_schema__['primary_keys']}
+            pk_filters={pk: getattr(self, pk) for pk in self.__caspy_pk_names__}
         )
         
         try:
             from .connection import get_async_session
-            session = get_async_session()
-            prepared = session.prepare(cql)
-            session.execute_async(prepared, params).result()
+            from .query import execute_prepared_async
+            await execute_prepared_async(get_async_session(), cql, params)
             logger.info(f"Instância atualizada (ASSÍNCRONO): {self.__class__.__name__} com campos: {list(validated_data.keys())}")
         except Exception as e:
             logger.error(f"Erro ao atualizar instância (async): {e}")
@@ -185,6 +197,39 @@ class Model(metaclass=ModelMetaclass):
         instance.save()
         return instance
 
+    @classmethod
+    def create_positional(cls, values: Sequence[Any]) -> Self:
+        """
+        Cria e salva uma instância a partir de valores na ordem dos campos
+        (`__caspy_field_names__`), sem montar um dict de kwargs por chamada.
+        """
+        instance = cls._from_values(values)
+        instance.save()
+        return instance
+
+    @classmethod
+    def _from_values(cls, values: Sequence[Any]) -> Self:
+        """Constrói (sem salvar) uma instância a partir de valores posicionais."""
+        instance, error = cls._try_from_values(values)
+        if error is not None:
+            raise error.exception()
+        return instance
+
+    @classmethod
+    def _try_from_values(cls, values: Sequence[Any]) -> Tuple[Self, Optional[_FieldError]]:
+        """
+        Como `_from_values`, mas retorna o erro de campo em vez de levantá-lo,
+        para que caminhos em lote possam agregá-lo. Quantidade errada de
+        valores continua levantando ValueError.
+        """
+        if len(values) != len(cls.__caspy_field_names__):
+            raise ValueError(
+                f"{cls.__name__} espera {len(cls.__caspy_field_names__)} valores "
+                f"na ordem {cls.__caspy_field_names__}, recebeu {len(values)}."
+            )
+        instance = cls.__new__(cls)
+        return instance, instance._init_values(values)
+
     @classmethod
     async def create_async(cls, **kwargs: Any) -> Self:
         """Cria uma nova instância e a salva no banco de dados (assíncrono)."""
@@ -193,30 +238,42 @@ class Model(metaclass=ModelMetaclass):
         return instance
 
     @classmethod
-    def bulk_create(cls, instances: List["Model"]) -> List["Model"]:
+    def bulk_create(cls, instances: List[Union["Model", Dict[str, Any], tuple]], consistency_level: int = ConsistencyLevel.QUORUM) -> List["Model"]:
         """
-        Insere uma lista de instâncias de modelo em lote usando um UNLOGGED BATCH
-        para máxima performance. As instâncias são modificadas no local.
+        Insere uma lista de instâncias de modelo (ou dicts de kwargs, ou tuplas
+        na ordem dos campos) em lote,
+        com um único PreparedStatement e escritas concorrentes em `consistency_level`.
+        As escritas não são atômicas: uma falha no meio deixa as linhas anteriores gravadas.
+        Retorna as instâncias inseridas.
         Nota: Validações de Primary Key devem ser feitas antes de chamar este método.
         """
         if not instances:
             return []
         
         # Delega a lógica para um método do QuerySet
-        return QuerySet(cls).bulk_create(instances)
+        return QuerySet(cls).bulk_create(instances, consistency_level=consistency_level)
 
     @classmethod
-    async def bulk_create_async(cls, instances: List["Model"]) -> List["Model"]:
+    async def bulk_create_async(cls, instances: List[Union["Model", Dict[str, Any], tuple]], consistency_level: int = ConsistencyLevel.QUORUM) -> List["Model"]:
         """
-        Insere uma lista de instâncias de modelo em lote usando um UNLOGGED BATCH
-        para máxima performance (assíncrono). As instâncias são modificadas no local.
-        Nota: Validações de Primary Key devem ser feitas antes de chamar este método.
+        Versão assíncrona de `bulk_create`: as escritas concorrentes em
+        `consistency_level` são aguardadas sem bloquear o event loop.
+        As escritas não são atômicas: uma falha no meio deixa as linhas anteriores gravadas.
+        Retorna as instâncias inseridas.
         """
         if not instances:
             return []
         
-        # TODO: Implementar bulk_create_async no QuerySet
-        return QuerySet(cls).bulk_create(instances)
+        return await QuerySet(cls).bulk_create_async(instances, consistency_level=consistency_level)
+
+    @classmethod
+    async def bulk_save_async(cls, instances: List["Model"], batch_size: int = 100) -> List["Model"]:
+        """
+        Salva as instâncias em UNLOGGED BATCHes de até `batch_size` (máx. 100)
+        statements, um round-trip por lote em vez de um por instância (assíncrono).
+        """
+        from .query import bulk_save_instances_async
+        return await bulk_save_instances_async(instances, batch_size=batch_size)
 
     @classmethod
     def get(cls, **kwargs: Any) -> Optional["Model"]:
@@ -244,12 +301,33 @@ class Model(metaclass=ModelMetaclass):
     @classmethod
     def as_pydantic(cls, name: Optional[str] = None, exclude: Optional[List[str]] = None) -> Type[Any]:
         """Gera um modelo Pydantic (classe) a partir deste modelo CaspyORM."""
-        return generate_pydantic_model(cls, name=name, exclude=exclude or [])
+        return generate_pydantic_model(cls, name=name, exclude=exclude)
+
+    @classmethod
+    def as_pydantic_list_adapter(cls, name: Optional[str] = None, exclude: Optional[List[str]] = None) -> Any:
+        """
+        Retorna um TypeAdapter (em cache) para listas do modelo Pydantic de
+        `as_pydantic()`. Útil para serializar várias linhas de uma vez, ex.:
+        `Usuario.as_pydantic_list_adapter().dump_json([u.to_pydantic_model() for u in usuarios])`.
+        """
+        return pydantic_list_adapter(cls.as_pydantic(name=name, exclude=exclude))
 
-    def to_pydantic_model(self, exclude: Optional[List[str]] = None) -> Any:
-        """Converte esta instância do modelo CaspyORM para uma instância Pydantic."""
-        PydanticModel = self.as_pydantic(exclude=exclude or [])
-        return PydanticModel(**self.model_dump())
+    def to_pydantic_model(self, exclude: Optional[List[str]] = None, validate: bool = True) -> Any:
+        """
+        Converte esta instância do modelo CaspyORM para uma instância Pydantic,
+        validando os valores (atributos podem ter sido reatribuídos sem validação).
+        Com `validate=False` a instância é montada com `model_construct`, sem
+        revalidar: mais rápido, mas só seguro se os valores não foram alterados.
+        """
+        PydanticModel = self.as_pydantic(exclude=exclude)
+        if exclude:
+            # Lê só os campos do modelo gerado, sem montar o dict completo para filtrar
+            data = {key: getattr(self, key) for key in PydanticModel.model_fields}
+        else:
+            data = self.model_dump()
+        if validate:
+            return PydanticModel.model_validate(data)
+        return PydanticModel.model_construct(**data)
 
     # --- Métodos de Schema ---
     @classmethod
@@ -263,12 +341,12 @@ class Model(metaclass=ModelMetaclass):
         sync_table(cls, auto_apply=auto_apply, verbose=verbose)
 
     def __repr__(self) -> str:
-        attrs = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.model_fields)
+        attrs = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__caspy_field_names__)
         return f"{self.__class__.__name__}({attrs})"
 
     def delete(self) -> None:
         """Deleta esta instância específica do banco de dados."""
-        pk_fields = self.__caspy_schema__['primary_keys']
+        pk_fields = self.__caspy_pk_names__
         if not pk_fields:
             raise RuntimeError("Não é possível deletar um modelo sem chave primária.")
         
@@ -286,7 +364,7 @@ class Model(metaclass=ModelMetaclass):
 
     async def delete_async(self) -> None:
         """Deleta esta instância específica do banco de dados (assíncrono)."""
-        pk_fields = self.__caspy_schema__['primary_keys']
+        pk_fields = self.__caspy_pk_names__
         if not pk_fields:
             raise RuntimeError("Não é possível deletar um modelo sem chave primária.")
         
@@ -326,12 +404,12 @@ class Model(metaclass=ModelMetaclass):
             field_name,
             add=add,
             remove=remove,
-            pk_filters={pk: getattr(self, pk) for pk in self.__caspy_schema__['primary_keys']}
+            pk_filters={pk: getattr(self, pk) for pk in self.__caspy_pk_names__}
         )
         try:
             from .connection import get_session
             session = get_session()
-            prepared = session.prepare(cql)
+            prepared = stmt_cache.get_or_prepare(session, cql)
             session.execute(prepared, params)
             logger.info(f"Coleção '{field_name}' atualizada para a instância: {self}")
         except Exception as e:
@@ -1,12 +1,18 @@
 # caspyorm/query.py (REVISADO E AMPLIADO)
 
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 from typing_extensions import Self
 from caspyorm.connection import get_session, get_async_session, execute
-from caspyorm._internal import query_builder
-from cassandra.query import BatchStatement, SimpleStatement
+from caspyorm._internal import query_builder, stmt_cache
+from caspyorm.exceptions import ValidationError
+from caspyorm.utils import bulk_uuids
 from cassandra import ConsistencyLevel
+from cassandra.concurrent import execute_concurrent
+from cassandra.query import BatchStatement, BatchType, SimpleStatement
+import asyncio
 import logging
+import operator
+import uuid
 import warnings
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -14,21 +20,92 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-def _map_row_to_instance(model_cls, row_dict):
-    """Mapeia um dicionário (linha do DB) para uma instância do modelo."""
-    return model_cls(**row_dict)
+# Limite de statements por BATCH: acima disso o coordenador passa a emitir
+# avisos/erros de batch_size e o lote deixa de ser vantajoso
+MAX_BATCH_SIZE = 100
+
+async def _await_response(response_future: Any) -> Any:
+    """
+    Aguarda um ResponseFuture do driver sem bloquear o event loop e retorna o
+    ResultSet. Os callbacks rodam na thread de I/O do driver, então o resultado
+    volta ao loop via call_soon_threadsafe; `.result()` só é chamado depois que
+    a resposta chegou e não bloqueia.
+    """
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def _resolve(_=None):
+        if not done.done():
+            done.set_result(None)
+
+    def on_done(_):
+        loop.call_soon_threadsafe(_resolve)
+
+    response_future.add_callbacks(on_done, on_done)
+    await done
+    return response_future.result()
+
+async def execute_prepared_async(session: Any, cql: str, params: Any = None) -> Any:
+    """
+    Prepara `cql` (com cache por sessão), executa com `params` e aguarda o
+    ResultSet sem bloquear o event loop. Ponto único dos caminhos assíncronos.
+    """
+    prepared = stmt_cache.get_or_prepare(session, cql)
+    return await _await_response(session.execute_async(prepared, params))
+
+def _bind_rows(prepared: Any, params_list: List[tuple], consistency_level: int) -> Iterator[tuple]:
+    """
+    Liga cada linha ao PreparedStatement com o nível de consistência pedido,
+    sem alterar o statement em cache (compartilhado com save()). Gera os pares
+    (statement, parâmetros) esperados por `execute_concurrent`.
+    """
+    for params in params_list:
+        bound = prepared.bind(params)
+        bound.consistency_level = consistency_level
+        yield bound, None
+
+def _rows_to_instances(model_cls, column_names, rows) -> Iterator["Model"]:
+    """
+    Converte as linhas (tuplas) do driver em instâncias do modelo. A posição de
+    cada campo em `column_names` é resolvida uma única vez por result set; por
+    linha, os valores saem de um itemgetter (em C) já na ordem de
+    `__caspy_field_names__`, sem o dict intermediário de `row._asdict()`.
+    """
+    index = {name: i for i, name in enumerate(column_names)}
+    positions = [index.get(name) for name in model_cls.__caspy_field_names__]
+    if None in positions:
+        # Coluna ausente no SELECT (ex.: campo novo ainda não sincronizado)
+        def get_values(row):
+            return [None if i is None else row[i] for i in positions]
+    elif len(positions) == 1:
+        def get_values(row):
+            return (row[positions[0]],)
+    else:
+        get_values = operator.itemgetter(*positions)
+
+    new = model_cls.__new__
+    for row in rows:
+        instance = new(model_cls)
+        error = instance._init_values(get_values(row))
+        if error is not None:
+            raise error.exception()
+        yield instance
 
 class QuerySet:
     """
     Representa uma query preguiçosa (lazy) que pode ser encadeada.
     Suporta operações síncronas e assíncronas.
     """
+    # Cada filter()/limit()/order_by() cria um clone; sem __dict__ por instância
+    __slots__ = ('model_cls', '_filters', '_limit', '_ordering', '_result_cache', '_non_indexed')
+
     def __init__(self, model_cls: Type["Model"]):
         self.model_cls = model_cls
         self._filters: Dict[str, Any] = {}
         self._limit: Optional[int] = None
         self._ordering: List[str] = []  # NOVO: lista de campos para ordenação
         self._result_cache: Optional[List["Model"]] = None
+        self._non_indexed: frozenset = frozenset()  # campos filtrados sem índice/PK
 
     def __iter__(self):
         """Executa a query quando o queryset é iterado (síncrono)."""
@@ -56,6 +133,7 @@ class QuerySet:
         new_qs._filters = self._filters.copy()
         new_qs._limit = self._limit
         new_qs._ordering = self._ordering[:]  # NOVO: copiar lista de ordenação
+        new_qs._non_indexed = self._non_indexed
         return new_qs
 
     def _execute_query(self):
@@ -69,9 +147,9 @@ class QuerySet:
         )
         session = get_session()
         # Sempre preparar a query para garantir suporte a parâmetros posicionais
-        prepared = session.prepare(cql)
+        prepared = stmt_cache.get_or_prepare(session, cql)
         result_set = session.execute(prepared, params)
-        self._result_cache = [_map_row_to_instance(self.model_cls, row._asdict()) for row in result_set]
+        self._result_cache = list(_rows_to_instances(self.model_cls, result_set.column_names, result_set))
         logger.debug(f"Executando query (SÍNCRONO): {cql} com parâmetros: {params}")
 
     async def _execute_query_async(self):
@@ -85,9 +163,8 @@ class QuerySet:
         )
         session = get_async_session()
         # Preparar a query de forma síncrona, executar de forma assíncrona
-        prepared = session.prepare(cql)
-        result_set = session.execute_async(prepared, params).result()
-        self._result_cache = [_map_row_to_instance(self.model_cls, row._asdict()) for row in result_set]
+        result_set = await execute_prepared_async(session, cql, params)
+        self._result_cache = list(_rows_to_instances(self.model_cls, result_set.column_names, result_set))
         logger.debug(f"Executando query (ASSÍNCRONO): {cql} com parâmetros: {params}")
 
     # --- Métodos de API Pública do QuerySet (Síncronos) ---
@@ -97,12 +174,14 @@ class QuerySet:
         clone = self._clone()
         
         # --- AVISO PARA CAMPOS NÃO INDEXADOS ---
-        schema = self.model_cls.__caspy_schema__
-        indexed_fields = set(schema['primary_keys']) | set(schema.get('indexes', []))
+        indexed_fields = self.model_cls.__caspy_indexed_names__
         
-        for key in kwargs:
-            field_name = key.split('__')[0]  # Remove sufixos como __exact, __contains, etc.
-            if field_name not in indexed_fields:
+        # Remove sufixos como __exact, __gte, etc.; só campos ainda não avisados
+        # neste QuerySet geram (e formatam) um novo aviso
+        new_fields = {key.split('__')[0] for key in kwargs} - indexed_fields - self._non_indexed
+        if new_fields:
+            clone._non_indexed = self._non_indexed | new_fields
+            for field_name in new_fields:
                 warnings.warn(
                     f"O campo '{field_name}' não é uma chave primária nem está indexado. "
                     f"A consulta pode ser ineficiente ou falhar sem 'ALLOW FILTERING'.",
@@ -170,13 +249,28 @@ class QuerySet:
         )
         
         session = get_session()
-        prepared = session.prepare(cql)
+        prepared = stmt_cache.get_or_prepare(session, cql)
         result_set = session.execute(prepared, params)
         
         # O resultado de COUNT(*) é uma única linha com uma coluna chamada 'count'.
         row = result_set.one()
         return row.count if row else 0
 
+    def count_future(self) -> Any:
+        """
+        Dispara a query `SELECT COUNT(*)` sem esperar a resposta e retorna o
+        ResponseFuture do driver (síncrono). Permite sobrepor várias contagens
+        independentes; o total sai de `future.result().one().count`.
+        """
+        cql, params = query_builder.build_count_cql(
+            self.model_cls.__caspy_schema__,
+            filters=self._filters
+        )
+
+        session = get_session()
+        prepared = stmt_cache.get_or_prepare(session, cql)
+        return session.execute_async(prepared, params)
+
     async def count_async(self) -> int:
         """
         Executa uma query `SELECT COUNT(*)` otimizada e retorna o número de resultados (assíncrono).
@@ -192,13 +286,81 @@ class QuerySet:
         )
         
         session = get_async_session()
-        prepared = session.prepare(cql)
-        result_set = session.execute_async(prepared, params).result()
+        result_set = await execute_prepared_async(session, cql, params)
         
         # O resultado de COUNT(*) é uma única linha com uma coluna chamada 'count'.
         row = result_set.one()
         return row.count if row else 0
 
+    def _build_values_cql(self, fields: tuple, flat: bool):
+        """Valida os campos de values_list() e monta o SELECT apenas dessas colunas."""
+        if not fields:
+            raise ValueError("values_list() requer pelo menos um campo.")
+        if flat and len(fields) > 1:
+            raise ValueError("values_list(flat=True) só aceita um único campo.")
+        model_fields = self.model_cls.__caspy_schema__['fields']
+        for field_name in fields:
+            if field_name not in model_fields:
+                raise ValueError(f"Campo '{field_name}' não existe no modelo {self.model_cls.__name__}")
+
+        return query_builder.build_select_cql(
+            self.model_cls.__caspy_schema__,
+            columns=list(fields),
+            filters=self._filters,
+            limit=self._limit,
+            ordering=self._ordering
+        )
+
+    def values_list(self, *fields: str, flat: bool = False) -> List[Any]:
+        """
+        Retorna apenas os valores das colunas pedidas, sem instanciar modelos (síncrono).
+        Com `flat=True` (um único campo) retorna uma lista de valores; caso
+        contrário, uma lista de tuplas na ordem dos campos.
+        """
+        cql, params = self._build_values_cql(fields, flat)
+        session = get_session()
+        prepared = stmt_cache.get_or_prepare(session, cql)
+        result_set = session.execute(prepared, params)
+        if flat:
+            return [row[0] for row in result_set]
+        return [tuple(row) for row in result_set]
+
+    async def values_list_async(self, *fields: str, flat: bool = False) -> List[Any]:
+        """
+        Retorna apenas os valores das colunas pedidas, sem instanciar modelos (assíncrono).
+        Com `flat=True` (um único campo) retorna uma lista de valores; caso
+        contrário, uma lista de tuplas na ordem dos campos.
+        """
+        cql, params = self._build_values_cql(fields, flat)
+        session = get_async_session()
+        result_set = await execute_prepared_async(session, cql, params)
+        if flat:
+            return [row[0] for row in result_set]
+        return [tuple(row) for row in result_set]
+
+    def values(self, *fields: str) -> List[Dict[str, Any]]:
+        """
+        Retorna as linhas como dicts com as colunas pedidas (todas, se nenhuma
+        for informada), sem instanciar modelos nem validar campos (síncrono).
+        """
+        fields = fields or self.model_cls.__caspy_field_names__
+        cql, params = self._build_values_cql(fields, flat=False)
+        session = get_session()
+        prepared = stmt_cache.get_or_prepare(session, cql)
+        result_set = session.execute(prepared, params)
+        return [row._asdict() for row in result_set]
+
+    async def values_async(self, *fields: str) -> List[Dict[str, Any]]:
+        """
+        Retorna as linhas como dicts com as colunas pedidas (todas, se nenhuma
+        for informada), sem instanciar modelos nem validar campos (assíncrono).
+        """
+        fields = fields or self.model_cls.__caspy_field_names__
+        cql, params = self._build_values_cql(fields, flat=False)
+        session = get_async_session()
+        result_set = await execute_prepared_async(session, cql, params)
+        return [row._asdict() for row in result_set]
+
     def exists(self) -> bool:
         """
         Verifica de forma otimizada se algum registro corresponde aos filtros,
@@ -219,7 +381,7 @@ class QuerySet:
         )
         
         session = get_session()
-        prepared = session.prepare(cql)
+        prepared = stmt_cache.get_or_prepare(session, cql)
         result_set = session.execute(prepared, params)
         
         # Se .one() retornar uma linha, significa que existe. Se retornar None, não existe.
@@ -245,8 +407,7 @@ class QuerySet:
         )
         
         session = get_async_session()
-        prepared = session.prepare(cql)
-        result_set = session.execute_async(prepared, params).result()
+        result_set = await execute_prepared_async(session, cql, params)
         
         # Se .one() retornar uma linha, significa que existe. Se retornar None, não existe.
         return result_set.one() is not None
@@ -272,7 +433,7 @@ class QuerySet:
             filters=self._filters
         )
         logger.debug(f"Executando DELETE (SÍNCRONO): {cql} com parâmetros: {params}")
-        prepared = session.prepare(cql)
+        prepared = stmt_cache.get_or_prepare(session, cql)
         session.execute(prepared, params)
         return 0  # Cassandra não retorna número de linhas deletadas
 
@@ -298,10 +459,33 @@ class QuerySet:
             filters=self._filters
         )
         logger.debug(f"Executando DELETE (ASSÍNCRONO): {cql} com parâmetros: {params}")
-        prepared = session.prepare(cql)
-        session.execute_async(prepared, params).result()
+        await execute_prepared_async(session, cql, params)
         return 0  # Cassandra não retorna número de linhas deletadas
 
+    def iterator(self, fetch_size: int = 5000) -> Iterator["Model"]:
+        """
+        Percorre os resultados página a página, sem guardá-los no cache (síncrono).
+        Só uma página de `fetch_size` linhas fica em memória por vez; o driver
+        busca a próxima página quando a atual se esgota.
+        """
+        if self._result_cache is not None:
+            yield from self._result_cache
+            return
+
+        cql, params = query_builder.build_select_cql(
+            self.model_cls.__caspy_schema__,
+            columns=None,  # Seleciona todas as colunas
+            filters=self._filters,
+            limit=self._limit,
+            ordering=self._ordering
+        )
+        session = get_session()
+        prepared = stmt_cache.get_or_prepare(session, cql)
+        statement = prepared.bind(params)
+        statement.fetch_size = fetch_size
+        result_set = session.execute(statement)
+        yield from _rows_to_instances(self.model_cls, result_set.column_names, result_set)
+
     def page(self, page_size: int = 100, paging_state: Any = None):
         """
         Retorna uma página de resultados e o paging_state para a próxima página (síncrono).
@@ -319,12 +503,13 @@ class QuerySet:
             ordering=self._ordering
         )
         session = get_session()
-        prepared = session.prepare(cql)
+        prepared = stmt_cache.get_or_prepare(session, cql)
         statement = prepared.bind(params)
         statement.fetch_size = page_size
-        # TODO: Implementar paging_state corretamente
-        result_set = session.execute(statement)
-        resultados = [_map_row_to_instance(self.model_cls, row._asdict()) for row in result_set]
+        result_set = session.execute(statement, paging_state=paging_state)
+        # Materializa só as linhas desta página: iterar o ResultSet inteiro faria
+        # o driver buscar (e converter) todas as páginas seguintes
+        resultados = list(_rows_to_instances(self.model_cls, result_set.column_names, result_set.current_rows))
         next_paging_state = result_set.paging_state
         return resultados, next_paging_state
 
@@ -345,59 +530,153 @@ class QuerySet:
             ordering=self._ordering
         )
         session = get_async_session()
-        prepared = session.prepare(cql)
+        prepared = stmt_cache.get_or_prepare(session, cql)
         statement = prepared.bind(params)
         statement.fetch_size = page_size
-        # TODO: Implementar paging_state corretamente
-        result_set = session.execute_async(statement).result()
-        resultados = [_map_row_to_instance(self.model_cls, row._asdict()) for row in result_set]
+        result_set = await _await_response(session.execute_async(statement, paging_state=paging_state))
+        # Materializa só as linhas desta página: iterar o ResultSet inteiro faria
+        # o driver buscar (e converter) todas as páginas seguintes
+        resultados = list(_rows_to_instances(self.model_cls, result_set.column_names, result_set.current_rows))
         next_paging_state = result_set.paging_state
         return resultados, next_paging_state
 
-    def bulk_create(self, instances: List["Model"]) -> List["Model"]:
+    def _build_bulk_rows(self, instances: Iterable[Union["Model", Dict[str, Any], tuple]]) -> Tuple[List["Model"], List[tuple]]:
+        """
+        Valida e monta as linhas de bulk_create/bulk_create_async: retorna as
+        instâncias e os parâmetros do INSERT de cada uma, na ordem das colunas.
+        """
+        model_cls = self.model_cls
+        instances = list(instances)
+        
+        # Só campos com `default=uuid.uuid4` (detectados no plano de __init__ da
+        # metaclasse): os UUIDs que faltam nas linhas em dict saem de um único
+        # os.urandom e entram como valores, sem copiar nem alterar os dicts.
+        # Outros defaults seguem o caminho normal de _init_values.
+        uuid_positions = [i for i, entry in enumerate(model_cls.__caspy_init_plan__) if entry[1] is uuid.uuid4]
+        new_ids = None
+        if uuid_positions:
+            uuid_names = [model_cls.__caspy_field_names__[i] for i in uuid_positions]
+            missing = sum(
+                row.get(name) is None
+                for row in instances if isinstance(row, dict)
+                for name in uuid_names
+            )
+            if missing:
+                new_ids = iter(bulk_uuids(missing))
+        
+        built = []
+        errors = []
+        for position, instance in enumerate(instances):
+            if not isinstance(instance, model_cls):
+                data = instance
+                if isinstance(data, tuple):
+                    # Tupla com os valores na ordem de __caspy_field_names__
+                    instance, error = model_cls._try_from_values(data)
+                elif new_ids is not None:
+                    values = list(map(data.get, model_cls.__caspy_field_names__))
+                    for i in uuid_positions:
+                        if values[i] is None:
+                            values[i] = next(new_ids)
+                    instance = model_cls.__new__(model_cls)
+                    error = instance._init_values(values)
+                else:
+                    instance = model_cls.__new__(model_cls)
+                    error = instance._init_fields(data)
+                if error is not None:
+                    # Agrega os erros (campo obrigatório ausente ou conversão inválida)
+                    # e levanta uma única exceção no final
+                    errors.append((position, error))
+                    continue
+            built.append(instance)
+        
+        if errors:
+            details = "; ".join(f"#{position}: {error.message()}" for position, error in errors[:10])
+            raise ValidationError(f"{len(errors)} registro(s) inválido(s) em bulk_create. {details}")
+        
+        instances = built
+        if not instances:
+            return [], []
+        
+        columns = self.model_cls.__caspy_field_names__
+        
+        # Os parâmetros de cada linha saem de uma única chamada a attrgetter
+        # (em C), já na ordem das colunas, sem montar um dict por instância
+        get_params = operator.attrgetter(*columns)
+        if len(columns) > 1:
+            params_list = list(map(get_params, instances))
+        else:
+            params_list = [(value,) for value in map(get_params, instances)]
+        
+        # Validação crucial: garantir que as chaves primárias não são nulas.
+        # Cada coluna da PK é varrida em C (map + `in`), antes de qualquer I/O;
+        # a linha inválida só é localizada quando há erro
+        for pk_name in self.model_cls.__caspy_pk_names__:
+            values = list(map(operator.itemgetter(columns.index(pk_name)), params_list))
+            if None in values:
+                instance = instances[values.index(None)]
+                raise ValueError(f"Primary key '{pk_name}' não pode ser nula em bulk_create. Instância: {instance}")
+        
+        return instances, params_list
+
+    def bulk_create(self, instances: Iterable[Union["Model", Dict[str, Any], tuple]], concurrency: int = 32, consistency_level: int = ConsistencyLevel.QUORUM) -> List["Model"]:
         """
         Lógica interna para inserir instâncias em lote.
+        Aceita instâncias do modelo, dicts de kwargs ou tuplas com os valores na
+        ordem de `__caspy_field_names__`. Todas as linhas usam um
+        único PreparedStatement e são enviadas com `execute_concurrent`, com até
+        `concurrency` requisições em voo, cada uma com `consistency_level`
+        (QUORUM por padrão, como o BATCH usado antes).
+        Ao contrário do BATCH, as escritas são independentes e não atômicas: se
+        uma falhar, as linhas já confirmadas permanecem gravadas.
         """
+        instances, params_list = self._build_bulk_rows(instances)
         if not instances:
             return []
         
-        session = get_session()
         table_name = self.model_cls.__table_name__
         
-        # Pega a query de inserção e os nomes das colunas uma única vez
-        data_sample = instances[0].model_dump()
-        columns = list(data_sample.keys())
-        placeholders = ", ".join(['?'] * len(columns))
-        insert_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
-        
-        prepared_statement = session.prepare(insert_query)
-        
-        # Usar UNLOGGED BATCH para performance
-        batch = BatchStatement(consistency_level=ConsistencyLevel.QUORUM)
+        # A query de inserção depende só do schema: é a mesma para todas as linhas
+        session = get_session()
+        prepared_statement = stmt_cache.get_or_prepare(session, query_builder.model_insert_cql(self.model_cls))
         
-        for instance in instances:
-            # Validação crucial: garantir que as chaves primárias não são nulas
-            for pk_name in self.model_cls.__caspy_schema__['primary_keys']:
-                if getattr(instance, pk_name, None) is None:
-                    # Alternativamente, poderíamos gerar o UUID aqui se for o caso
-                    raise ValueError(f"Primary key '{pk_name}' não pode ser nula em bulk_create. Instância: {instance}")
-            
-            data = instance.model_dump()
-            params = [data.get(col) for col in columns]  # Garante a ordem correta
-            batch.add(prepared_statement, params)
-            
-            # Limite prático para o tamanho do batch para evitar timeouts
-            if len(batch) >= 100:
-                session.execute(batch)
-                batch.clear()
-
-        # Executa o batch final com os registros restantes
-        if len(batch) > 0:
-            session.execute(batch)
+        # Escritas independentes em paralelo: N round-trips sequenciais viram
+        # ceil(N / concurrency), sem o custo de coordenação de um BATCH multi-partição
+        execute_concurrent(
+            session, _bind_rows(prepared_statement, params_list, consistency_level),
+            concurrency=concurrency, raise_on_first_error=True
+        )
             
         logger.info(f"{len(instances)} instâncias inseridas em lote na tabela '{table_name}'.")
         return instances
 
+    async def bulk_create_async(self, instances: Iterable[Union["Model", Dict[str, Any], tuple]], concurrency: int = 32, consistency_level: int = ConsistencyLevel.QUORUM) -> List["Model"]:
+        """
+        Como `bulk_create`, mas assíncrono: as escritas são aguardadas no event
+        loop, com até `concurrency` em voo, sem bloqueá-lo. Também não são atômicas.
+        """
+        instances, params_list = self._build_bulk_rows(instances)
+        if not instances:
+            return []
+        
+        session = get_async_session()
+        if not session:
+            raise RuntimeError("Não há conexão assíncrona ativa com o Cassandra")
+        prepared_statement = stmt_cache.get_or_prepare(session, query_builder.model_insert_cql(self.model_cls))
+        
+        limit = asyncio.Semaphore(concurrency)
+        
+        async def write(statement):
+            async with limit:
+                await _await_response(session.execute_async(statement))
+        
+        await asyncio.gather(*(
+            write(statement)
+            for statement, _ in _bind_rows(prepared_statement, params_list, consistency_level)
+        ))
+        
+        logger.info(f"{len(instances)} instâncias inseridas em lote na tabela '{self.model_cls.__table_name__}' (ASSÍNCRONO).")
+        return instances
+
 # --- Funções do módulo que interagem com o QuerySet ---
 
 def save_instance(instance) -> None:
@@ -408,19 +687,13 @@ def save_instance(instance) -> None:
     table_name = instance.__class__.__table_name__
     data = instance.model_dump()
     
-    # Construir query INSERT com placeholders parametrizados
-    columns = list(data.keys())
-    placeholders = ", ".join(['?'] * len(columns))
-    
-    insert_query = f"""
-        INSERT INTO {table_name} ({', '.join(columns)})
-        VALUES ({placeholders})
-    """
+    # INSERT parametrizado montado pela metaclasse (mesma ordem de model_dump)
+    insert_query = query_builder.model_insert_cql(instance.__class__)
     
     # Preparar e executar com parâmetros
     try:
         session = get_session()
-        prepared = session.prepare(insert_query)
+        prepared = stmt_cache.get_or_prepare(session, insert_query)
         session.execute(prepared, list(data.values()))
         logger.info(f"Instância salva na tabela '{table_name}'")
     except Exception as e:
@@ -435,25 +708,65 @@ async def save_instance_async(instance) -> None:
     table_name = instance.__class__.__table_name__
     data = instance.model_dump()
     
-    # Construir query INSERT com placeholders parametrizados
-    columns = list(data.keys())
-    placeholders = ", ".join(['?'] * len(columns))
-    
-    insert_query = f"""
-        INSERT INTO {table_name} ({', '.join(columns)})
-        VALUES ({placeholders})
-    """
+    # INSERT parametrizado montado pela metaclasse (mesma ordem de model_dump)
+    insert_query = query_builder.model_insert_cql(instance.__class__)
     
     # Preparar e executar com parâmetros de forma assíncrona
     try:
         session = get_async_session()
-        prepared = session.prepare(insert_query)
-        session.execute_async(prepared, list(data.values())).result()
+        await execute_prepared_async(session, insert_query, list(data.values()))
         logger.info(f"Instância salva na tabela '{table_name}' (ASSÍNCRONO)")
     except Exception as e:
         logger.error(f"Erro ao salvar instância (async): {e}")
         raise
 
+async def bulk_save_instances_async(instances: Iterable["Model"], batch_size: int = MAX_BATCH_SIZE) -> List["Model"]:
+    """
+    Salva as instâncias em UNLOGGED BATCHes de até `batch_size` statements
+    (assíncrono). Cada modelo usa o seu INSERT preparado; os lotes são enviados
+    juntos e aguardados no final, então N round-trips viram ceil(N / batch_size).
+    """
+    if not 0 < batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size deve estar entre 1 e {MAX_BATCH_SIZE}; recebido {batch_size}.")
+    
+    instances = list(instances)
+    if not instances:
+        return []
+    
+    session = get_async_session()
+    if not session:
+        raise RuntimeError("Não há conexão assíncrona ativa com o Cassandra")
+    
+    # Agrupa por modelo: um lote só mistura linhas do mesmo INSERT preparado
+    by_model: Dict[Type["Model"], List["Model"]] = {}
+    for instance in instances:
+        model_cls = instance.__class__
+        for pk_name in model_cls.__caspy_pk_names__:
+            if getattr(instance, pk_name, None) is None:
+                raise ValidationError(f"Primary key '{pk_name}' cannot be None before saving.")
+        by_model.setdefault(model_cls, []).append(instance)
+    
+    futures = []
+    for model_cls, group in by_model.items():
+        prepared = stmt_cache.get_or_prepare(session, query_builder.model_insert_cql(model_cls))
+        columns = model_cls.__caspy_field_names__
+        get_params = operator.attrgetter(*columns)
+        for start in range(0, len(group), batch_size):
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for instance in group[start:start + batch_size]:
+                params = get_params(instance) if len(columns) > 1 else (get_params(instance),)
+                batch.add(prepared.bind(params))
+            futures.append(session.execute_async(batch))
+    
+    try:
+        await asyncio.gather(*(_await_response(future) for future in futures))
+    except Exception as e:
+        logger.error(f"Erro ao salvar instâncias em lote (async): {e}")
+        raise
+    
+    logger.info(f"{len(instances)} instâncias salvas em {len(futures)} lote(s) (ASSÍNCRONO)")
+    return instances
+
 def get_one(model_cls: Type["Model"], **kwargs: Any) -> Optional["Model"]:
     """Busca um único registro usando um QuerySet."""
     return QuerySet(model_cls).filter(**kwargs).first()
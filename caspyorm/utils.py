@@ -0,0 +1,18 @@
+# caspyorm/utils.py
+
+import os
+import uuid
+from typing import List
+
+def bulk_uuids(n: int) -> List[uuid.UUID]:
+    """
+    Gera `n` UUIDs versão 4 com uma única leitura de `os.urandom`, em vez de
+    uma leitura por UUID como em `uuid.uuid4()`.
+    """
+    if n <= 0:
+        return []
+    raw = bytearray(os.urandom(16 * n))
+    # Bits de versão (4) e de variante (RFC 4122) ajustados em todos os blocos de uma vez
+    raw[6::16] = bytes((byte & 0x0F) | 0x40 for byte in raw[6::16])
+    raw[8::16] = bytes((byte & 0x3F) | 0x80 for byte in raw[8::16])
+    return [uuid.UUID(bytes=bytes(raw[i:i + 16])) for i in range(0, 16 * n, 16)]
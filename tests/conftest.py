@@ -1,13 +1,68 @@
+import inspect
+import os
 import pytest
+import pytest_asyncio
+from pytest_asyncio import plugin as pytest_asyncio_plugin
 import logging
-from caspyorm import connection
+from caspyorm import connection, Model
+from caspyorm._internal import serialization, stmt_cache
+from caspyorm._internal.schema_sync import build_create_table_cql, build_create_index_cql
 
 # Configurar logging para os testes
 logger = logging.getLogger("caspyorm.tests")
 
+# Binários dos kernels numba (`cache=True`) num diretório fixo na raiz do
+# repositório, em vez de espalhados pelos __pycache__: um CI pode guardar esse
+# único diretório entre execuções. O numba lê a variável no import, que só
+# acontece na coleta dos módulos de teste, depois deste conftest.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(_REPO_ROOT, '.numba_cache'))
+
 # Usamos um nome de keyspace específico para os testes para não interferir com dados de produção/dev
 TEST_KEYSPACE = "caspyorm_test_suite"
 
+# Opções do Cluster para a suíte de testes. O cluster de teste tem um único nó,
+# então o schema converge assim que o coordenador confirma o DDL: a janela de
+# debounce dos eventos (padrão de 1s) só atrasa cada sync_table()/DROP, e a
+# espera por acordo de schema pode ser curta.
+TEST_CLUSTER_OPTIONS = {
+    'schema_event_refresh_window': 0,
+    'topology_event_refresh_window': 0,
+    'status_event_refresh_window': 0,
+    'max_schema_agreement_wait': 2,
+}
+
+# Os testes assíncronos aguardam trabalho trivial, então o custo de despacho do
+# loop domina; com o uvloop instalado ele substitui o loop padrão. O
+# pytest-asyncio 1.x troca o loop pelo hook pytest_asyncio_loop_factories (e
+# avisa a cada execução se o fixture event_loop_policy for sobrescrito); as
+# versões anteriores não conhecem o hook, que o pytest rejeitaria, e só
+# aceitam o fixture.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+if uvloop is not None:
+    if hasattr(getattr(pytest_asyncio_plugin, 'PytestAsyncioSpecs', None), 'pytest_asyncio_loop_factories'):
+        def pytest_asyncio_loop_factories(config, item):
+            """Cria os event loops dos testes assíncronos com o uvloop."""
+            return {'uvloop': uvloop.new_event_loop}
+    else:
+        @pytest.fixture(scope="session")
+        def event_loop_policy():
+            """Política de event loop usada pelo pytest-asyncio em cada worker."""
+            return uvloop.EventLoopPolicy()
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_caspyorm():
+    """
+    Faz uma única vez, no início da sessão (em cada worker), o import que a
+    CaspyORM adia até o primeiro uso: o Pydantic, carregado por as_pydantic()
+    e afins. Assim o custo não é atribuído ao primeiro teste que o usa.
+    """
+    serialization._pydantic()
+
 @pytest.fixture(scope="session", autouse=True)
 def cassandra_session():
     """
@@ -19,7 +74,7 @@ def cassandra_session():
     """
     try:
         # Conecta a um keyspace de teste, que será criado se não existir
-        connection.connect(contact_points=['127.0.0.1'], keyspace=TEST_KEYSPACE)
+        connection.connect(contact_points=['127.0.0.1'], keyspace=TEST_KEYSPACE, **TEST_CLUSTER_OPTIONS)
         logger.info(f"Conectado ao Cassandra no keyspace de teste '{TEST_KEYSPACE}'")
         
         # Garante que a conexão está ativa
@@ -50,15 +105,16 @@ def session(cassandra_session):
     # ela reavalia `connection.get_session()` para cada teste.
     return connection.get_session()
 
-@pytest.fixture(scope="session", autouse=True)
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
 async def cassandra_async_session(cassandra_session):
     """
     Fixture do Pytest que estabelece a conexão assíncrona com o Cassandra.
-    Executa após a conexão síncrona estar estabelecida.
+    Executa após a conexão síncrona estar estabelecida. Roda no loop de sessão
+    (loop_scope), já que o padrão dos fixtures assíncronos é o loop por função.
     """
     try:
         # Conecta de forma assíncrona usando o mesmo keyspace
-        await connection.connect_async(contact_points=['127.0.0.1'], keyspace=TEST_KEYSPACE)
+        await connection.connect_async(contact_points=['127.0.0.1'], keyspace=TEST_KEYSPACE, **TEST_CLUSTER_OPTIONS)
         logger.info(f"Conectado ao Cassandra (ASSÍNCRONO) no keyspace de teste '{TEST_KEYSPACE}'")
         
         # Garante que a conexão assíncrona está ativa
@@ -80,4 +136,71 @@ def async_session(cassandra_async_session):
     """
     Fixture de escopo de FUNÇÃO. Fornece a sessão assíncrona para cada teste.
     """
-    return connection.get_async_session() 
\ No newline at end of file
+    return connection.get_async_session()
+
+
+@pytest.fixture(scope="function")
+def reset_table(session):
+    """
+    Retorna uma função que deixa a tabela de um modelo vazia para o teste.
+    Se a tabela já existe com as mesmas colunas (nomes e tipos), chave primária
+    e índices do modelo, usa TRUNCATE (sem propagação de schema e sem invalidar
+    os prepared statements); caso contrário, faz DROP + sync_table().
+    """
+    def _reset(model_cls):
+        table_name = model_cls.__table_name__
+        schema = model_cls.__caspy_schema__
+        keyspace = session.cluster.metadata.keyspaces.get(session.keyspace)
+        table = keyspace.tables.get(table_name) if keyspace else None
+        
+        if (table is not None
+                and {name: column.cql_type.replace(' ', '') for name, column in table.columns.items()}
+                    == {name: details['type'].replace(' ', '') for name, details in schema['fields'].items()}
+                and [column.name for column in table.primary_key] == schema['primary_keys']
+                and set(table.indexes) == {f"{table_name}_{field_name}_idx" for field_name in schema.get('indexes', ())}):
+            session.execute(f"TRUNCATE {table_name}")
+        else:
+            session.execute(f"DROP TABLE IF EXISTS {table_name}")
+            model_cls.sync_table()
+    return _reset
+
+@pytest.fixture(scope="module")
+def pre_create_tables(request, cassandra_session):
+    """
+    Cria, uma única vez por módulo, as tabelas (e índices) dos modelos listados
+    em `PRE_CREATE_MODELS` no módulo de teste ou, na falta dessa lista, de todos
+    os modelos declarados no nível do módulo. Os CREATE ... IF NOT EXISTS são
+    enviados em paralelo e aguardados juntos, de modo que as esperas por acordo
+    de schema se sobrepõem em vez de somar um sync_table() por teste.
+    
+    Retorna a lista de modelos encontrados.
+    """
+    session = connection.get_session()
+    module_name = request.module.__name__
+    models = getattr(request.module, 'PRE_CREATE_MODELS', None)
+    if models is None:
+        models = [
+            obj for _, obj in inspect.getmembers(request.module, inspect.isclass)
+            if issubclass(obj, Model) and obj is not Model and obj.__module__ == module_name
+        ]
+    
+    # DDL não pode ir em BATCH no Cassandra; os statements seguem em paralelo.
+    futures = [
+        session.execute_async(build_create_table_cql(model.__table_name__, model.__caspy_schema__))
+        for model in models
+    ]
+    for future in futures:
+        future.result()
+    
+    futures = [
+        session.execute_async(build_create_index_cql(model.__table_name__, field_name))
+        for model in models
+        for field_name in model.__caspy_schema__.get('indexes', ())
+    ]
+    for future in futures:
+        future.result()
+    
+    for model in models:
+        stmt_cache.invalidate_table(session, model.__table_name__)
+    logger.info(f"{len(models)} tabela(s) pré-criada(s) para o módulo '{module_name}'")
+    return models
@@ -11,6 +11,7 @@ Este arquivo testa:
 import pytest
 import warnings
 import logging
+from contextlib import contextmanager
 from caspyorm import Model, fields, connection
 from caspyorm.exceptions import ValidationError
 
@@ -27,9 +28,28 @@ class UsuarioTeste(Model):
     configuracoes = fields.Map(fields.Text(), fields.Text())  # Coleção
 
 
+def _make_capture_handler() -> logging.Handler:
+    """Cria um handler que apenas acumula os registros em `handler.records`."""
+    handler = logging.Handler()
+    handler.records = []
+    handler.emit = handler.records.append
+    return handler
+
+
 class TestNivel1Improvements:
     """Testa as melhorias implementadas no Nível 1."""
     
+    _shared_handler = _make_capture_handler()
+    
+    @classmethod
+    def setup_class(cls):
+        logging.getLogger("caspyorm").addHandler(cls._shared_handler)
+    
+    @classmethod
+    def teardown_class(cls):
+        logging.getLogger("caspyorm").removeHandler(cls._shared_handler)
+        cls._shared_handler.records.clear()
+    
     def test_01_logging_system(self, session):
         """Testa se o sistema de logging está funcionando."""
         # Capturar logs para verificar se estão sendo gerados
@@ -67,10 +87,12 @@ class TestNivel1Improvements:
             usuarios = UsuarioTeste.filter(idade=25)
             list(usuarios)  # Executar a query
             
-            # Verificar se o warning foi emitido
+            # Verificar se o warning foi emitido para o campo
             assert len(w) > 0
             warning_messages = [str(warning.message) for warning in w]
             assert any("idade" in msg and "não é uma chave primária" in msg for msg in warning_messages)
+            assert 'idade' in usuarios._non_indexed
+            assert 'email' not in UsuarioTeste.filter(email="maria@teste.com")._non_indexed
     
     def test_03_empty_collections_not_none(self, session):
         """Testa se coleções são inicializadas como vazias, não None."""
@@ -175,20 +197,9 @@ class TestNivel1Improvements:
         assert any("Instância atualizada" in msg for msg in log_messages)
         assert any("Instância deletada" in msg for msg in log_messages)
     
+    @contextmanager
     def _capture_logs(self):
-        """Context manager para capturar logs durante os testes."""
-        class LogCapture:
-            def __init__(self):
-                self.records = []
-                self.handler = None
-            
-            def __enter__(self):
-                self.handler = logging.Handler()
-                self.handler.emit = lambda record: self.records.append(record)
-                logging.getLogger("caspyorm").addHandler(self.handler)
-                return self.records
-            
-            def __exit__(self, exc_type, exc_val, exc_tb):
-                logging.getLogger("caspyorm").removeHandler(self.handler)
-        
-        return LogCapture()
\ No newline at end of file
+        """Context manager para capturar logs durante os testes (reusa o handler da classe)."""
+        records = self._shared_handler.records
+        records.clear()
+        yield records
@@ -3,9 +3,7 @@ Testes para as melhorias do Nível 2 da CaspyORM: Paginação eficiente.
 """
 import pytest
 import uuid
-import time
 from caspyorm import Model, fields
-from caspyorm import connection
 
 class UsuarioPaginacao(Model):
     __table_name__ = 'usuarios_paginacao_teste'
@@ -15,31 +13,17 @@ class UsuarioPaginacao(Model):
     email = fields.Text(index=True)
 
 @pytest.fixture(scope="function")
-def setup_usuarios(session):
-    # Drop da tabela para garantir schema correto e limpo
-    try:
-        connection.execute("DROP TABLE IF EXISTS usuarios_paginacao_teste")
-    except Exception:
-        pass
+def setup_usuarios(reset_table):
+    # TRUNCATE quando o schema já confere; DROP + sync_table só na primeira vez
+    reset_table(UsuarioPaginacao)
     
-    UsuarioPaginacao.sync_table()
-    
-    # Adicionar uma pausa para o schema se estabilizar
-    time.sleep(1.5)
-
-    # O loop de deleção anterior era redundante, já que a tabela foi dropada.
-    
-    # Criar 25 usuários no grupo 'A'
-    usuarios = []
-    for i in range(25):
-        usuario = UsuarioPaginacao.create(
-            grupo="A",
-            id=uuid.uuid4(), # É importante passar o ID aqui, pois a PK é composta
-            nome=f"Usuário {i}",
-            email=f"usuario{i}@teste.com"
-        )
-        usuarios.append(usuario)
-    return usuarios
+    # Criar 25 usuários no grupo 'A' com escritas concorrentes (um único prepare).
+    # Tuplas na ordem dos campos: (grupo, id, nome, email); o id é passado
+    # explicitamente, pois a PK é composta
+    return UsuarioPaginacao.bulk_create([
+        ("A", uuid.uuid4(), f"Usuário {i}", f"usuario{i}@teste.com")
+        for i in range(25)
+    ])
 
 def test_paginacao_page_method(session, setup_usuarios):
     page_size = 10
@@ -49,6 +33,7 @@ def test_paginacao_page_method(session, setup_usuarios):
     
     while True:
         resultados, paging_state = queryset.page(page_size=page_size, paging_state=paging_state)
+        assert len(resultados) <= page_size
         nomes.update(u.nome for u in resultados)
         if not paging_state:
             break
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Código compartilhado pelos testes com dados reais do NYC TLC (yellow).
+
+Os testes `test_real_nyc_data*.py` diferem apenas na configuração (tabela,
+keyspace, tamanho de batch/chunk) e no fluxo de ingestão; modelo, download,
+leitura do parquet e conversão para instâncias ficam todos aqui.
+"""
+
+import json
+import operator
+import os
+import queue
+import shutil
+import threading
+import time
+import requests
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache, reduce
+from typing import Optional
+from caspyorm import fields, Model, connection
+import uuid
+import logging
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+YELLOW_URL_PATTERN = "https://d37ci6vzurychx.cloudfront.net/trip-data/yellow_tripdata_{year}-{month:02d}.parquet"
+
+# Meses baixados pelos testes de ~1GB, até atingir o tamanho alvo
+GB_YEARS_MONTHS = [(2024, m) for m in range(1, 7)] + [(2023, m) for m in range(12, 0, -1)]
+
+# Colunas do TLC efetivamente usadas na conversão para o modelo
+NEEDED_COLS = [
+    'VendorID', 'tpep_pickup_datetime', 'passenger_count', 'trip_distance',
+    'pickup_longitude', 'pickup_latitude', 'dropoff_longitude', 'dropoff_latitude',
+    'RatecodeID', 'store_and_fwd_flag', 'payment_type', 'fare_amount', 'extra',
+    'mta_tax', 'tip_amount', 'tolls_amount', 'improvement_surcharge', 'total_amount',
+]
+
+@dataclass(frozen=True)
+class NYCConfig:
+    """Configuração de um cenário de teste com dados reais"""
+    name: str
+    mode: str  # 'sample', 'serial', 'pipeline' ou 'existing'
+    table_name: str
+    keyspace: str
+    data_dir: Optional[str]  # None: reaproveita os dados dos outros cenários
+    batch_size: int
+    chunk_size: int = 10000
+    target_gb: float = 1.0
+
+SMALL = NYCConfig('small', 'sample', 'real_nyc_taxi_trips', 'nyc_taxi_real_test',
+                  'nyc_real_data', batch_size=20)
+GB = NYCConfig('1gb', 'serial', 'real_nyc_taxi_trips_1gb', 'nyc_taxi_real_1gb',
+               'nyc_real_data_1gb', batch_size=10)
+GB_FAST = NYCConfig('1gb_fast', 'pipeline', 'real_nyc_taxi_trips_1gb_fast', 'nyc_taxi_real_1gb_fast',
+                    'nyc_real_data_1gb_fast', batch_size=10, chunk_size=10000)
+GB_ULTRA = NYCConfig('1gb_ultra', 'existing', 'real_nyc_taxi_trips_1gb_ultra', 'nyc_taxi_real_1gb_ultra',
+                     data_dir=None, batch_size=50, chunk_size=50000)
+
+# O cenário ultra reaproveita os dados já baixados pelos outros cenários
+EXISTING_DATA_DIRS = [GB.data_dir, GB_FAST.data_dir, SMALL.data_dir]
+
+# Colunas sem as quais a linha não vira instância: os campos Integer não
+# aceitam NaN e a chave de clustering não pode ser nula
+REQUIRED_VALUE_COLS = ['tpep_pickup_datetime', 'passenger_count', 'RatecodeID', 'payment_type']
+
+PIPELINE_DEPTH = 4  # Chunks em trânsito entre leitura e inserção (limita a memória)
+
+@lru_cache(maxsize=None)
+def make_trip_model(table_name):
+    """Cria (uma única vez por tabela) o modelo simplificado de viagem do NYC TLC"""
+    return Model.create_model(
+        name='RealTaxiTrip',
+        fields={
+            # Chaves primárias
+            'trip_id': fields.UUID(primary_key=True),
+            'vendor_id': fields.Text(partition_key=True),
+            'pickup_datetime': fields.Timestamp(clustering_key=True),
+            # Dados básicos da viagem
+            'passenger_count': fields.Integer(),
+            'trip_distance': fields.Float(),
+            'pickup_longitude': fields.Float(),
+            'pickup_latitude': fields.Float(),
+            'dropoff_longitude': fields.Float(),
+            'dropoff_latitude': fields.Float(),
+            # Informações de pagamento
+            'rate_code_id': fields.Integer(),
+            'store_and_fwd_flag': fields.Text(),
+            'payment_type': fields.Integer(),
+            'fare_amount': fields.Float(),
+            'extra': fields.Float(),
+            'mta_tax': fields.Float(),
+            'tip_amount': fields.Float(),
+            'tolls_amount': fields.Float(),
+            'improvement_surcharge': fields.Float(),
+            'total_amount': fields.Float(),
+            # Campos de auditoria
+            'created_at': fields.Timestamp(default=datetime.now),
+        },
+        table_name=table_name,
+    )
+
+def connect_and_sync(cfg):
+    """Conecta ao keyspace do cenário e sincroniza a tabela do modelo"""
+    connection.connect(contact_points=['localhost'], port=9042, keyspace=cfg.keyspace)
+    make_trip_model(cfg.table_name).sync_table(auto_apply=True)
+    print("✅ Conectado e schema sincronizado")
+
+DOWNLOAD_BUFFER_SIZE = 1 << 20  # 1 MiB por escrita (em vez de 8 KiB)
+DOWNLOAD_WORKERS = 4  # Meses baixados em paralelo
+
+def download_file(url, filename):
+    if os.path.exists(filename):
+        logger.info(f"Arquivo já existe: {filename}")
+        return filename
+    logger.info(f"Baixando {filename}...")
+    # Grava em um arquivo temporário para não deixar um parquet truncado no cache
+    partial = filename + '.part'
+    with requests.get(url, stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        with open(partial, 'wb') as f:
+            shutil.copyfileobj(r.raw, f, length=DOWNLOAD_BUFFER_SIZE)
+    os.replace(partial, filename)
+    logger.info(f"Download concluído: {filename}")
+    return filename
+
+def download_files(data_dir, years_months):
+    os.makedirs(data_dir, exist_ok=True)
+    targets = [
+        (YELLOW_URL_PATTERN.format(year=year, month=month),
+         os.path.join(data_dir, f"yellow_tripdata_{year}-{month:02d}.parquet"))
+        for year, month in years_months
+    ]
+    # Sobrepõe os round-trips TCP dos vários meses; a ordem dos arquivos é preservada
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        return list(executor.map(lambda target: download_file(*target), targets))
+
+def find_existing_files():
+    """Procura por dados já baixados"""
+    for data_dir in EXISTING_DATA_DIRS:
+        if os.path.exists(data_dir):
+            files = [os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.endswith('.parquet')]
+            if files:
+                logger.info(f"Encontrados {len(files)} arquivos em {data_dir}")
+                return files
+    return []
+
+def read_parquet_projected(path):
+    """Lê apenas as colunas usadas pelo modelo, coalescendo as leituras (pre_buffer)"""
+    # Arquivos recentes não têm as colunas de coordenadas; projeta só as existentes
+    available = set(pq.read_schema(path).names)
+    columns = [col for col in NEEDED_COLS if col in available]
+    return pd.read_parquet(path, engine='pyarrow', columns=columns, pre_buffer=True)
+
+def load_and_concat(files, target_gb=1.0):
+    dfs = []
+    total_bytes = 0
+    for file in files:
+        logger.info(f"Lendo {file}...")
+        df = read_parquet_projected(file)
+        dfs.append(df)
+        # deep=False usa só os tamanhos dos dtypes (O(colunas)); a medição
+        # exata com deep=True fica para o relatório final
+        total_bytes += df.memory_usage(deep=False).sum()
+        logger.info(f"Tamanho acumulado: {total_bytes/1024/1024/1024:.2f} GB")
+        if total_bytes >= target_gb * 1024**3:
+            break
+    if not dfs:
+        raise Exception("Nenhum arquivo encontrado!")
+    big_df = pd.concat(dfs, ignore_index=True)
+    logger.info(f"Total final: {big_df.memory_usage(deep=True).sum()/1024/1024/1024:.2f} GB, {len(big_df)} linhas")
+    return big_df
+
+def iter_parquet_chunks(files, chunk_size, target_gb=1.0):
+    """
+    Lê os arquivos em chunks (record batches) sem materializar o DataFrame inteiro.
+    Um único scanner do pyarrow.dataset faz projeção, filtro e chunking: as
+    linhas sem os valores obrigatórios nem chegam a ser convertidas para pandas.
+    """
+    dataset = ds.dataset(files, format='parquet')
+    available = set(dataset.schema.names)
+    columns = [col for col in NEEDED_COLS if col in available]
+    required = [ds.field(col).is_valid() for col in REQUIRED_VALUE_COLS if col in available]
+    scanner = dataset.scanner(
+        columns=columns,
+        filter=reduce(operator.and_, required) if required else None,
+        batch_size=chunk_size,
+        fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True),
+    )
+    total_bytes = 0
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        total_bytes += batch.nbytes
+        yield batch.to_pandas()
+        if total_bytes >= target_gb * 1024**3:
+            logger.info(f"Tamanho alvo atingido: {total_bytes/1024/1024/1024:.2f} GB")
+            return
+
+def iter_chunk_models(model_cls, df_chunk, mode='default'):
+    """
+    Gera, uma a uma, as instâncias do modelo para um chunk do DataFrame.
+    Linhas com valores obrigatórios ausentes são descartadas antes da conversão;
+    no modo 'fast' isso ocorre sem log e o progresso é reportado a cada
+    sub-chunk de 1000 linhas.
+    """
+    fast = mode == 'fast'
+
+    # Converte o timestamp uma única vez, de forma vetorizada, em vez de deixar
+    # o campo Timestamp do modelo fazer o parse linha a linha
+    pickup = df_chunk['tpep_pickup_datetime']
+    if not pd.api.types.is_datetime64_any_dtype(pickup):
+        df_chunk = df_chunk.assign(
+            tpep_pickup_datetime=pd.to_datetime(pickup, errors='coerce', cache=True)
+        )
+
+    # Descarta de uma vez, com máscara vetorizada, as linhas que o modelo
+    # rejeitaria; assim o loop por linha não precisa de try/except
+    present = [col for col in REQUIRED_VALUE_COLS if col in df_chunk.columns]
+    valid = df_chunk[present].notna().all(axis=1)
+    dropped = len(df_chunk) - int(valid.sum())
+    if dropped:
+        df_chunk = df_chunk.loc[valid]
+        if not fast:
+            logger.warning(f"{dropped} linhas descartadas por valores ausentes")
+
+    # Uma única leitura de aleatoriedade para todos os UUIDs do chunk,
+    # em vez de uma chamada a os.urandom (via uuid4) por linha
+    random_bytes = os.urandom(16 * len(df_chunk))
+
+    # Preparar dados em lotes
+    for i in range(0, len(df_chunk), 1000):  # Processar 1000 por vez
+        sub_chunk = df_chunk.iloc[i:i+1000]
+
+        for offset, (_, row) in enumerate(sub_chunk.iterrows(), start=i):
+            yield model_cls(
+                trip_id=uuid.UUID(bytes=random_bytes[offset*16:(offset+1)*16], version=4),
+                vendor_id=str(row.get('VendorID', 1)),
+                pickup_datetime=row.get('tpep_pickup_datetime'),
+                passenger_count=row.get('passenger_count', 1),
+                trip_distance=row.get('trip_distance', 0.0),
+                pickup_longitude=row.get('pickup_longitude', 0.0),
+                pickup_latitude=row.get('pickup_latitude', 0.0),
+                dropoff_longitude=row.get('dropoff_longitude', 0.0),
+                dropoff_latitude=row.get('dropoff_latitude', 0.0),
+                rate_code_id=row.get('RatecodeID', 1),
+                store_and_fwd_flag=str(row.get('store_and_fwd_flag', 'N')),
+                payment_type=row.get('payment_type', 1),
+                fare_amount=row.get('fare_amount', 0.0),
+                extra=row.get('extra', 0.0),
+                mta_tax=row.get('mta_tax', 0.0),
+                tip_amount=row.get('tip_amount', 0.0),
+                tolls_amount=row.get('tolls_amount', 0.0),
+                improvement_surcharge=row.get('improvement_surcharge', 0.0),
+                total_amount=row.get('total_amount', 0.0)
+            )
+
+        if fast:
+            logger.info(f"  Sub-chunk {i//1000 + 1}: {len(sub_chunk)} instâncias criadas")
+
+def convert_chunk_to_models(model_cls, df_chunk, mode='default'):
+    """Converte um chunk do DataFrame para a lista completa de instâncias do modelo"""
+    return list(iter_chunk_models(model_cls, df_chunk, mode))
+
+def bulk_insert_stream(model_cls, instances, batch_size):
+    """
+    Insere em batches as instâncias de um iterável à medida que são geradas,
+    sem materializar o chunk inteiro. Retorna o total inserido.
+    """
+    total = 0
+    batch = []
+    for instance in instances:
+        batch.append(instance)
+        if len(batch) >= batch_size:
+            model_cls.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        model_cls.bulk_create(batch)
+        total += len(batch)
+    return total
+
+# Manifesto da ingestão 'existing': por tabela, guarda a assinatura dos
+# arquivos de entrada e quantas linhas já foram inseridas, para retomar
+MANIFEST_FILE = 'ingest_manifest.json'
+
+def load_manifest(path=MANIFEST_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    """Grava o manifesto de forma atômica (arquivo temporário + fsync + replace)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def files_signature(files):
+    """Identifica os dados de entrada; qualquer arquivo alterado invalida o progresso salvo"""
+    return [[file, os.path.getsize(file), int(os.path.getmtime(file))] for file in files]
+
+# Handle reutilizado: memory_usage_mb() é chamado dentro do loop de inserção
+_PROC = psutil.Process(os.getpid())
+
+def memory_usage_mb():
+    return _PROC.memory_info().rss / 1024 / 1024
+
+def print_totals(total_processed, total_inserted, total_time):
+    print(f"✅ Processamento concluído!")
+    print(f"Total de registros processados: {total_processed}")
+    print(f"Total de registros inseridos: {total_inserted}")
+    print(f"Tempo total: {total_time/60:.2f} minutos")
+    print(f"Registros por segundo: {total_inserted/total_time:.0f}")
+
+def run_serial(cfg):
+    """Carrega tudo, converte tudo e só então insere em batches pequenos"""
+    model_cls = make_trip_model(cfg.table_name)
+    files = download_files(cfg.data_dir, GB_YEARS_MONTHS)
+    df = load_and_concat(files, target_gb=cfg.target_gb)
+
+    # Converter para modelos
+    print(f"Convertendo para instâncias CaspyORM...")
+    instances = convert_chunk_to_models(model_cls, df)
+    print(f"Total de instâncias: {len(instances)}")
+
+    # Inserir em batches pequenos
+    print(f"Iniciando inserção em batches de {cfg.batch_size}...")
+    total = len(instances)
+    start = time.time()
+    for i in range(0, total, cfg.batch_size):
+        batch = instances[i:i+cfg.batch_size]
+        model_cls.bulk_create(batch)
+        if (i//cfg.batch_size) % 100 == 0:
+            print(f"{i+len(batch)}/{total} inseridos... Memória: {memory_usage_mb():.2f}MB")
+    print_totals(len(df), total, time.time() - start)
+
+def run_pipeline(cfg):
+    """Lê + converte o parquet em uma thread enquanto outra insere no Cassandra"""
+    model_cls = make_trip_model(cfg.table_name)
+    files = download_files(cfg.data_dir, GB_YEARS_MONTHS)
+
+    # Pipeline produtor/consumidor: a leitura + conversão do parquet (CPU/disco)
+    # acontece em paralelo com a inserção no Cassandra (rede). A fila limitada
+    # aplica backpressure, mantendo no máximo PIPELINE_DEPTH chunks em memória.
+    chunks = queue.Queue(maxsize=PIPELINE_DEPTH)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for chunk in iter_parquet_chunks(files, cfg.chunk_size, target_gb=cfg.target_gb):
+                if stop.is_set():
+                    break
+                chunks.put((len(chunk), convert_chunk_to_models(model_cls, chunk)))
+        finally:
+            chunks.put(None)
+
+    def consume():
+        total_processed = 0
+        total_inserted = 0
+        chunk_number = 0
+        try:
+            while (item := chunks.get()) is not None:
+                chunk_start = time.time()
+                chunk_rows, instances = item
+                chunk_number += 1
+
+                # Inserir em batches pequenos
+                for j in range(0, len(instances), cfg.batch_size):
+                    batch = instances[j:j+cfg.batch_size]
+                    model_cls.bulk_create(batch)
+                    total_inserted += len(batch)
+
+                total_processed += chunk_rows
+                chunk_time = time.time() - chunk_start
+
+                print(f"Chunk {chunk_number}: {total_processed} processados, "
+                      f"{total_inserted} inseridos, {chunk_time:.1f}s, Memória: {memory_usage_mb():.1f}MB")
+        finally:
+            # Em caso de erro, libera o produtor que pode estar bloqueado na fila
+            stop.set()
+            while item is not None:
+                item = chunks.get()
+        return total_processed, total_inserted
+
+    print(f"Processando em chunks de {cfg.chunk_size} (pipeline com {PIPELINE_DEPTH} chunks em trânsito)...")
+    start_time = time.time()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        producer = executor.submit(produce)
+        consumer = executor.submit(consume)
+        total_processed, total_inserted = consumer.result()
+        producer.result()
+
+    print_totals(total_processed, total_inserted, time.time() - start_time)
+
+def run_existing(cfg):
+    """Usa dados já baixados, com chunks e batches maiores"""
+    model_cls = make_trip_model(cfg.table_name)
+    files = find_existing_files()
+    if not files:
+        print("❌ Nenhum dado encontrado! Execute primeiro o script de download.")
+        return False
+
+    # Limitar a 3 arquivos para ser mais rápido
+    files = files[:3]
+
+    # Retoma de onde a execução anterior parou, se os arquivos não mudaram
+    manifest = load_manifest()
+    signature = files_signature(files)
+    entry = manifest.get(cfg.table_name, {})
+    if entry.get('files') != signature:
+        entry = {'files': signature, 'rows': 0, 'complete': False}
+    if entry['complete']:
+        print(f"✅ Dados inalterados e já inseridos em {cfg.table_name} ({entry['rows']} linhas); nada a fazer")
+        return True
+
+    df = load_and_concat(files, target_gb=cfg.target_gb)
+    resume_from = entry['rows']
+
+    # Processar e inserir em chunks grandes
+    if resume_from:
+        print(f"⏩ Retomando a partir da linha {resume_from} (manifesto {MANIFEST_FILE})")
+    print(f"🚀 Processando {len(df) - resume_from} linhas em chunks de {cfg.chunk_size}...")
+    total_processed = 0
+    total_inserted = 0
+    start_time = time.time()
+
+    for i in range(resume_from, len(df), cfg.chunk_size):
+        chunk_start = time.time()
+        chunk = df.iloc[i:i+cfg.chunk_size]
+
+        print(f"📦 Processando chunk {i//cfg.chunk_size + 1} ({len(chunk)} linhas)...")
+
+        # Converter e inserir em streaming: cada batch é enviado assim que
+        # fica completo, sem manter o chunk inteiro de instâncias em memória
+        instances = iter_chunk_models(model_cls, chunk, mode='fast')
+        chunk_inserted = bulk_insert_stream(model_cls, instances, cfg.batch_size)
+        total_inserted += chunk_inserted
+
+        total_processed += len(chunk)
+        chunk_time = time.time() - chunk_start
+
+        # Só registra o chunk depois que todos os seus batches foram inseridos
+        entry['rows'] = i + len(chunk)
+        entry['complete'] = entry['rows'] >= len(df)
+        manifest[cfg.table_name] = entry
+        save_manifest(manifest)
+
+        print(f"  ✅ Conversão + inserção: {chunk_inserted} registros em {chunk_time:.1f}s")
+        print(f"  📊 Progresso: {entry['rows']}/{len(df)} ({entry['rows']/len(df)*100:.1f}%)")
+        print(f"  ⏱️  Chunk total: {chunk_time:.1f}s, Memória: {memory_usage_mb():.1f}MB")
+        print(f"  🎯 Total inseridos: {total_inserted}")
+        print("-" * 60)
+
+    print_totals(total_processed, total_inserted, time.time() - start_time)
+    return True
+
+INGEST_RUNNERS = {
+    'serial': run_serial,
+    'pipeline': run_pipeline,
+    'existing': run_existing,
+}
+
+def run_ingest(cfg):
+    """Executa o fluxo de ingestão do cenário; retorna False se não houver dados"""
+    print(f"🚕 TESTE DE PERFORMANCE COM ~{cfg.target_gb:g}GB DE DADOS REAIS NYC TLC ({cfg.name}) 🚕")
+    connect_and_sync(cfg)
+    return INGEST_RUNNERS[cfg.mode](cfg) is not False
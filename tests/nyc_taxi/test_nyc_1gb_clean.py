@@ -19,9 +19,11 @@ logger = logging.getLogger(__name__)
 
 class TaxiTrip(Model):
     __table_name__ = 'nyc_taxi_clean'
-    trip_id = fields.UUID(primary_key=True)
-    vendor_id = fields.Text(partition_key=True)
+    # Mesma chave de tests/performance/test_nyc_operations.py: partição por hora
+    pickup_bucket = fields.Text(partition_key=True)
     pickup_datetime = fields.Timestamp(clustering_key=True)
+    trip_id = fields.UUID(clustering_key=True)
+    vendor_id = fields.Text(index=True)
     passenger_count = fields.Integer()
     trip_distance = fields.Float()
     pickup_longitude = fields.Float()
@@ -41,6 +43,7 @@ class TaxiTrip(Model):
     created_at = fields.Timestamp(default=datetime.now)
 
 DATA_DIR = 'nyc_clean_data'
+PICKUP_BUCKET_FORMAT = '%Y%m%d%H'
 KEYSPACE = 'nyc_taxi_clean'
 BATCH_SIZE = 50
 CHUNK_SIZE = 10000
@@ -87,10 +90,12 @@ def convert_chunk_fast(df_chunk):
     instances = []
     for _, row in df_chunk.iterrows():
         try:
+            pickup = row.get('tpep_pickup_datetime')
             trip = TaxiTrip(
+                pickup_bucket=pickup.strftime(PICKUP_BUCKET_FORMAT),
                 trip_id=uuid.uuid4(),
                 vendor_id=str(row.get('VendorID', 1)),
-                pickup_datetime=row.get('tpep_pickup_datetime'),
+                pickup_datetime=pickup,
                 passenger_count=row.get('passenger_count', 1),
                 trip_distance=row.get('trip_distance', 0.0),
                 pickup_longitude=row.get('pickup_longitude', 0.0),
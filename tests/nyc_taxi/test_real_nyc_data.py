@@ -1,110 +1,50 @@
 #!/usr/bin/env python3
 """
 Teste de performance com dados reais do NYC TLC
-Este script baixa e processa dados reais de táxi de Nova York para testar a CaspyORM
+Este script baixa e processa dados reais de táxi de Nova York para testar a CaspyORM.
+
+Os cenários de ~1GB (`test_real_nyc_data_1gb*.py`) compartilham o mesmo modelo e
+a mesma lógica de ingestão (ver `_common.py`) e são executados aqui, parametrizados.
 """
 
 import pytest
 import time
-import os
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
-from caspyorm import fields, Model, connection
-import uuid
 import logging
 
-# Configuração de logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from caspyorm import connection
+from _common import (
+    SMALL, GB, GB_FAST, GB_ULTRA,
+    connect_and_sync, convert_chunk_to_models, download_files,
+    make_trip_model, read_parquet_projected, run_ingest,
+)
+
 logger = logging.getLogger(__name__)
 
-class RealTaxiTrip(Model):
-    """Modelo simplificado para dados reais do NYC TLC"""
-    __table_name__ = 'real_nyc_taxi_trips'
-    
-    # Chaves primárias
-    trip_id = fields.UUID(primary_key=True)
-    vendor_id = fields.Text(partition_key=True)
-    pickup_datetime = fields.Timestamp(clustering_key=True)
-    
-    # Dados básicos da viagem
-    passenger_count = fields.Integer()
-    trip_distance = fields.Float()
-    pickup_longitude = fields.Float()
-    pickup_latitude = fields.Float()
-    dropoff_longitude = fields.Float()
-    dropoff_latitude = fields.Float()
-    
-    # Informações de pagamento
-    rate_code_id = fields.Integer()
-    store_and_fwd_flag = fields.Text()
-    payment_type = fields.Integer()
-    fare_amount = fields.Float()
-    extra = fields.Float()
-    mta_tax = fields.Float()
-    tip_amount = fields.Float()
-    tolls_amount = fields.Float()
-    improvement_surcharge = fields.Float()
-    total_amount = fields.Float()
-    
-    # Campos de auditoria
-    created_at = fields.Timestamp(default=datetime.now)
+RealTaxiTrip = make_trip_model(SMALL.table_name)
 
 class RealNYCDataTest:
     """Classe para testar com dados reais do NYC TLC"""
     
-    def __init__(self):
-        self.keyspace = 'nyc_taxi_real_test'
-        self.data_dir = 'nyc_real_data'
-        
-        # Cria diretório se não existir
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+    def __init__(self, cfg=SMALL):
+        self.cfg = cfg
     
     def connect(self):
-        """Conecta ao Cassandra"""
+        """Conecta ao Cassandra e sincroniza o schema da tabela"""
         try:
-            connection.connect(
-                contact_points=['localhost'],
-                port=9042,
-                keyspace=self.keyspace
-            )
+            connect_and_sync(self.cfg)
             return True
         except Exception as e:
             logger.error(f"Erro ao conectar: {e}")
             return False
     
-    def sync_schema(self):
-        """Sincroniza o schema da tabela"""
-        try:
-            RealTaxiTrip.sync_table(auto_apply=True)
-            return True
-        except Exception as e:
-            logger.error(f"Erro ao sincronizar schema: {e}")
-            return False
-    
     def download_sample_data(self, sample_size=1000):
         """Baixa uma amostra de dados reais do NYC TLC"""
         try:
-            # URL para dados de janeiro de 2024 (exemplo)
-            url = "https://d37ci6vzurychx.cloudfront.net/trip-data/yellow_tripdata_2024-01.parquet"
-            filename = os.path.join(self.data_dir, "yellow_tripdata_2024-01.parquet")
-            
-            if not os.path.exists(filename):
-                logger.info("Baixando dados reais do NYC TLC...")
-                response = requests.get(url, stream=True)
-                response.raise_for_status()
-                
-                with open(filename, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                logger.info("Download concluído!")
-            else:
-                logger.info("Arquivo já existe, usando cache...")
+            # Dados de janeiro de 2024 (exemplo)
+            filename, = download_files(self.cfg.data_dir, [(2024, 1)])
             
             # Lê apenas uma amostra
-            df = pd.read_parquet(filename)
+            df = read_parquet_projected(filename)
             df = df.head(sample_size)
             logger.info(f"Amostra carregada: {len(df)} registros")
             
@@ -116,38 +56,7 @@ class RealNYCDataTest:
     
     def convert_to_model(self, df):
         """Converte DataFrame para instâncias do modelo"""
-        instances = []
-        
-        for _, row in df.iterrows():
-            try:
-                # Mapeia colunas do TLC para nosso modelo
-                trip = RealTaxiTrip(
-                    trip_id=uuid.uuid4(),
-                    vendor_id=str(row.get('VendorID', 1)),
-                    pickup_datetime=row.get('tpep_pickup_datetime'),
-                    passenger_count=row.get('passenger_count', 1),
-                    trip_distance=row.get('trip_distance', 0.0),
-                    pickup_longitude=row.get('pickup_longitude', 0.0),
-                    pickup_latitude=row.get('pickup_latitude', 0.0),
-                    dropoff_longitude=row.get('dropoff_longitude', 0.0),
-                    dropoff_latitude=row.get('dropoff_latitude', 0.0),
-                    rate_code_id=row.get('RatecodeID', 1),
-                    store_and_fwd_flag=str(row.get('store_and_fwd_flag', 'N')),
-                    payment_type=row.get('payment_type', 1),
-                    fare_amount=row.get('fare_amount', 0.0),
-                    extra=row.get('extra', 0.0),
-                    mta_tax=row.get('mta_tax', 0.0),
-                    tip_amount=row.get('tip_amount', 0.0),
-                    tolls_amount=row.get('tolls_amount', 0.0),
-                    improvement_surcharge=row.get('improvement_surcharge', 0.0),
-                    total_amount=row.get('total_amount', 0.0)
-                )
-                instances.append(trip)
-                
-            except Exception as e:
-                logger.warning(f"Erro ao converter linha: {e}")
-                continue
-        
+        instances = convert_chunk_to_models(RealTaxiTrip, df)
         logger.info(f"Convertidos {len(instances)} registros válidos")
         return instances
     
@@ -211,31 +120,29 @@ class RealNYCDataTest:
         # Teste 3: Filtro por valor de tarifa
         print("\n3. Filtro por tarifa alta (>$50):")
         start_time = time.time()
-        # Como fare_amount não é indexado, vamos buscar todos e filtrar
-        all_trips = list(RealTaxiTrip.all())
-        expensive_trips = [trip for trip in all_trips if trip.fare_amount > 50]
+        # Só precisamos de contagem e média: o Cassandra agrega apenas a coluna
+        # fare_amount, sem trazer as linhas nem instanciar objetos do modelo
+        session = connection.get_session()
+        prepared = session.prepare(
+            f"SELECT COUNT(*) AS total, AVG(fare_amount) AS avg_fare FROM {RealTaxiTrip.__table_name__} "
+            "WHERE fare_amount > ? ALLOW FILTERING"
+        )
+        stats = session.execute(prepared, [50.0]).one()
         query_time = time.time() - start_time
-        print(f"  Viagens caras encontradas: {len(expensive_trips)}")
+        print(f"  Viagens caras encontradas: {stats.total}")
         print(f"  Tempo: {query_time:.2f}s")
         
-        if expensive_trips:
-            avg_fare = sum(trip.fare_amount for trip in expensive_trips) / len(expensive_trips)
-            print(f"  Tarifa média das viagens caras: ${avg_fare:.2f}")
+        if stats.total:
+            print(f"  Tarifa média das viagens caras: ${stats.avg_fare:.2f}")
     
     def run_all_tests(self):
         """Executa todos os testes com dados reais"""
         print("🚕 INICIANDO TESTES COM DADOS REAIS DO NYC TLC 🚕")
         
         if not self.connect():
-            print("❌ Falha ao conectar ao Cassandra")
-            return False
-        
-        if not self.sync_schema():
-            print("❌ Falha ao sincronizar schema")
+            print("❌ Falha ao conectar ao Cassandra ou sincronizar schema")
             return False
         
-        print("✅ Conectado e schema sincronizado")
-        
         try:
             self.test_real_data_insertion()
             self.test_real_data_queries()
@@ -247,12 +154,17 @@ class RealNYCDataTest:
             print(f"❌ Erro durante os testes: {e}")
             return False
 
+def run_scenario(cfg):
+    """Executa o cenário: amostra com consultas ou ingestão de ~1GB"""
+    if cfg.mode == 'sample':
+        return RealNYCDataTest(cfg).run_all_tests()
+    return run_ingest(cfg)
+
 @pytest.mark.slow
-def test_real_nyc_data():
+@pytest.mark.parametrize("cfg", [SMALL, GB, GB_FAST, GB_ULTRA], ids=lambda cfg: cfg.name)
+def test_real_nyc_data(cfg):
     """Teste com dados reais do NYC TLC"""
-    real_test = RealNYCDataTest()
-    assert real_test.run_all_tests()
+    assert run_scenario(cfg)
 
 if __name__ == "__main__":
-    real_test = RealNYCDataTest()
-    real_test.run_all_tests() 
\ No newline at end of file
+    run_scenario(SMALL)
@@ -4,18 +4,34 @@ Script de benchmark para testar CaspyORM com dados reais de táxi de Nova York
 Compara performance com diferentes volumes de dados e operações
 """
 
+import gc
 import time
 import psutil
 import os
 import json
-import csv
 from datetime import datetime, timedelta
 from caspyorm import fields, Model, connection
-from caspyorm.exceptions import ConnectionError
 import uuid
-import random
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, groupby
 from typing import List, Dict, Any
 import logging
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+from cassandra.query import BatchStatement, BatchType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,10 +41,12 @@ class TaxiTrip(Model):
     """Modelo para dados de táxi de Nova York"""
     __table_name__ = 'nyc_taxi_trips_benchmark'
     
-    trip_id = fields.UUID(primary_key=True)
+    # PRIMARY KEY (vendor_id, pickup_datetime, dropoff_datetime, trip_id): uma
+    # partição por vendor_id, o que permite os micro-batches por partição abaixo
     vendor_id = fields.Text(partition_key=True)
-    pickup_datetime = fields.DateTime(clustering_key=True)
-    dropoff_datetime = fields.DateTime(clustering_key=True)
+    pickup_datetime = fields.Timestamp(clustering_key=True)
+    dropoff_datetime = fields.Timestamp(clustering_key=True)
+    trip_id = fields.UUID(clustering_key=True)
     
     passenger_count = fields.Integer()
     trip_distance = fields.Float()
@@ -55,8 +73,94 @@ class TaxiTrip(Model):
     trip_features = fields.Set(fields.Text())
     trip_metadata = fields.Map(fields.Text(), fields.Text())
     
-    created_at = fields.DateTime(default=datetime.utcnow)
-    updated_at = fields.DateTime(default=datetime.utcnow)
+    created_at = fields.Timestamp(default=datetime.utcnow)
+    updated_at = fields.Timestamp(default=datetime.utcnow)
+
+# Colunas do INSERT, na ordem dos campos do modelo
+TAXI_COLUMNS = list(TaxiTrip.model_fields)
+
+# Quantidade máxima de inserções assíncronas em voo ao mesmo tempo
+INSERT_CONCURRENCY = 256
+
+# Linhas por micro-batch de uma mesma partição. Com ~500 bytes por linha, 50
+# linhas ficam abaixo do batch_size_fail_threshold padrão do Cassandra (50KB)
+PARTITION_BATCH_SIZE = 50
+
+INSERT_CQL = (
+    f"INSERT INTO {TaxiTrip.__table_name__} ({', '.join(TAXI_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * len(TAXI_COLUMNS))})"
+)
+
+# Contagem paralela: o anel do Murmur3Partitioner, (-2^63, 2^63-1], é dividido
+# em TOKEN_RANGE_SPLITS faixas contadas com COUNT(*) simultaneamente
+MIN_TOKEN = -2**63
+MAX_TOKEN = 2**63 - 1
+TOKEN_RANGE_SPLITS = 256
+
+# Linhas por página do driver nas consultas de filtro (igual ao LIMIT usado)
+FILTER_FETCH_SIZE = 1000
+
+# Exportação NDJSON: linhas por página do driver e bytes acumulados por escrita
+EXPORT_FETCH_SIZE = 5000
+EXPORT_BUFFER_SIZE = 1 << 20
+
+def _json_default(obj):
+    """Converte os tipos que o serializador JSON não conhece nativamente"""
+    if isinstance(obj, set):
+        return list(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+def _ndjson_line(record: Dict[str, Any]) -> bytes:
+    """Serializa um registro como uma linha NDJSON (orjson quando disponível)"""
+    if orjson is not None:
+        return orjson.dumps(record, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, default=_json_default) + "\n").encode()
+
+def _execute_windowed(session, requests, concurrency=INSERT_CONCURRENCY):
+    """Executa pares (statement, params) com execute_async, com no máximo `concurrency` em voo"""
+    inflight = deque()
+    for statement, params in requests:
+        if len(inflight) >= concurrency:
+            inflight.popleft().result()
+        inflight.append(session.execute_async(statement, params))
+    while inflight:
+        inflight.popleft().result()
+
+# Valores categóricos sorteados na geração dos dados de teste
+PICKUP_ZONES = ["Manhattan", "Brooklyn", "Queens", "Bronx", "Staten Island"]
+DROPOFF_ZONES = ["Manhattan", "Brooklyn", "Queens", "Bronx", "Staten Island"]
+TRIP_TAGS_OPTIONS = np.array(["rush_hour", "late_night", "airport", "bridge_tunnel", "highway"])
+TRIP_FEATURES_OPTIONS = np.array(["long_distance", "short_trip", "high_fare", "low_fare", "tipped"])
+WEATHER_OPTIONS = ["sunny", "rainy", "snowy", "cloudy"]
+TRAFFIC_OPTIONS = ["light", "moderate", "heavy"]
+
+# Geração paralela: processos usados e registros mínimos por processo (abaixo
+# disso o custo de serializar as instâncias de volta supera o ganho)
+GENERATION_WORKERS = os.cpu_count() or 1
+PARALLEL_GENERATION_MIN = 25000
+
+# Benchmarks de leitura: execuções de aquecimento descartadas e execuções medidas
+WARMUP_RUNS = 2
+MEASURED_RUNS = 5
+
+# Handle reutilizado por todas as medições de memória
+_PROC = psutil.Process(os.getpid())
+
+@contextmanager
+def _gc_paused():
+    """Desliga o GC cíclico dentro do bloco e faz uma única coleta ao sair"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+        gc.collect()
 
 class BenchmarkResult:
     """Classe para armazenar resultados de benchmark"""
@@ -64,8 +168,9 @@ class BenchmarkResult:
     def __init__(self, test_name: str, data_size: int):
         self.test_name = test_name
         self.data_size = data_size
-        self.start_time = None
+        self.start_time = None  # perf_counter_ns (monotônico, em ns)
         self.end_time = None
+        self.duration_ns = None  # Menor tempo entre as repetições de run_repeated
         self.memory_before = None
         self.memory_after = None
         self.records_processed = 0
@@ -73,29 +178,49 @@ class BenchmarkResult:
     
     def start(self):
         """Inicia o benchmark"""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         self.memory_before = self.measure_memory()
     
     def end(self, records_processed: int = 0):
         """Finaliza o benchmark"""
-        self.end_time = time.time()
+        self.end_time = time.perf_counter_ns()
         self.memory_after = self.measure_memory()
         self.records_processed = records_processed
     
+    def run_repeated(self, operation, warmup: int = WARMUP_RUNS, repeat: int = MEASURED_RUNS):
+        """
+        Executa `operation` `warmup` vezes sem medir (conexões, caches, páginas)
+        e depois `repeat` vezes medindo; registra o menor tempo, que é o menos
+        contaminado por ruído. `operation` retorna o número de registros.
+        """
+        for _ in range(warmup):
+            operation()
+        self.memory_before = self.measure_memory()
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter_ns()
+            records = operation()
+            times.append(time.perf_counter_ns() - t0)
+        self.memory_after = self.measure_memory()
+        self.duration_ns = min(times)
+        self.records_processed = records
+        return records
+    
     def set_error(self, error: str):
         """Define erro no benchmark"""
         self.error = error
     
     def measure_memory(self) -> float:
         """Mede uso de memória em MB"""
-        process = psutil.Process(os.getpid())
-        return process.memory_info().rss / 1024 / 1024
+        return _PROC.memory_info().rss / 1024 / 1024
     
     @property
     def duration(self) -> float:
         """Retorna duração em segundos"""
-        if self.start_time and self.end_time:
-            return self.end_time - self.start_time
+        if self.duration_ns is not None:
+            return self.duration_ns / 1e9
+        if self.start_time is not None and self.end_time is not None:
+            return (self.end_time - self.start_time) / 1e9
         return 0
     
     @property
@@ -125,116 +250,231 @@ class BenchmarkResult:
             'timestamp': datetime.utcnow().isoformat()
         }
 
+def _build_trips(n: int, rng: np.random.Generator) -> List[TaxiTrip]:
+    """
+    Gera `n` viagens de teste. Cada coluna é sorteada de uma vez com NumPy; o
+    loop em Python apenas monta as instâncias a partir dos arrays.
+    """
+    base_time = np.datetime64(datetime(2024, 1, 1), 'm')
+    
+    # Horários: aritmética em datetime64[m], convertida para datetime só no fim.
+    # tolist() já devolve datetime para unidades em minutos, sem um astype
+    # intermediário que copiaria os arrays para datetime64[us]
+    pickups = base_time + rng.integers(0, 24*365, n, endpoint=True).astype('timedelta64[h]')
+    dropoffs = pickups + rng.integers(5, 120, n, endpoint=True).astype('timedelta64[m]')
+    pickup_times = pickups.tolist()
+    dropoff_times = dropoffs.tolist()
+    
+    pickup_lat = rng.uniform(40.5, 40.9, n).tolist()
+    pickup_lon = rng.uniform(-74.3, -73.7, n).tolist()
+    dropoff_lat = rng.uniform(40.5, 40.9, n).tolist()
+    dropoff_lon = rng.uniform(-74.3, -73.7, n).tolist()
+    
+    # Tarifas calculadas in-place: cada operação reaproveita o array que o
+    # sorteio já alocou, sem arrays temporários intermediários
+    trip_distance = rng.uniform(0.1, 50.0, n)
+    fare_amount = trip_distance * 2.50
+    fare_amount += 2.50
+    tip_amount = rng.uniform(0, 0.3, n)
+    tip_amount *= fare_amount
+    total_amount = rng.uniform(0, 5, n)
+    total_amount += fare_amount
+    total_amount += tip_amount
+    
+    vendor_ids = rng.integers(1, 2, n, endpoint=True).astype(str).tolist()
+    passenger_counts = rng.integers(1, 6, n, endpoint=True).tolist()
+    rate_code_ids = rng.integers(1, 6, n, endpoint=True).tolist()
+    payment_types = rng.integers(1, 6, n, endpoint=True).tolist()
+    flags = rng.choice(["Y", "N"], n).tolist()
+    extras = rng.uniform(0, 2, n).tolist()
+    tolls = rng.uniform(0, 10, n).tolist()
+    congestion = rng.uniform(0, 5, n).tolist()
+    pickup_locations = rng.choice(PICKUP_ZONES, n).tolist()
+    dropoff_locations = rng.choice(DROPOFF_ZONES, n).tolist()
+    
+    # Amostragem sem reposição por linha: permutação aleatória de cada
+    # linha (argsort de uniformes) truncada em 1-3 elementos
+    tag_perms = TRIP_TAGS_OPTIONS[rng.random((n, len(TRIP_TAGS_OPTIONS))).argsort(axis=1)].tolist()
+    num_tags = rng.integers(1, 3, n, endpoint=True).tolist()
+    feature_perms = TRIP_FEATURES_OPTIONS[rng.random((n, len(TRIP_FEATURES_OPTIONS))).argsort(axis=1)].tolist()
+    num_features = rng.integers(1, 3, n, endpoint=True).tolist()
+    
+    weather = rng.choice(WEATHER_OPTIONS, n).tolist()
+    traffic = rng.choice(TRAFFIC_OPTIONS, n).tolist()
+    driver_rating = rng.uniform(3.0, 5.0, n).astype(str).tolist()
+    
+    # Uma única leitura de aleatoriedade para todos os UUIDs, em vez de
+    # uma chamada a os.urandom (via uuid4) por registro
+    random_bytes = os.urandom(16 * n)
+    
+    trip_distance = trip_distance.tolist()
+    fare_amount = fare_amount.tolist()
+    tip_amount = tip_amount.tolist()
+    total_amount = total_amount.tolist()
+    
+    # Aliases locais: LOAD_FAST no loop em vez de buscas globais/atributos
+    make_trip = TaxiTrip
+    make_uuid = uuid.UUID
+    data = []
+    append = data.append
+    for i in range(n):
+        append(make_trip(
+            trip_id=make_uuid(bytes=random_bytes[i*16:(i+1)*16], version=4),
+            vendor_id=vendor_ids[i],
+            pickup_datetime=pickup_times[i],
+            dropoff_datetime=dropoff_times[i],
+            passenger_count=passenger_counts[i],
+            trip_distance=trip_distance[i],
+            pickup_longitude=pickup_lon[i],
+            pickup_latitude=pickup_lat[i],
+            dropoff_longitude=dropoff_lon[i],
+            dropoff_latitude=dropoff_lat[i],
+            rate_code_id=rate_code_ids[i],
+            store_and_fwd_flag=flags[i],
+            payment_type=payment_types[i],
+            fare_amount=fare_amount[i],
+            extra=extras[i],
+            mta_tax=0.50,
+            tip_amount=tip_amount[i],
+            tolls_amount=tolls[i],
+            improvement_surcharge=0.30,
+            total_amount=total_amount[i],
+            congestion_surcharge=congestion[i],
+            pickup_location=pickup_locations[i],
+            dropoff_location=dropoff_locations[i],
+            trip_tags=tag_perms[i][:num_tags[i]],
+            trip_features=set(feature_perms[i][:num_features[i]]),
+            trip_metadata={
+                "weather": weather[i],
+                "traffic": traffic[i],
+                "driver_rating": driver_rating[i]
+            }
+        ))
+    
+    return data
+
+def _generate_chunk(num_records: int, seed: int) -> List[TaxiTrip]:
+    """Executado nos processos de trabalho: gera uma fatia com semente própria"""
+    return _build_trips(num_records, np.random.default_rng(seed))
+
 class NYCTaxiBenchmark:
     """Classe principal para executar benchmarks"""
     
-    def __init__(self, cassandra_host='localhost', cassandra_port=9042):
+    def __init__(self, cassandra_host='localhost', cassandra_port=9042, seed=None):
         self.cassandra_host = cassandra_host
         self.cassandra_port = cassandra_port
         self.keyspace = 'nyc_taxi_benchmark'
-        self.connection = None
+        self.session = None
         self.results = []
+        self._prep_insert = None  # INSERT preparado uma vez em setup_database
+        self._inserted_sizes = set()  # Volumes já inseridos por benchmark_batch_insert
+        # Um único gerador para todas as chamadas; com `seed` os dados são reproduzíveis
+        self._rng = np.random.default_rng(seed)
         
     def connect(self) -> bool:
         """Conecta ao Cassandra"""
         try:
-            self.connection = connection.Connection(
-                hosts=[self.cassandra_host],
+            # Com `keyspace`, connect() cria o keyspace se necessário e o usa
+            connection.connect(
+                contact_points=[self.cassandra_host],
                 port=self.cassandra_port,
-                keyspace=self.keyspace
+                keyspace=self.keyspace,
+                # Envia cada INSERT direto a uma réplica da partição
+                load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()),
+                # Compressão dos frames: o driver usa LZ4 (pacote `lz4`) ou Snappy
+                # se algum estiver instalado; sem eles, segue sem compressão
+                compression=True
             )
+            self.session = connection.get_session()
             return True
-        except ConnectionError as e:
+        except Exception as e:
             logger.error(f"Erro ao conectar: {e}")
             return False
     
     def setup_database(self) -> bool:
         """Configura banco de dados"""
         try:
-            session = self.connection.get_session()
-            session.execute(f"""
-                CREATE KEYSPACE IF NOT EXISTS {self.keyspace}
-                WITH replication = {{'class': 'SimpleStrategy', 'replication_factor': 1}}
-            """)
-            session.execute(f"USE {self.keyspace}")
+            session = self.session
+            TaxiTrip.sync_table(auto_apply=True, verbose=False)
+            
+            # Preparado uma única vez e reutilizado por todas as inserções
+            self._prep_insert = session.prepare(INSERT_CQL)
             
-            TaxiTrip.sync_schema(self.connection)
+            # Aquece o driver (conexões do pool, metadados) antes de qualquer medição
+            session.execute("SELECT release_version FROM system.local")
             return True
         except Exception as e:
             logger.error(f"Erro ao configurar banco: {e}")
             return False
     
-    def generate_test_data(self, num_records: int) -> List[TaxiTrip]:
-        """Gera dados de teste"""
-        data = []
-        
-        pickup_zones = ["Manhattan", "Brooklyn", "Queens", "Bronx", "Staten Island"]
-        dropoff_zones = ["Manhattan", "Brooklyn", "Queens", "Bronx", "Staten Island"]
-        trip_tags_options = ["rush_hour", "late_night", "airport", "bridge_tunnel", "highway"]
-        trip_features_options = ["long_distance", "short_trip", "high_fare", "low_fare", "tipped"]
+    def _async_bulk_insert(self, trips: List[TaxiTrip], concurrency: int = INSERT_CONCURRENCY) -> int:
+        """
+        Insere os registros com execute_async, um INSERT por linha, mantendo no
+        máximo `concurrency` requisições em voo (janela deslizante).
+        """
+        session = self.session
+        prepared = self._prep_insert
+        requests = ((prepared, [getattr(trip, column) for column in TAXI_COLUMNS]) for trip in trips)
+        _execute_windowed(session, requests, concurrency)
+        return len(trips)
+    
+    def _token_range_count(self, splits: int = TOKEN_RANGE_SPLITS) -> int:
+        """
+        Conta os registros dividindo o anel de tokens em `splits` faixas e
+        executando um COUNT(*) por faixa em paralelo, em vez de um único
+        COUNT(*) que varre a tabela inteira a partir do coordenador.
+        """
+        session = self.session
+        token_expr = f"token({', '.join(TaxiTrip.__caspy_schema__['partition_keys'])})"
+        prepared = session.prepare(
+            f"SELECT COUNT(*) FROM {TaxiTrip.__table_name__} "
+            f"WHERE {token_expr} > ? AND {token_expr} <= ?"
+        )
+        step = (MAX_TOKEN - MIN_TOKEN) // splits
+        bounds = [MIN_TOKEN + i * step for i in range(splits)] + [MAX_TOKEN]
+        futures = [
+            session.execute_async(prepared, (start, end))
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        return sum(future.result().one().count for future in futures)
+    
+    def _partition_batch_insert(self, trips: List[TaxiTrip], batch_size: int = PARTITION_BATCH_SIZE) -> int:
+        """
+        Agrupa os registros pela chave de partição (vendor_id) e envia micro-batches
+        UNLOGGED de uma única partição. O batch herda a routing key do primeiro
+        statement, então vai direto a uma réplica, sem fan-out no coordenador.
+        """
+        session = self.session
+        prepared = self._prep_insert
         
-        base_time = datetime(2024, 1, 1)
+        def partition_batches():
+            ordered = sorted(trips, key=lambda trip: trip.vendor_id)
+            for _, group in groupby(ordered, key=lambda trip: trip.vendor_id):
+                partition = list(group)
+                for i in range(0, len(partition), batch_size):
+                    batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+                    for trip in partition[i:i+batch_size]:
+                        batch.add(prepared, [getattr(trip, column) for column in TAXI_COLUMNS])
+                    yield batch, None
         
-        for i in range(num_records):
-            random_hours = random.randint(0, 24*365)
-            pickup_time = base_time + timedelta(hours=random_hours)
-            trip_duration = random.randint(5, 120)
-            dropoff_time = pickup_time + timedelta(minutes=trip_duration)
-            
-            pickup_lat = random.uniform(40.5, 40.9)
-            pickup_lon = random.uniform(-74.3, -73.7)
-            dropoff_lat = random.uniform(40.5, 40.9)
-            dropoff_lon = random.uniform(-74.3, -73.7)
-            
-            trip_distance = random.uniform(0.1, 50.0)
-            fare_amount = 2.50 + (trip_distance * 2.50)
-            tip_amount = fare_amount * random.uniform(0, 0.3)
-            total_amount = fare_amount + tip_amount + random.uniform(0, 5)
-            
-            num_tags = random.randint(1, 3)
-            trip_tags = random.sample(trip_tags_options, num_tags)
-            
-            num_features = random.randint(1, 3)
-            trip_features = set(random.sample(trip_features_options, num_features))
-            
-            trip_metadata = {
-                "weather": random.choice(["sunny", "rainy", "snowy", "cloudy"]),
-                "traffic": random.choice(["light", "moderate", "heavy"]),
-                "driver_rating": str(random.uniform(3.0, 5.0))
-            }
-            
-            trip = TaxiTrip(
-                trip_id=uuid.uuid4(),
-                vendor_id=str(random.randint(1, 2)),
-                pickup_datetime=pickup_time,
-                dropoff_datetime=dropoff_time,
-                passenger_count=random.randint(1, 6),
-                trip_distance=trip_distance,
-                pickup_longitude=pickup_lon,
-                pickup_latitude=pickup_lat,
-                dropoff_longitude=dropoff_lon,
-                dropoff_latitude=dropoff_lat,
-                rate_code_id=random.randint(1, 6),
-                store_and_fwd_flag=random.choice(["Y", "N"]),
-                payment_type=random.randint(1, 6),
-                fare_amount=fare_amount,
-                extra=random.uniform(0, 2),
-                mta_tax=0.50,
-                tip_amount=tip_amount,
-                tolls_amount=random.uniform(0, 10),
-                improvement_surcharge=0.30,
-                total_amount=total_amount,
-                congestion_surcharge=random.uniform(0, 5),
-                pickup_location=random.choice(pickup_zones),
-                dropoff_location=random.choice(dropoff_zones),
-                trip_tags=trip_tags,
-                trip_features=trip_features,
-                trip_metadata=trip_metadata
-            )
-            
-            data.append(trip)
+        _execute_windowed(session, partition_batches())
+        return len(trips)
+    
+    def generate_test_data(self, num_records: int) -> List[TaxiTrip]:
+        """
+        Gera dados de teste. Volumes grandes são divididos entre processos
+        (a construção das instâncias é CPU-bound e o GIL impede threads).
+        """
+        workers = min(GENERATION_WORKERS, num_records // PARALLEL_GENERATION_MIN)
+        if workers <= 1:
+            return _build_trips(num_records, self._rng)
         
-        return data
+        sizes = [num_records // workers + (i < num_records % workers) for i in range(workers)]
+        # Sementes derivadas do gerador do benchmark: com `seed` continua reproduzível
+        seeds = self._rng.integers(0, 2**63, workers).tolist()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(_generate_chunk, sizes, seeds)
+            return list(chain.from_iterable(chunks))
     
     def benchmark_batch_insert(self, data_sizes: List[int]) -> None:
         """Benchmark de inserção em lote"""
@@ -246,14 +486,18 @@ class NYCTaxiBenchmark:
             try:
                 logger.info(f"Testando inserção de {size} registros...")
                 
-                # Gera dados
-                result.start()
-                data = self.generate_test_data(size)
-                generation_time = time.time() - result.start_time
-                
-                # Insere em lote
-                TaxiTrip.insert_batch(data, self.connection)
-                result.end(size)
+                # GC cíclico pausado durante a fase medida: as milhares de
+                # instâncias criadas disparariam coletas no meio da medição
+                with _gc_paused():
+                    # Gera dados
+                    result.start()
+                    data = self.generate_test_data(size)
+                    generation_time = (time.perf_counter_ns() - result.start_time) / 1e9
+                    
+                    # Insere em micro-batches agrupados por partição
+                    self._partition_batch_insert(data)
+                    result.end(size)
+                self._inserted_sizes.add(size)
                 
                 logger.info(f"  Geração: {generation_time:.2f}s")
                 logger.info(f"  Inserção: {result.duration:.2f}s")
@@ -267,33 +511,41 @@ class NYCTaxiBenchmark:
             
             self.results.append(result)
     
+    def _ensure_data(self, size: int) -> None:
+        """Insere `size` registros de teste, a menos que benchmark_batch_insert já o tenha feito"""
+        if size in self._inserted_sizes:
+            return
+        self._async_bulk_insert(self.generate_test_data(size))
+        self._inserted_sizes.add(size)
+    
     def benchmark_queries(self, data_sizes: List[int]) -> None:
-        """Benchmark de consultas"""
+        """Benchmark de consultas (com aquecimento e menor tempo de MEASURED_RUNS execuções)"""
         logger.info("=== BENCHMARK DE CONSULTAS ===")
         
         for size in data_sizes:
-            # Primeiro insere dados para teste
-            data = self.generate_test_data(size)
-            TaxiTrip.insert_batch(data, self.connection)
+            self._ensure_data(size)
             
-            # Teste 1: Contagem
+            # Teste 1: Contagem (COUNT(*) paralelo por faixas de token)
             result = BenchmarkResult(f"count_{size}", size)
             try:
-                result.start()
-                count = TaxiTrip.objects(self.connection).count()
-                result.end(count)
+                count = result.run_repeated(self._token_range_count)
                 logger.info(f"Count {size}: {result.duration:.2f}s ({count} registros)")
             except Exception as e:
                 result.set_error(str(e))
             self.results.append(result)
             
-            # Teste 2: Consulta por vendor_id
+            # Consultas de filtro: páginas do tamanho do LIMIT
+            self.session.default_fetch_size = FILTER_FETCH_SIZE
+            
+            # Teste 2: Consulta por vendor_id (a chave de partição). O QuerySet
+            # sempre materializa os resultados numa lista, então a medição inclui
+            # a criação das instâncias
             result = BenchmarkResult(f"filter_vendor_{size}", size)
             try:
-                result.start()
-                trips = list(TaxiTrip.objects(self.connection).filter(vendor_id="1").limit(1000))
-                result.end(len(trips))
-                logger.info(f"Filter vendor {size}: {result.duration:.2f}s ({len(trips)} registros)")
+                found = result.run_repeated(
+                    lambda: len(TaxiTrip.filter(vendor_id="1").limit(1000).all())
+                )
+                logger.info(f"Filter vendor {size}: {result.duration:.2f}s ({found} registros)")
             except Exception as e:
                 result.set_error(str(e))
             self.results.append(result)
@@ -302,58 +554,68 @@ class NYCTaxiBenchmark:
             result = BenchmarkResult(f"filter_date_{size}", size)
             try:
                 seven_days_ago = datetime.utcnow() - timedelta(days=7)
-                result.start()
-                trips = list(TaxiTrip.objects(self.connection).filter(
-                    pickup_datetime__gte=seven_days_ago
-                ).limit(1000))
-                result.end(len(trips))
-                logger.info(f"Filter date {size}: {result.duration:.2f}s ({len(trips)} registros)")
+                found = result.run_repeated(
+                    lambda: len(TaxiTrip.filter(
+                        pickup_datetime__gte=seven_days_ago
+                    ).limit(1000).all())
+                )
+                logger.info(f"Filter date {size}: {result.duration:.2f}s ({found} registros)")
             except Exception as e:
                 result.set_error(str(e))
             self.results.append(result)
     
+    def _export_ndjson(self, size: int) -> int:
+        """
+        Grava até `size` registros em NDJSON. O QuerySet carrega os registros
+        numa lista; as linhas são gravadas em blocos de EXPORT_BUFFER_SIZE bytes.
+        Retorna o total exportado.
+        """
+        exported = 0
+        buffer = bytearray()
+        with open(f"export_{size}.ndjson", 'wb') as f:
+            for trip in TaxiTrip.all().limit(size).all():
+                buffer += _ndjson_line(trip.model_dump())
+                exported += 1
+                if len(buffer) >= EXPORT_BUFFER_SIZE:
+                    f.write(buffer)
+                    buffer.clear()
+            f.write(buffer)
+        return exported
+    
     def benchmark_export(self, data_sizes: List[int]) -> None:
-        """Benchmark de exportação"""
+        """Benchmark de exportação (com aquecimento e menor tempo de MEASURED_RUNS execuções)"""
         logger.info("=== BENCHMARK DE EXPORTAÇÃO ===")
         
         for size in data_sizes:
-            # Insere dados para teste
-            data = self.generate_test_data(size)
-            TaxiTrip.insert_batch(data, self.connection)
+            self._ensure_data(size)
             
             # Teste de exportação JSON
             result = BenchmarkResult(f"export_json_{size}", size)
             try:
-                result.start()
-                trips = TaxiTrip.objects(self.connection).limit(size)
-                json_data = []
-                for trip in trips:
-                    json_data.append(trip.to_dict())
-                result.end(len(json_data))
-                logger.info(f"Export JSON {size}: {result.duration:.2f}s ({len(json_data)} registros)")
+                self.session.default_fetch_size = EXPORT_FETCH_SIZE
+                exported = result.run_repeated(lambda: self._export_ndjson(size))
+                logger.info(f"Export JSON {size}: {result.duration:.2f}s ({exported} registros)")
             except Exception as e:
                 result.set_error(str(e))
             self.results.append(result)
     
-    def save_results(self, filename: str = "benchmark_results.json") -> None:
-        """Salva resultados em arquivo"""
+    def save_results(self, filename: str = "benchmark_results.ndjson") -> None:
+        """Salva os resultados em NDJSON (uma linha por teste) e em Parquet"""
         try:
-            results_dict = [result.to_dict() for result in self.results]
-            
-            with open(filename, 'w') as f:
-                json.dump(results_dict, f, indent=2, default=str)
+            rows = [result.to_dict() for result in self.results]
             
+            with open(filename, 'wb') as f:
+                for row in rows:
+                    f.write(_ndjson_line(row))
             logger.info(f"Resultados salvos em: {filename}")
             
-            # Também salva como CSV
-            csv_filename = filename.replace('.json', '.csv')
-            with open(csv_filename, 'w', newline='') as f:
-                if results_dict:
-                    writer = csv.DictWriter(f, fieldnames=results_dict[0].keys())
-                    writer.writeheader()
-                    writer.writerows(results_dict)
-            
-            logger.info(f"Resultados CSV salvos em: {csv_filename}")
+            # Parquet para análise posterior (test_name é codificado por dicionário)
+            if pq is None:
+                logger.warning("pyarrow não instalado; resultados Parquet não gerados")
+                return
+            parquet_filename = os.path.splitext(filename)[0] + '.parquet'
+            pq.write_table(pa.Table.from_pylist(rows), parquet_filename, compression='zstd')
+            logger.info(f"Resultados Parquet salvos em: {parquet_filename}")
             
         except Exception as e:
             logger.error(f"Erro ao salvar resultados: {e}")
@@ -11,10 +11,9 @@ class Produto(Model):
     quantidade = fields.Integer(default=0)
 
 @pytest.fixture(autouse=True)
-def sync_produto_table(session):
-    """Garante que a tabela exista antes de cada teste neste módulo."""
-    session.execute(f"DROP TABLE IF EXISTS {Produto.__table_name__}")
-    Produto.sync_table()
+def sync_produto_table(reset_table):
+    """Garante que a tabela exista (e esteja vazia) antes de cada teste neste módulo."""
+    reset_table(Produto)
 
 def test_create_e_get():
     produto_id = uuid.uuid4()
@@ -28,6 +27,17 @@ def test_create_e_get():
     assert produto_buscado.id == produto_id
     assert produto_buscado.nome == "Laptop"
 
+def test_create_positional():
+    produto_id = uuid.uuid4()
+    # Valores na ordem dos campos: (id, nome, quantidade)
+    produto = Produto.create_positional((produto_id, "Teclado", None))
+    
+    assert produto.quantidade == 0  # default aplicado
+    assert Produto.get(id=produto_id).nome == "Teclado"
+
+    with pytest.raises(ValueError):
+        Produto.create_positional((uuid.uuid4(), "Faltando campo"))
+
 def test_save_para_update():
     produto_id = uuid.uuid4()
     produto = Produto.create(id=produto_id, nome="Mouse", quantidade=50)
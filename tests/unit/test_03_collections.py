@@ -10,9 +10,8 @@ class Artigo(Model):
     metadados_map = fields.Map(fields.Text(), fields.Text())
 
 @pytest.fixture(autouse=True)
-def sync_artigo_table(session):
-    session.execute(f"DROP TABLE IF EXISTS {Artigo.__table_name__}")
-    Artigo.sync_table()
+def sync_artigo_table(reset_table):
+    reset_table(Artigo)
 
 def test_crud_com_collections():
     artigo_id = uuid.uuid4()
@@ -1,6 +1,7 @@
 import uuid
 import pytest
 from caspyorm import fields, Model
+from caspyorm._internal import stmt_cache
 
 class Funcionario(Model):
     __table_name__ = "funcionarios_qs"
@@ -10,12 +11,13 @@ class Funcionario(Model):
     nome = fields.Text(index=True)
 
 @pytest.fixture(scope="function")
-def funcionarios_data(session):
-    session.execute(f"DROP TABLE IF EXISTS {Funcionario.__table_name__}")
-    Funcionario.sync_table()
-    Funcionario.create(setor="Engenharia", salario=7000, nome="Ana", id=uuid.uuid4())
-    Funcionario.create(setor="Engenharia", salario=9500, nome="Daniel", id=uuid.uuid4())
-    Funcionario.create(setor="Marketing", salario=6000, nome="Carla", id=uuid.uuid4())
+def funcionarios_data(reset_table):
+    reset_table(Funcionario)
+    Funcionario.bulk_create([
+        dict(setor="Engenharia", salario=7000, nome="Ana", id=uuid.uuid4()),
+        dict(setor="Engenharia", salario=9500, nome="Daniel", id=uuid.uuid4()),
+        dict(setor="Marketing", salario=6000, nome="Carla", id=uuid.uuid4()),
+    ])
     return
 
 def test_filter_gt(funcionarios_data):
@@ -42,9 +44,8 @@ def test_lazy_evaluation(funcionarios_data, capsys):
     captured = capsys.readouterr()
     assert "EXECUTADO" in captured.out
 
-def test_filter_com_operadores(session):
-    session.execute(f"DROP TABLE IF EXISTS {Funcionario.__table_name__}")
-    Funcionario.sync_table()
+def test_filter_com_operadores(reset_table):
+    reset_table(Funcionario)
     
     f1 = Funcionario.create(setor="TI", salario=5000, nome="João", id=uuid.uuid4())
     f2 = Funcionario.create(setor="TI", salario=8000, nome="Maria", id=uuid.uuid4())
@@ -60,33 +61,83 @@ def test_filter_com_operadores(session):
     assert len(resultado) == 1
     assert resultado[0].nome == "Maria"
 
-def test_limit(session):
-    session.execute(f"DROP TABLE IF EXISTS {Funcionario.__table_name__}")
-    Funcionario.sync_table()
+def test_limit(reset_table):
+    reset_table(Funcionario)
     
-    for i in range(5):
-        Funcionario.create(setor="Teste", salario=1000+i, nome=f"Func{i}", id=uuid.uuid4())
+    Funcionario.bulk_create([
+        dict(setor="Teste", salario=1000+i, nome=f"Func{i}", id=uuid.uuid4()) for i in range(5)
+    ])
     
     resultado = Funcionario.filter(setor="Teste").limit(3).all()
     assert len(resultado) == 3
 
-def test_first(session):
-    session.execute(f"DROP TABLE IF EXISTS {Funcionario.__table_name__}")
-    Funcionario.sync_table()
+def test_first(reset_table):
+    reset_table(Funcionario)
     
-    Funcionario.create(setor="Teste", salario=1000, nome="Primeiro", id=uuid.uuid4())
-    Funcionario.create(setor="Teste", salario=2000, nome="Segundo", id=uuid.uuid4())
+    Funcionario.bulk_create([
+        dict(setor="Teste", salario=1000, nome="Primeiro", id=uuid.uuid4()),
+        dict(setor="Teste", salario=2000, nome="Segundo", id=uuid.uuid4()),
+    ])
     
     primeiro = Funcionario.filter(setor="Teste", salario=1000).first()
     assert primeiro is not None
     assert primeiro.nome == "Primeiro"
 
-def test_count(session):
-    session.execute(f"DROP TABLE IF EXISTS {Funcionario.__table_name__}")
-    Funcionario.sync_table()
+def test_count(reset_table):
+    reset_table(Funcionario)
     
-    for i in range(3):
-        Funcionario.create(setor="Contagem", salario=1000+i, nome=f"Func{i}", id=uuid.uuid4())
+    Funcionario.bulk_create([
+        dict(setor="Contagem", salario=1000+i, nome=f"Func{i}", id=uuid.uuid4()) for i in range(3)
+    ])
     
     count = Funcionario.filter(setor="Contagem").count()
-    assert count == 3
\ No newline at end of file
+    assert count == 3
+
+def test_prepared_statement_cache(session, reset_table):
+    reset_table(Funcionario)
+    cql = f"SELECT * FROM {Funcionario.__table_name__} WHERE setor = ?"
+    primeiro = stmt_cache.get_or_prepare(session, cql)
+    segundo = stmt_cache.get_or_prepare(session, cql)
+    assert primeiro is segundo
+    
+    # Recriar a tabela descarta os statements preparados para ela
+    session.execute(f"DROP TABLE {Funcionario.__table_name__}")
+    Funcionario.sync_table()
+    assert stmt_cache.get_or_prepare(session, cql) is not primeiro
+
+def test_invalidate_table_com_keyspace():
+    """Statements com a tabela qualificada pelo keyspace também são descartados."""
+    class SessaoFalsa:
+        keyspace = 'ks'
+        def prepare(self, cql):
+            return object()
+    
+    sessao = SessaoFalsa()
+    qualificado = stmt_cache.get_or_prepare(sessao, 'INSERT INTO ks.funcionarios_qs (id) VALUES (?)')
+    com_aspas = stmt_cache.get_or_prepare(sessao, 'SELECT * FROM "ks"."funcionarios_qs"')
+    outra = stmt_cache.get_or_prepare(sessao, 'SELECT * FROM ks.funcionarios_qs_arquivo')
+    
+    stmt_cache.invalidate_table(sessao, 'funcionarios_qs')
+    
+    assert stmt_cache.get_or_prepare(sessao, 'INSERT INTO ks.funcionarios_qs (id) VALUES (?)') is not qualificado
+    assert stmt_cache.get_or_prepare(sessao, 'SELECT * FROM "ks"."funcionarios_qs"') is not com_aspas
+    assert stmt_cache.get_or_prepare(sessao, 'SELECT * FROM ks.funcionarios_qs_arquivo') is outra
+
+def test_values_list(funcionarios_data):
+    salarios = Funcionario.filter(setor="Engenharia").values_list('salario', flat=True)
+    assert sorted(salarios) == [7000, 9500]
+    
+    pares = Funcionario.filter(setor="Marketing").values_list('nome', 'salario')
+    assert pares == [("Carla", 6000)]
+
+def test_iterator(funcionarios_data):
+    nomes = [f.nome for f in Funcionario.filter(setor="Engenharia").iterator(fetch_size=1)]
+    assert sorted(nomes) == ["Ana", "Daniel"]
+
+def test_count_future(funcionarios_data):
+    futures = [Funcionario.filter(setor=setor).count_future() for setor in ("Engenharia", "Marketing")]
+    assert [future.result().one().count for future in futures] == [2, 1]
+
+def test_values(funcionarios_data):
+    linhas = Funcionario.filter(setor="Marketing").values('nome', 'salario')
+    assert linhas == [{'nome': "Carla", 'salario': 6000}]
@@ -1,12 +1,36 @@
+import logging
 import pytest
 import time
-from caspyorm import fields, Model
+from caspyorm import fields, Model, connection
+from caspyorm._internal import stmt_cache
+from caspyorm._internal.schema_sync import SCHEMA_COMMENT_PREFIX, schema_fingerprint
 import uuid
 
+# Consultas ao system_schema usadas pelos testes, preparadas uma única vez por
+# sessão e executadas com valores vinculados.
+SCHEMA_QUERIES = {
+    'cols_by_table': (
+        "SELECT column_name, type FROM system_schema.columns "
+        "WHERE keyspace_name = ? AND table_name = ?"
+    ),
+    'col_by_name': (
+        "SELECT column_name, type FROM system_schema.columns "
+        "WHERE keyspace_name = ? AND table_name = ? AND column_name = ?"
+    ),
+    'table_exists': (
+        "SELECT table_name, comment FROM system_schema.tables "
+        "WHERE keyspace_name = ? AND table_name = ?"
+    ),
+}
+
 def wait_for_column(session, keyspace, table, column, timeout=5, should_exist=True):
     """
     Aguarda até que uma coluna apareça ou desapareça do schema.
     
+    A consulta é preparada uma única vez (cache de statements da sessão) e o
+    intervalo entre tentativas começa em 50ms e dobra até 0,5s, em vez de
+    esperar 1s fixo por tentativa.
+    
     Args:
         session: Sessão do Cassandra
         keyspace: Nome do keyspace
@@ -18,56 +42,85 @@ def wait_for_column(session, keyspace, table, column, timeout=5, should_exist=Tr
     Returns:
         bool: True se a condição foi atendida dentro do timeout
     """
-    for _ in range(timeout):
-        result = session.execute(f"""
-            SELECT column_name FROM system_schema.columns
-            WHERE keyspace_name = '{keyspace}'
-            AND table_name = '{table}'
-            AND column_name = '{column}'
-        """)
-        
-        exists = result.one() is not None
+    prepared = stmt_cache.get_or_prepare(session, SCHEMA_QUERIES['col_by_name'])
+    deadline = time.monotonic() + timeout
+    intervalo = 0.05
+    while True:
+        exists = session.execute(prepared, (keyspace, table, column)).one() is not None
         
         if exists == should_exist:
             return True
+        if time.monotonic() >= deadline:
+            return False
             
-        time.sleep(1)
-    
-    return False
+        time.sleep(intervalo)
+        intervalo = min(intervalo * 2, 0.5)
+
+@pytest.fixture(scope="module")
+def tabelas_criadas(cassandra_session):
+    """
+    Registra as tabelas criadas no módulo e as remove uma única vez no final,
+    em vez de um DROP antes e outro depois de cada teste. Só recebem DROP as
+    tabelas que de fato existem (um teste pode falhar antes do sync_table()),
+    e os DROPs seguem em paralelo.
+    """
+    nomes = []
+    yield nomes
+    session = connection.get_session()
+    keyspace = session.cluster.metadata.keyspaces.get(session.keyspace)
+    existentes = set(keyspace.tables) if keyspace else set(nomes)
+    futures = [session.execute_async(f"DROP TABLE IF EXISTS {nome}") for nome in nomes if nome in existentes]
+    for future in futures:
+        future.result()
+
+@pytest.fixture(scope="module")
+def schema_queries(cassandra_session):
+    """Statements preparados das consultas ao system_schema (ver SCHEMA_QUERIES)."""
+    session = connection.get_session()
+    return {name: stmt_cache.get_or_prepare(session, cql) for name, cql in SCHEMA_QUERIES.items()}
+
+@pytest.fixture(scope="module")
+def columns_snapshot(schema_queries):
+    """
+    Retorna uma função `get(tabela)` com o mapa coluna -> tipo da tabela, lido
+    do system_schema numa única consulta (preparada uma vez por módulo).
+    """
+    session = connection.get_session()
+    def get(table):
+        rows = session.execute(schema_queries['cols_by_table'], [session.keyspace, table])
+        return {row.column_name: row.type for row in rows}
+    return get
 
-class ProdutoOriginal(Model):
-    __table_name__ = 'produtos_sync'
-    id = fields.UUID(primary_key=True)
-    nome = fields.Text()
+@pytest.fixture
+def tabela(tabelas_criadas):
+    """Nome de tabela exclusivo do teste: nenhum teste precisa limpar a tabela de outro."""
+    nome = f"produtos_sync_{uuid.uuid4().hex[:8]}"
+    tabelas_criadas.append(nome)
+    return nome
 
-@pytest.fixture(autouse=True)
-def limpar_tabela(session):
-    """Limpa a tabela antes de cada teste."""
-    session.execute(f"DROP TABLE IF EXISTS produtos_sync")
-    yield
-    session.execute(f"DROP TABLE IF EXISTS produtos_sync")
+@pytest.fixture
+def ProdutoOriginal(tabela):
+    class ProdutoOriginal(Model):
+        __table_name__ = tabela
+        id = fields.UUID(primary_key=True)
+        nome = fields.Text()
+    return ProdutoOriginal
 
-def test_sync_table_cria_tabela(session):
+def test_sync_table_cria_tabela(columns_snapshot, tabela, ProdutoOriginal):
     """Testa se sync_table cria a tabela quando ela não existe."""
     ProdutoOriginal.sync_table()
     
-    # Verifica se a tabela foi criada
-    result = session.execute(f"""
-        SELECT table_name FROM system_schema.tables 
-        WHERE keyspace_name = '{session.keyspace}' 
-        AND table_name = 'produtos_sync'
-    """)
-    
-    assert result.one() is not None
+    # Uma única leitura confirma a tabela e as colunas com seus tipos
+    assert columns_snapshot(tabela) == {'id': 'uuid', 'nome': 'text'}
 
-def test_sync_table_com_campo_novo(session):
+def test_sync_table_com_campo_novo(columns_snapshot, tabela, ProdutoOriginal):
     """Testa se sync_table adiciona novos campos."""
     # Cria tabela inicial
     ProdutoOriginal.sync_table()
     
     # Redefine o modelo com um campo adicional
     class ProdutoAtualizado(Model):
-        __table_name__ = 'produtos_sync'
+        __table_name__ = tabela
         id = fields.UUID(primary_key=True)
         nome = fields.Text()
         preco = fields.Float()  # Substituído Decimal por Float
@@ -77,72 +130,45 @@ def test_sync_table_com_campo_novo(session):
     
     # Verifica se o campo foi adicionado
     # Como o sync_table recria a tabela, vamos verificar se a tabela foi criada com o campo correto
-    result = session.execute(f"""
-        SELECT column_name FROM system_schema.columns 
-        WHERE keyspace_name = '{session.keyspace}' 
-        AND table_name = 'produtos_sync'
-    """)
-    
-    columns = [row.column_name for row in result]
-    assert 'preco' in columns, f"Campo 'preco' não encontrado. Colunas: {columns}"
+    columns = columns_snapshot(tabela)
+    assert 'preco' in columns, f"Campo 'preco' não encontrado. Colunas: {list(columns)}"
 
-def test_sync_table_com_campo_removido(session):
+def test_sync_table_com_campo_removido(columns_snapshot, tabela, caplog):
     """
     Testa se sync_table AVISA sobre campos a serem removidos,
     mas NÃO os remove automaticamente por segurança.
     """
-    import logging
-    from io import StringIO
-    
-    # Captura logs diretamente do logger da CaspyORM
-    log_stream = StringIO()
-    log_handler = logging.StreamHandler(log_stream)
-    log_handler.setLevel(logging.WARNING)
-    
-    # Adiciona handler temporário ao logger da CaspyORM
-    caspy_logger = logging.getLogger("caspyorm._internal.schema_sync")
-    original_handlers = caspy_logger.handlers.copy()
-    caspy_logger.addHandler(log_handler)
-    
-    try:
-        # Cria tabela com campo extra
-        class ProdutoComExtra(Model):
-            __table_name__ = 'produtos_sync'
-            id = fields.UUID(primary_key=True)
-            nome = fields.Text()
-            extra = fields.Text()  # Campo que será removido
-
-        ProdutoComExtra.sync_table()
-
-        # Redefine sem o campo extra
-        class ProdutoSemExtra(Model):
-            __table_name__ = 'produtos_sync'
-            id = fields.UUID(primary_key=True)
-            nome = fields.Text()
-
-        # Sincroniza novamente
-        ProdutoSemExtra.sync_table(auto_apply=True)
-
-        # 1. Verifica se o AVISO foi logado
-        log_text = log_stream.getvalue()
-        assert "A remoção automática de colunas não é suportada" in log_text, f"Log não encontrado. Logs capturados: {log_text}"
-        assert "ALTER TABLE produtos_sync DROP extra" in log_text, f"Comando DROP não encontrado. Logs capturados: {log_text}"
-        
-        # 2. Verifica se a coluna NÃO foi removida (comportamento seguro)
-        result = session.execute(f"""
-            SELECT column_name FROM system_schema.columns 
-            WHERE keyspace_name = '{session.keyspace}' 
-            AND table_name = 'produtos_sync'
-        """)
-        
-        columns = [row.column_name for row in result]
-        assert 'extra' in columns, "A coluna 'extra' foi removida, o que não é o comportamento esperado por segurança."
+    # Captura os avisos do logger de sincronização da CaspyORM
+    caplog.set_level(logging.WARNING, logger="caspyorm._internal.schema_sync")
     
-    finally:
-        # Restaura handlers originais
-        caspy_logger.handlers = original_handlers
+    # Cria tabela com campo extra
+    class ProdutoComExtra(Model):
+        __table_name__ = tabela
+        id = fields.UUID(primary_key=True)
+        nome = fields.Text()
+        extra = fields.Text()  # Campo que será removido
+
+    ProdutoComExtra.sync_table()
+
+    # Redefine sem o campo extra
+    class ProdutoSemExtra(Model):
+        __table_name__ = tabela
+        id = fields.UUID(primary_key=True)
+        nome = fields.Text()
+
+    # Sincroniza novamente
+    ProdutoSemExtra.sync_table(auto_apply=True)
+
+    # 1. Verifica se o AVISO foi logado
+    log_text = caplog.text
+    assert "A remoção automática de colunas não é suportada" in log_text, f"Log não encontrado. Logs capturados: {log_text}"
+    assert f"ALTER TABLE {tabela} DROP extra" in log_text, f"Comando DROP não encontrado. Logs capturados: {log_text}"
+    
+    # 2. Verifica se a coluna NÃO foi removida (comportamento seguro)
+    columns = columns_snapshot(tabela)
+    assert 'extra' in columns, "A coluna 'extra' foi removida, o que não é o comportamento esperado por segurança."
 
-def test_sync_table_preserva_dados(session):
+def test_sync_table_preserva_dados(session, tabela, ProdutoOriginal):
     """Testa se sync_table preserva dados existentes ao adicionar campos."""
     # Cria tabela inicial e insere dados
     ProdutoOriginal.sync_table()
@@ -151,7 +177,7 @@ def test_sync_table_preserva_dados(session):
     
     # Redefine com campo adicional
     class ProdutoComPreco(Model):
-        __table_name__ = 'produtos_sync'
+        __table_name__ = tabela
         id = fields.UUID(primary_key=True)
         nome = fields.Text()
         preco = fields.Float()  # Substituído Decimal por Float
@@ -164,11 +190,11 @@ def test_sync_table_preserva_dados(session):
     assert produto is not None
     assert produto.nome == "Produto Original"
 
-def test_sync_table_com_tipo_diferente(session):
+def test_sync_table_com_tipo_diferente(columns_snapshot, tabela):
     """Testa se sync_table detecta mudanças de tipo."""
     # Cria tabela com campo Integer
     class ProdutoComInt(Model):
-        __table_name__ = 'produtos_sync'
+        __table_name__ = tabela
         id = fields.UUID(primary_key=True)
         quantidade = fields.Integer()
     
@@ -176,7 +202,7 @@ def test_sync_table_com_tipo_diferente(session):
     
     # Redefine com campo Text
     class ProdutoComText(Model):
-        __table_name__ = 'produtos_sync'
+        __table_name__ = tabela
         id = fields.UUID(primary_key=True)
         quantidade = fields.Text()  # Mudança de tipo
     
@@ -184,11 +210,42 @@ def test_sync_table_com_tipo_diferente(session):
     ProdutoComText.sync_table()
     
     # Verifica se o tipo foi mantido como Integer
-    result = session.execute(f"""
-        SELECT type FROM system_schema.columns 
-        WHERE keyspace_name = '{session.keyspace}' 
-        AND table_name = 'produtos_sync'
-        AND column_name = 'quantidade'
-    """)
-    
-    assert result.one().type == 'int'
\ No newline at end of file
+    assert columns_snapshot(tabela)['quantidade'] == 'int'
+
+
+def test_sync_table_registra_schema_no_comentario(session, schema_queries, tabela, ProdutoOriginal):
+    """Testa se sync_table grava a impressão digital do schema no comentário da tabela."""
+    ProdutoOriginal.sync_table()
+    
+    result = session.execute(schema_queries['table_exists'], [session.keyspace, tabela])
+    esperado = SCHEMA_COMMENT_PREFIX + schema_fingerprint(ProdutoOriginal.__caspy_schema__)
+    assert result.one().comment == esperado
+    
+    # Um modelo diferente na mesma tabela não bate com a impressão digital
+    class ProdutoComPreco(Model):
+        __table_name__ = tabela
+        id = fields.UUID(primary_key=True)
+        nome = fields.Text()
+        preco = fields.Float()
+    
+    assert schema_fingerprint(ProdutoComPreco.__caspy_schema__) != schema_fingerprint(ProdutoOriginal.__caspy_schema__)
+
+
+def test_sync_table_sem_auto_apply_nao_grava_comentario(session, schema_queries, tabela, ProdutoOriginal):
+    """Testa se sync_table sem auto_apply não executa DDL numa tabela que já confere com o modelo."""
+    session.execute(f"CREATE TABLE {tabela} (id uuid PRIMARY KEY, nome text)")
+    
+    ProdutoOriginal.sync_table()
+    
+    result = session.execute(schema_queries['table_exists'], [session.keyspace, tabela])
+    assert not result.one().comment
+
+
+def test_sync_table_detecta_coluna_removida_fora_da_orm(session, columns_snapshot, tabela, ProdutoOriginal):
+    """Testa se o comentário com a impressão digital não esconde um DROP feito fora da CaspyORM."""
+    ProdutoOriginal.sync_table()
+    session.execute(f"ALTER TABLE {tabela} DROP nome")
+    
+    ProdutoOriginal.sync_table(auto_apply=True)
+    
+    assert columns_snapshot(tabela) == {'id': 'uuid', 'nome': 'text'}
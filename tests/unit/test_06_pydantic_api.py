@@ -10,9 +10,8 @@ class Usuario(Model):
     ativo = fields.Boolean(default=True)
 
 @pytest.fixture(autouse=True)
-def sync_usuario_table(session):
-    session.execute(f"DROP TABLE IF EXISTS {Usuario.__table_name__}")
-    Usuario.sync_table()
+def sync_usuario_table(reset_table):
+    reset_table(Usuario)
 
 def test_create_pydantic_model():
     """Testa a criação de um modelo Pydantic a partir de um modelo CaspyORM."""
@@ -72,18 +71,16 @@ def test_conversao_entre_modelos():
         ativo=False
     )
     
-    # Converte para Pydantic
-    dados_pydantic = {
-        'id': usuario_caspy.id,
-        'nome': usuario_caspy.nome,
-        'email': usuario_caspy.email,
-        'ativo': usuario_caspy.ativo
-    }
-    
-    usuario_pydantic = PydanticUsuario(**dados_pydantic)
+    # Converte para Pydantic (com validação)
+    usuario_pydantic = usuario_caspy.to_pydantic_model()
+    assert isinstance(usuario_pydantic, PydanticUsuario)
+    assert usuario_pydantic.id == usuario_caspy.id
     assert usuario_pydantic.nome == usuario_caspy.nome
     assert usuario_pydantic.email == usuario_caspy.email
     assert usuario_pydantic.ativo == usuario_caspy.ativo
+    
+    # Com validate=False a instância é montada sem revalidar, com os mesmos valores
+    assert usuario_caspy.to_pydantic_model(validate=False) == usuario_pydantic
 
 def test_pydantic_model_com_tipos_especiais():
     """Testa se tipos especiais (UUID, Boolean) são tratados corretamente."""
@@ -114,4 +111,34 @@ def test_pydantic_model_sem_campos_especiais():
     
     dados = {'texto': 'Texto simples'}
     modelo = PydanticModelo(**dados)
-    assert modelo.texto == 'Texto simples' 
\ No newline at end of file
+    assert modelo.texto == 'Texto simples'
+
+
+def test_pydantic_model_em_cache():
+    """Testa se o modelo Pydantic gerado é reaproveitado entre chamadas."""
+    assert Usuario.as_pydantic() is Usuario.as_pydantic()
+    assert Usuario.as_pydantic(exclude=['email']) is Usuario.as_pydantic(exclude=['email'])
+    assert Usuario.as_pydantic(exclude=['email']) is not Usuario.as_pydantic()
+    assert 'email' not in Usuario.as_pydantic(exclude=['email']).model_fields
+
+def test_pydantic_list_adapter_em_cache():
+    """Testa o TypeAdapter de listas: reaproveitado entre chamadas e serializando em lote."""
+    adapter = Usuario.as_pydantic_list_adapter()
+    assert adapter is Usuario.as_pydantic_list_adapter()
+    assert adapter is not Usuario.as_pydantic_list_adapter(exclude=['email'])
+
+    usuarios = [Usuario(id=uuid.uuid4(), nome=f'Usuário {i}') for i in range(3)]
+    json_bytes = adapter.dump_json([u.to_pydantic_model() for u in usuarios])
+    assert [u.id for u in adapter.validate_json(json_bytes)] == [u.id for u in usuarios]
+
+def test_pydantic_model_default_chamavel():
+    """Testa se defaults chamáveis viram default_factory no modelo Pydantic."""
+    class ComDefaultChamavel(Model):
+        __table_name__ = 'com_default_chamavel'
+        id = fields.UUID(primary_key=True, default=uuid.uuid4)
+        texto = fields.Text()
+
+    PydanticModelo = ComDefaultChamavel.as_pydantic()
+    primeiro, segundo = PydanticModelo(), PydanticModelo()
+    assert isinstance(primeiro.id, uuid.UUID)
+    assert primeiro.id != segundo.id
@@ -1,30 +1,42 @@
 import pytest
+import random
+import re
 import uuid
 from caspyorm import fields, Model
 from caspyorm.connection import connection
 from caspyorm.exceptions import CaspyORMException, ValidationError, ConnectionError
 
+# Padrões das mensagens esperadas, compilados uma única vez para o módulo
+_MSG = {
+    'required': re.compile("Campo 'nome' é obrigatório"),
+    'convert': re.compile("Não foi possível converter"),
+    'convert_item': re.compile("Não foi possível converter item"),
+    'convert_key': re.compile("Não foi possível converter chave"),
+    'convert_value': re.compile("Não foi possível converter valor"),
+    'no_connection': re.compile(r"[cC]onexão com o Cassandra não foi estabelecida"),
+    'pk_none_save': re.compile(r"Primary key 'id' cannot be None before saving\."),
+    'not_indexed': re.compile("não é uma chave primária nem está indexado"),
+}
+
 # NOVA FIXTURE para isolar os testes de desconexão
 @pytest.fixture
-def disconnected_session():
-    """Fixture que desconecta a sessão para um teste e a reconecta depois."""
-    # Salva o estado atual da conexão
-    was_connected = connection.is_connected
-    
-    # Desconecta se estiver conectado
-    if was_connected:
-        connection.disconnect()
-    
-    yield  # Permite que o teste execute
-    
-    # Reconecta se estava conectado antes
-    if was_connected:
-        try:
-            connection.connect(contact_points=["127.0.0.1"], keyspace="caspyorm_test_suite")
-        except Exception as e:
-            print(f"Erro ao reconectar: {e}")
-            # Tenta reconectar novamente
-            connection.connect(contact_points=["127.0.0.1"], keyspace="caspyorm_test_suite")
+def fake_disconnected(monkeypatch):
+    """
+    Simula a ausência de conexão sem derrubar o cluster: com a flag interna
+    desligada, `get_session()` levanta o mesmo RuntimeError de uma conexão
+    nunca estabelecida. Evita o custo de desconectar e reconectar o driver
+    (topologia e metadados de schema) só para checar a mensagem de erro.
+    """
+    monkeypatch.setattr(connection, "_is_connected", False)
+
+# Os testes não dependem de UUIDs criptograficamente aleatórios: um valor fixo,
+# derivado de uma semente, evita uma leitura de os.urandom por chamada.
+UID = uuid.UUID(int=random.Random(0xC0FFEE).getrandbits(128))
+
+@pytest.fixture
+def uid():
+    """UUID determinístico para a chave primária dos registros de teste."""
+    return UID
 
 def with_connection(test_func):
     """Decorator para garantir que a conexão está ativa antes do teste."""
@@ -40,7 +52,6 @@ def with_connection(test_func):
 def cassandra_disponivel():
     """Verifica se o Cassandra está disponível sem tentar conectar."""
     try:
-        from caspyorm.connection import connection
         # Se já está conectado, retorna True
         if connection.is_connected:
             return True
@@ -50,114 +61,156 @@ def cassandra_disponivel():
     except Exception:
         return False
 
-def test_excecao_campo_obrigatorio(session):
-    """Testa se exceção é levantada quando campo obrigatório não é fornecido."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text(required=True)
-    
-    with pytest.raises(ValidationError, match="Campo 'nome' é obrigatório"):
-        Usuario.create(id=uuid.uuid4())
+# Modelos compartilhados pelos testes de validação na construção: definidos uma
+# única vez no módulo em vez de recriados (com todo o trabalho da metaclasse)
+# dentro de cada teste.
+class UsuarioObrigatorio(Model):
+    __table_name__ = 'usuarios_exceptions'
+    id = fields.UUID(primary_key=True)
+    nome = fields.Text(required=True)
 
-def test_excecao_tipo_invalido(session):
-    """Testa se exceção é levantada quando tipo de dado é inválido."""
-    class Produto(Model):
-        __table_name__ = 'produtos_exceptions'
-        id = fields.UUID(primary_key=True)
-        preco = fields.Integer()
-    
-    with pytest.raises(TypeError, match="Não foi possível converter"):
-        Produto.create(id=uuid.uuid4(), preco="não é número")
+class ProdutoInteiro(Model):
+    __table_name__ = 'produtos_exceptions'
+    id = fields.UUID(primary_key=True)
+    preco = fields.Integer()
+
+class ProdutoFloat(Model):
+    __table_name__ = 'produtos_float_exceptions'
+    id = fields.UUID(primary_key=True)
+    preco = fields.Float()
+
+class ConfigBoolean(Model):
+    __table_name__ = 'config_boolean_exceptions'
+    id = fields.UUID(primary_key=True)
+    ativo = fields.Boolean()
+
+class Documento(Model):
+    __table_name__ = 'documentos_exceptions'
+    id = fields.UUID(primary_key=True)
+    tags = fields.List(fields.Text())
+
+class UsuarioPermissoes(Model):
+    __table_name__ = 'usuarios_set_exceptions'
+    id = fields.UUID(primary_key=True)
+    permissoes = fields.Set(fields.Text())
+
+class ConfigTexto(Model):
+    __table_name__ = 'configuracoes_exceptions'
+    id = fields.UUID(primary_key=True)
+    settings = fields.Map(fields.Text(), fields.Text())
+
+class ConfigInteiro(Model):
+    __table_name__ = 'configuracoes_int_exceptions'
+    id = fields.UUID(primary_key=True)
+    settings = fields.Map(fields.Text(), fields.Integer())
+
+class UsuarioUUID(Model):
+    __table_name__ = 'usuarios_uuid_exceptions'
+    id = fields.UUID(primary_key=True)
+    nome = fields.Text()
+
+# Modelos dos testes que falham antes de qualquer CQL (não precisam de tabela)
+class Artigo(Model):
+    __table_name__ = 'artigos_exceptions_op'
+    id = fields.UUID(primary_key=True)
+    titulo = fields.Text()
+
+class Item(Model):
+    __table_name__ = 'itens_exceptions'
+    # Desabilita o gerador de UUID padrão para permitir None no teste
+    id = fields.UUID(primary_key=True, default=None)
+    nome = fields.Text()
 
-def test_excecao_conexao_nao_estabelecida(disconnected_session):
-    """Testa se exceção é levantada quando não há conexão com Cassandra."""
-    from caspyorm.connection import connection
+# Modelos com tabela no banco
+class Evento(Model):
+    __table_name__ = 'eventos_exceptions'
+    id = fields.UUID(primary_key=True)
+    data = fields.Text(partition_key=True)  # Usando Text em vez de Date
+    descricao = fields.Text()  # Não indexado
+
+class UsuarioNome(Model):
+    __table_name__ = 'usuarios_update_exceptions'
+    id = fields.UUID(primary_key=True)
+    nome = fields.Text()
+
+# Apenas estas tabelas são criadas (uma única vez para o módulo) pela fixture
+# `pre_create_tables` do conftest, em vez de um sync_table() por teste.
+PRE_CREATE_MODELS = [Evento, UsuarioNome]
+
+@pytest.mark.parametrize("model,kwargs,exc,msg", [
+    pytest.param(UsuarioObrigatorio, {'id': UID},
+                 ValidationError, _MSG['required'], id="campo_obrigatorio"),
+    pytest.param(UsuarioObrigatorio, {'id': UID, 'nome': None},
+                 ValidationError, _MSG['required'], id="campo_required_none"),
+    pytest.param(ProdutoInteiro, {'id': UID, 'preco': "não é número"},
+                 TypeError, _MSG['convert'], id="tipo_invalido"),
+    pytest.param(ProdutoFloat, {'id': UID, 'preco': "não é número"},
+                 TypeError, _MSG['convert'], id="float_invalido"),
+    pytest.param(ConfigBoolean, {'id': UID, 'ativo': "não é boolean"},
+                 TypeError, _MSG['convert'], id="boolean_invalido"),
+    pytest.param(UsuarioUUID, {'id': "não é um uuid válido", 'nome': "João"},
+                 TypeError, _MSG['convert'], id="uuid_invalido"),
+    pytest.param(Documento, {'id': UID, 'tags': ["tag1", 123, "tag2"]},
+                 TypeError, _MSG['convert_item'], id="colecao_tipo_invalido"),
+    pytest.param(UsuarioPermissoes, {'id': UID, 'permissoes': {"admin", 123, "user"}},
+                 TypeError, _MSG['convert_item'], id="set_tipo_invalido"),
+    pytest.param(ConfigTexto, {'id': UID, 'settings': {123: "valor"}},
+                 TypeError, _MSG['convert_key'], id="map_chave_invalida"),
+    pytest.param(ConfigInteiro, {'id': UID, 'settings': {"chave": "não é número"}},
+                 TypeError, _MSG['convert_value'], id="map_valor_invalido"),
+])
+def test_excecao_validacao_no_create(model, kwargs, exc, msg):
+    """Testa se create() rejeita valores inválidos antes de qualquer acesso ao banco."""
+    with pytest.raises(exc, match=msg):
+        model.create(**kwargs)
+
+@pytest.mark.usefixtures("fake_disconnected")
+class TestSemConexao:
+    """Testes que exigem a conexão encerrada."""
     
-    # A fixture já garantiu a desconexão
+    def test_excecao_conexao_nao_estabelecida(self, uid):
+        """Testa se exceção é levantada quando não há conexão com Cassandra."""
+        # A fixture já garantiu a desconexão
     
-    class Teste(Model):
-        __table_name__ = 'teste_conexao'
-        id = fields.UUID(primary_key=True)
+        class Teste(Model):
+            __table_name__ = 'teste_conexao'
+            id = fields.UUID(primary_key=True)
     
-    with pytest.raises(RuntimeError, match=r"[cC]onexão com o Cassandra não foi estabelecida"):
-        Teste.create(id=uuid.uuid4())
+        with pytest.raises(RuntimeError, match=_MSG['no_connection']):
+            Teste.create(id=uid)
 
-def test_excecao_operador_invalido(session):
-    """Testa se exceção é levantada quando operador de filtro é inválido."""
-    class Artigo(Model):
-        __table_name__ = 'artigos_exceptions_op'
-        id = fields.UUID(primary_key=True)
-        titulo = fields.Text()
+    def test_excecao_sync_table_sem_conexao(self):
+        """Testa se exceção é levantada ao tentar sincronizar sem conexão."""
+        # A fixture já garantiu a desconexão
     
-    Artigo.sync_table()
+        class TesteSync(Model):
+            __table_name__ = 'teste_sync'
+            id = fields.UUID(primary_key=True)
     
+        with pytest.raises(RuntimeError, match=_MSG['no_connection']):
+            TesteSync.sync_table()
+
+def test_excecao_operador_invalido():
+    """Testa se exceção é levantada quando operador de filtro é inválido."""
     # A biblioteca corretamente levanta um ValueError, não um UserWarning
     with pytest.raises(ValueError, match="Operador de filtro não suportado: 'invalid_op'"):
         list(Artigo.filter(titulo__invalid_op="valor"))
 
-def test_excecao_campo_nao_indexado(session):
+def test_excecao_campo_nao_indexado(pre_create_tables, uid):
     """Testa se exceção é levantada quando filtro é aplicado em campo não indexado."""
-    class Evento(Model):
-        __table_name__ = 'eventos_exceptions'
-        id = fields.UUID(primary_key=True)
-        data = fields.Text(partition_key=True)  # Usando Text em vez de Date
-        descricao = fields.Text()  # Não indexado
-    
-    # Primeiro sincroniza a tabela
-    Evento.sync_table()
-    
     # Cria um evento para testar
-    evento = Evento.create(id=uuid.uuid4(), data="2024-01-01", descricao="Teste")
+    evento = Evento.create(id=uid, data="2024-01-01", descricao="Teste")
     
     # Testa filtro em campo não indexado - deve gerar warning
-    with pytest.warns(UserWarning, match="não é uma chave primária nem está indexado"):
+    with pytest.warns(UserWarning, match=_MSG['not_indexed']):
         list(Evento.filter(descricao="alguma descrição"))
 
-def test_excecao_primary_key_obrigatoria(session):
+def test_excecao_primary_key_obrigatoria():
     """Testa se exceção é levantada quando primary key não é fornecida."""
-    class Item(Model):
-        __table_name__ = 'itens_exceptions'
-        # Desabilita o gerador de UUID padrão para permitir None no teste
-        id = fields.UUID(primary_key=True, default=None)
-        nome = fields.Text()
-    
-    Item.sync_table()
-    
     # A validação agora está em save(), que é chamado por create()
-    with pytest.raises(ValidationError, match="Primary key 'id' cannot be None before saving."):
+    with pytest.raises(ValidationError, match=_MSG['pk_none_save']):
         Item.create(nome="Item sem ID")
 
-def test_excecao_colecao_tipo_invalido(session):
-    """Testa se exceção é levantada quando coleção contém tipos inválidos."""
-    class Documento(Model):
-        __table_name__ = 'documentos_exceptions'
-        id = fields.UUID(primary_key=True)
-        tags = fields.List(fields.Text())
-    
-    with pytest.raises(TypeError, match="Não foi possível converter item"):
-        Documento.create(id=uuid.uuid4(), tags=["tag1", 123, "tag2"])
-
-def test_excecao_map_chave_invalida(session):
-    """Testa se exceção é levantada quando chave do map é inválida."""
-    class Configuracao(Model):
-        __table_name__ = 'configuracoes_exceptions'
-        id = fields.UUID(primary_key=True)
-        settings = fields.Map(fields.Text(), fields.Text())
-    
-    with pytest.raises(TypeError, match="Não foi possível converter chave"):
-        Configuracao.create(id=uuid.uuid4(), settings={123: "valor"})
-
-def test_excecao_map_valor_invalido(session):
-    """Testa se exceção é levantada quando valor do map é inválido."""
-    class Configuracao(Model):
-        __table_name__ = 'configuracoes_exceptions'
-        id = fields.UUID(primary_key=True)
-        settings = fields.Map(fields.Text(), fields.Integer())
-    
-    with pytest.raises(TypeError, match="Não foi possível converter valor"):
-        Configuracao.create(id=uuid.uuid4(), settings={"chave": "não é número"})
-
 def test_excecao_required_com_default():
     """Testa se exceção é levantada quando campo é required e tem default."""
     with pytest.raises(ValueError, match="não pode ser 'required' e ter um 'default'"):
@@ -169,86 +222,16 @@ def test_excecao_modelo_sem_primary_key():
         class ModeloSemPK(Model):
             nome = fields.Text()
 
-def test_excecao_sync_table_sem_conexao(disconnected_session):
-    """Testa se exceção é levantada ao tentar sincronizar sem conexão."""
-    from caspyorm.connection import connection
-    
-    # A fixture já garantiu a desconexão
-    
-    class TesteSync(Model):
-        __table_name__ = 'teste_sync'
-        id = fields.UUID(primary_key=True)
-    
-    with pytest.raises(RuntimeError, match=r"[cC]onexão com o Cassandra não foi estabelecida"):
-        TesteSync.sync_table()
-
-def test_excecao_uuid_invalido(session):
-    """Testa se exceção é levantada quando UUID é inválido."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_uuid_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text()
-    
-    with pytest.raises(TypeError, match="Não foi possível converter"):
-        Usuario.create(id="não é um uuid válido", nome="João")
-
-def test_excecao_boolean_invalido(session):
-    """Testa se exceção é levantada quando boolean é inválido."""
-    class Config(Model):
-        __table_name__ = 'config_boolean_exceptions'
-        id = fields.UUID(primary_key=True)
-        ativo = fields.Boolean()
-    
-    Config.sync_table()
-    
-    with pytest.raises(TypeError, match="Não foi possível converter"):
-        Config.create(id=uuid.uuid4(), ativo="não é boolean")
-
-def test_excecao_float_invalido(session):
-    """Testa se exceção é levantada quando float é inválido."""
-    class Produto(Model):
-        __table_name__ = 'produtos_float_exceptions'
-        id = fields.UUID(primary_key=True)
-        preco = fields.Float()
-    
-    with pytest.raises(TypeError, match="Não foi possível converter"):
-        Produto.create(id=uuid.uuid4(), preco="não é número")
-
-def test_excecao_set_tipo_invalido(session):
-    """Testa se exceção é levantada quando set contém tipos inválidos."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_set_exceptions'
-        id = fields.UUID(primary_key=True)
-        permissoes = fields.Set(fields.Text())
-    
-    with pytest.raises(TypeError, match="Não foi possível converter item"):
-        Usuario.create(id=uuid.uuid4(), permissoes={"admin", 123, "user"})
-
-def test_excecao_atualizar_campo_inexistente(session):
+def test_excecao_atualizar_campo_inexistente(pre_create_tables, uid):
     """Testa se exceção é levantada quando tentamos atualizar campo inexistente."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_update_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text()
-    
-    # Primeiro sincroniza a tabela
-    Usuario.sync_table()
-    
-    usuario = Usuario.create(id=uuid.uuid4(), nome="João")
+    usuario = UsuarioNome.create(id=uid, nome="João")
     
     with pytest.raises(ValidationError, match="Campo 'campo_inexistente' não existe"):
         usuario.update(campo_inexistente="valor")
 
-def test_excecao_delete_sem_primary_key(session):
+def test_excecao_delete_sem_primary_key(uid):
     """Testa se exceção é levantada quando tentamos deletar com primary key nula."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_delete_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text()
-    
-    Usuario.sync_table()
-    
-    usuario = Usuario(id=uuid.uuid4(), nome="João") # Não salva, apenas instancia
+    usuario = UsuarioNome(id=uid, nome="João") # Não salva, apenas instancia
     
     # Simula uma PK nula usando setattr para contornar a tipagem
     setattr(usuario, 'id', None)
@@ -257,86 +240,63 @@ def test_excecao_delete_sem_primary_key(session):
     with pytest.raises(ValidationError, match="Primary key 'id' is required to delete, but was None."):
         usuario.delete()
 
-def test_excecao_filtro_sem_operador(session):
+def test_excecao_filtro_sem_operador(session, reset_table, uid):
     """Testa se exceção é levantada quando filtro não tem operador válido."""
     class Usuario(Model):
         __table_name__ = 'usuarios_filter_exceptions'
         id = fields.UUID(primary_key=True)
         nome = fields.Text()
     
-    # Limpa a tabela e sincroniza
-    session.execute(f"DROP TABLE IF EXISTS {Usuario.__table_name__}")
-    Usuario.sync_table()
+    # Limpa a tabela (TRUNCATE se o schema já confere) e sincroniza
+    reset_table(Usuario)
     
     # Cria um usuário para testar
-    Usuario.create(id=uuid.uuid4(), nome="João")
+    Usuario.create(id=uid, nome="João")
     
     # Testa filtro sem operador - deve funcionar com equals implícito
     usuarios = list(Usuario.filter(nome="João"))
     assert len(usuarios) == 1
 
-def test_excecao_campo_inexistente_no_create(session):
+def test_excecao_campo_inexistente_no_create(pre_create_tables, uid):
     """Testa se campos inexistentes são ignorados no create (comportamento atual)."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_ignore_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text()
-    
-    # Primeiro sincroniza a tabela
-    Usuario.sync_table()
-    
     # Campos inexistentes são ignorados (comportamento atual)
-    usuario = Usuario.create(id=uuid.uuid4(), nome="João", campo_inexistente="valor")
+    usuario = UsuarioNome.create(id=uid, nome="João", campo_inexistente="valor")
     assert usuario.nome == "João"
     assert not hasattr(usuario, 'campo_inexistente')
 
-def test_excecao_acesso_campo_inexistente(session):
+def test_excecao_acesso_campo_inexistente(pre_create_tables, uid):
     """Testa se exceção é levantada quando tentamos acessar campo que não existe."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_access_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text()
-    
-    Usuario.sync_table()
-    usuario = Usuario.create(id=uuid.uuid4(), nome="João")
+    usuario = UsuarioNome.create(id=uid, nome="João")
     
     with pytest.raises(AttributeError):
         _ = getattr(usuario, 'campo_inexistente')
 
-def test_excecao_atribuicao_campo_inexistente(session):
+def test_excecao_atribuicao_campo_inexistente(pre_create_tables, uid):
     """Testa se exceção é levantada quando tentamos atribuir a campo inexistente."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_assign_exceptions'
-        id = fields.UUID(primary_key=True)
-        nome = fields.Text()
-    
-    Usuario.sync_table()
-    usuario = Usuario.create(id=uuid.uuid4(), nome="João")
+    usuario = UsuarioNome.create(id=uid, nome="João")
     
     # Atribuição a campo inexistente deve funcionar (comportamento atual)
     setattr(usuario, 'campo_inexistente', "valor")
     assert getattr(usuario, 'campo_inexistente') == "valor"
 
-def test_excecao_primary_key_none(session):
+def test_excecao_primary_key_none():
     """Testa se exceção é levantada quando primary key é None no create."""
-    class Usuario(Model):
-        __table_name__ = 'usuarios_pk_none_exceptions'
-        # Desabilita o gerador de UUID padrão para permitir None no teste
-        id = fields.UUID(primary_key=True, default=None)
-        nome = fields.Text()
-    
-    Usuario.sync_table()
-    
     # A validação agora está em save(), que é chamado por create()
-    with pytest.raises(ValidationError, match="Primary key 'id' cannot be None before saving."):
-        Usuario.create(id=None, nome="João")
+    with pytest.raises(ValidationError, match=_MSG['pk_none_save']):
+        Item.create(id=None, nome="João")
 
-def test_excecao_campo_required_none(session):
-    """Testa se exceção é levantada quando campo required é None."""
+def test_excecao_bulk_create_agrega_erros():
+    """Testa se bulk_create reporta todos os registros inválidos em uma única exceção."""
     class Usuario(Model):
-        __table_name__ = 'usuarios_required_none_exceptions'
+        __table_name__ = 'usuarios_bulk_exceptions'
         id = fields.UUID(primary_key=True)
         nome = fields.Text(required=True)
     
-    with pytest.raises(ValidationError, match="Campo 'nome' é obrigatório"):
-        Usuario.create(id=uuid.uuid4(), nome=None)
\ No newline at end of file
+    registros = [
+        {'id': uuid.uuid4(), 'nome': 'Ana'},
+        {'id': uuid.uuid4()},
+        {'id': uuid.uuid4(), 'nome': None},
+        {'id': 'nao-e-uuid', 'nome': 'Bia'},
+    ]
+    with pytest.raises(ValidationError, match=r"3 registro\(s\) inválido\(s\).*#1: Campo 'nome' é obrigatório.*#2:.*#3: Campo 'id' inválido"):
+        Usuario.bulk_create(registros)
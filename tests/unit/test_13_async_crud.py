@@ -4,12 +4,17 @@ Testes unitários para operações CRUD assíncronas da CaspyORM.
 
 import pytest
 import asyncio
-from typing import Dict, Any
-from unittest.mock import AsyncMock, patch, MagicMock
+import uuid
+from collections import namedtuple
+from typing import Dict, Any, List, Optional
 
+import caspyorm.connection
+import caspyorm.query
 from caspyorm.model import Model
 from caspyorm.fields import Text, Integer, UUID
 from caspyorm.exceptions import ValidationError
+from cassandra import ConsistencyLevel
+from cassandra.query import BatchStatement, BatchType
 
 
 class TestUser(Model):
@@ -20,13 +25,118 @@ class TestUser(Model):
     age = Integer(required=False)
 
 
+# --- Sessão falsa ----------------------------------------------------------
+# Imita só a parte da API do driver usada pela CaspyORM (prepare/bind,
+# execute/execute_async e o ResponseFuture). Mais leve que uma árvore de
+# MagicMock/AsyncMock e fiel ao driver: execute_async não é uma coroutine.
+
+class FakeResultSet:
+    """Linhas como namedtuples, na ordem de `column_names` (como o driver)."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.column_names = list(rows[0]) if rows else []
+        row_type = namedtuple('Row', self.column_names)
+        self._rows = [row_type(*row.values()) for row in rows]
+        self.current_rows = self._rows
+        self.paging_state = None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def one(self) -> Optional[tuple]:
+        return self._rows[0] if self._rows else None
+
+
+class FakeResponseFuture:
+    # Atributos lidos pelo ResultSet que execute_concurrent monta
+    has_more_pages = False
+    _col_names = None
+    _col_types = None
+    _paging_state = None
+
+    def __init__(self, result_set: FakeResultSet):
+        self._result_set = result_set
+
+    def result(self) -> FakeResultSet:
+        return self._result_set
+
+    # Usados por execute_concurrent
+    def add_callbacks(self, callback, errback, callback_args=(), callback_kwargs=None,
+                      errback_args=(), errback_kwargs=None):
+        callback(self._result_set, *callback_args, **(callback_kwargs or {}))
+
+    def clear_callbacks(self):
+        pass
+
+
+class FakePrepared:
+    # Atributos lidos pelo BatchStatement ao receber o statement ligado
+    keyspace = None
+    routing_key = None
+    custom_payload = None
+
+    def __init__(self, cql: str):
+        self.query_string = cql
+        self.fetch_size = None
+
+    def bind(self, params):
+        return FakeBound(self, params)
+
+
+class FakeBound:
+    """Statement ligado: guarda os valores, como o BoundStatement do driver."""
+    keyspace = None
+    routing_key = None
+    custom_payload = None
+
+    def __init__(self, prepared: FakePrepared, values):
+        self.prepared_statement = prepared
+        self.query_string = prepared.query_string
+        self.values = values
+        self.consistency_level = None
+
+
+class FakeAsyncSession:
+    keyspace = None
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self.prepare_error: Optional[Exception] = None
+        # Contadores para as asserções de quantidade; as listas guardam os
+        # argumentos para os testes que os inspecionam
+        self.prepare_calls = 0
+        self.exec_calls = 0
+        self.prepared: List[str] = []
+        self.executed: List[tuple] = []
+
+    def prepare(self, cql: str) -> FakePrepared:
+        if self.prepare_error is not None:
+            raise self.prepare_error
+        self.prepare_calls += 1
+        self.prepared.append(cql)
+        return FakePrepared(cql)
+
+    def execute(self, statement, parameters=None, **kwargs) -> FakeResultSet:
+        self.exec_calls += 1
+        self.executed.append((statement, parameters))
+        return FakeResultSet(self.rows)
+
+    def execute_async(self, statement, parameters=None, **kwargs) -> FakeResponseFuture:
+        self.exec_calls += 1
+        self.executed.append((statement, parameters))
+        return FakeResponseFuture(FakeResultSet(self.rows))
+
+
 @pytest.fixture
-def mock_async_session():
-    """Mock para sessão assíncrona do Cassandra."""
-    with patch('caspyorm.query.get_async_session') as mock_get_session:
-        session = AsyncMock()
-        mock_get_session.return_value = session
-        yield session
+def mock_async_session(monkeypatch):
+    """Sessão falsa no lugar das sessões síncrona e assíncrona do Cassandra."""
+    session = FakeAsyncSession()
+    def get_fake_session():
+        return session
+    monkeypatch.setattr(caspyorm.query, "get_async_session", get_fake_session)
+    monkeypatch.setattr(caspyorm.query, "get_session", get_fake_session)
+    monkeypatch.setattr(caspyorm.connection, "get_async_session", get_fake_session)
+    return session
 
 
 @pytest.fixture
@@ -48,25 +158,46 @@ class TestAsyncCRUD:
         """Testa salvamento assíncrono bem-sucedido."""
         user = TestUser(**sample_user_data)
         
-        # Mock do prepare e execute_async
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        mock_async_session.execute_async.return_value = result_mock
-        
         # Executar save_async
         await user.save_async()
         
         # Verificar se a sessão foi preparada e executada
-        mock_async_session.prepare.assert_called_once()
-        mock_async_session.execute_async.assert_called_once()
-        result_mock.result.assert_called_once()
+        assert mock_async_session.prepare_calls == 1
+        assert mock_async_session.exec_calls == 1
+        
+        # O INSERT da classe recebe os valores na ordem dos campos
+        assert mock_async_session.prepared == [TestUser.__caspy_insert_cql__]
+        _, params = mock_async_session.executed[0]
+        assert [str(params[0]), *params[1:]] == [sample_user_data[name] for name in TestUser.__caspy_field_names__]
+
+    @pytest.mark.asyncio
+    async def test_save_async_reuses_prepared_statement(self, mock_async_session):
+        """Testa que salvamentos repetidos preparam o INSERT uma única vez."""
+        for i in range(3):
+            user = TestUser(id=str(uuid.UUID(int=i)), name=f'User {i}', email=f'user{i}@example.com')
+            await user.save_async()
+        
+        assert mock_async_session.prepare_calls == 1
+        assert mock_async_session.exec_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_save_async_follows_reassigned_table_name(self, mock_async_session):
+        """Testa que o INSERT usa o `__table_name__` atual, mesmo reatribuído."""
+        class RenamedUser(Model):
+            __table_name__ = "renamed_users_old"
+            id = UUID(primary_key=True)
+            name = Text()
+        
+        RenamedUser.__table_name__ = "renamed_users_new"
+        await RenamedUser(id=uuid.uuid4(), name='Ana').save_async()
+        
+        assert mock_async_session.prepared == ["INSERT INTO renamed_users_new (id, name) VALUES (?, ?)"]
 
     @pytest.mark.asyncio
     async def test_save_async_without_primary_key(self, mock_async_session):
         """Testa erro ao salvar sem chave primária."""
         user = TestUser(name='João', email='joao@example.com')
+        user.id = None  # O id é gerado pelo default uuid4; remove-o explicitamente
         
         with pytest.raises(ValidationError, match="Primary key 'id' cannot be None"):
             await user.save_async()
@@ -74,78 +205,69 @@ class TestAsyncCRUD:
     @pytest.mark.asyncio
     async def test_create_async_success(self, mock_async_session, sample_user_data):
         """Testa criação assíncrona bem-sucedida."""
-        # Mock do prepare e execute_async
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        mock_async_session.execute_async.return_value = result_mock
-        
         # Executar create_async
         user = await TestUser.create_async(**sample_user_data)
         
         # Verificar se é uma instância válida
         assert isinstance(user, TestUser)
-        assert user.id == sample_user_data['id']
+        assert str(user.id) == sample_user_data['id']
         assert user.name == sample_user_data['name']
         assert user.email == sample_user_data['email']
         assert user.age == sample_user_data['age']
         
         # Verificar se save_async foi chamado
-        mock_async_session.prepare.assert_called_once()
-        mock_async_session.execute_async.assert_called_once()
+        assert mock_async_session.prepare_calls == 1
+        assert mock_async_session.exec_calls == 1
 
     @pytest.mark.asyncio
-    async def test_get_async_success(self, mock_async_session, sample_user_data):
-        """Testa busca assíncrona bem-sucedida."""
-        # Mock do resultado da query
-        row_mock = MagicMock()
-        row_mock._asdict.return_value = sample_user_data
-        
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = [row_mock]
-        result_set_mock.one.return_value = row_mock
+    @pytest.mark.parametrize("fetch", [
+        lambda data: TestUser.get_async(id=data['id']),
+        lambda data: TestUser.filter(name=data['name']).first_async(),
+    ], ids=["get_async", "first_async"])
+    async def test_fetch_one_async_found(self, mock_async_session, sample_user_data, fetch):
+        """Testa get_async/first_async retornando a instância da primeira linha."""
+        mock_async_session.rows = [sample_user_data]
         
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
+        user = await fetch(sample_user_data)
         
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
-        
-        # Executar get_async
-        user = await TestUser.get_async(id=sample_user_data['id'])
-        
-        # Verificar resultado
-        assert user is not None
         assert isinstance(user, TestUser)
-        assert user.id == sample_user_data['id']
+        assert str(user.id) == sample_user_data['id']
         assert user.name == sample_user_data['name']
 
     @pytest.mark.asyncio
-    async def test_get_async_not_found(self, mock_async_session):
-        """Testa busca assíncrona quando registro não é encontrado."""
-        # Mock do resultado vazio
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = []
-        result_set_mock.one.side_effect = Exception("No rows returned")
+    @pytest.mark.parametrize("fetch", [
+        lambda: TestUser.get_async(id='550e8400-e29b-41d4-a716-446655449999'),
+        lambda: TestUser.filter(name='Non-existent').first_async(),
+    ], ids=["get_async", "first_async"])
+    async def test_fetch_one_async_not_found(self, mock_async_session, fetch):
+        """Testa get_async/first_async retornando None quando não há linhas."""
+        mock_async_session.rows = []
         
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
+        assert await fetch() is None
+
+    @pytest.mark.asyncio
+    async def test_get_async_maps_columns_by_name(self, mock_async_session, sample_user_data):
+        """Testa que as colunas são mapeadas por nome, na ordem devolvida pelo Cassandra."""
+        # Chave de partição primeiro e demais colunas em ordem alfabética
+        mock_async_session.rows = [{
+            'id': sample_user_data['id'],
+            'age': sample_user_data['age'],
+            'email': sample_user_data['email'],
+            'name': sample_user_data['name'],
+        }]
         
-        # Executar get_async
-        user = await TestUser.get_async(id='non-existent-id')
+        user = await TestUser.get_async(id=sample_user_data['id'])
         
-        # Verificar que retorna None
-        assert user is None
+        assert str(user.id) == sample_user_data['id']
+        assert user.name == sample_user_data['name']
+        assert user.email == sample_user_data['email']
+        assert user.age == sample_user_data['age']
 
     @pytest.mark.asyncio
-    async def test_bulk_create_async_success(self, mock_async_session):
+    async def test_bulk_create_async_success(self, mock_async_session, monkeypatch):
         """Testa criação em lote assíncrona bem-sucedida."""
+        # Só a sessão assíncrona pode ser usada: o caminho síncrono bloquearia o loop
+        monkeypatch.setattr(caspyorm.query, "get_session", lambda: None)
         users_data = [
             {
                 'id': '550e8400-e29b-41d4-a716-446655440001',
@@ -163,13 +285,6 @@ class TestAsyncCRUD:
         
         users = [TestUser(**data) for data in users_data]
         
-        # Mock do prepare e execute_async
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        mock_async_session.execute_async.return_value = result_mock
-        
         # Executar bulk_create_async
         result_users = await TestUser.bulk_create_async(users)
         
@@ -179,8 +294,12 @@ class TestAsyncCRUD:
         assert result_users[0].name == 'João Silva'
         assert result_users[1].name == 'Maria Santos'
         
-        # Verificar se execute_async foi chamado
-        mock_async_session.execute_async.assert_called()
+        # Um único prepare para o lote; uma execução por linha
+        assert mock_async_session.prepare_calls == 1
+        assert mock_async_session.exec_calls == 2
+        sent = [[str(statement.values[0]), *statement.values[1:]] for statement, _ in mock_async_session.executed]
+        assert sent == [[data[name] for name in TestUser.__caspy_field_names__] for data in users_data]
+        assert all(statement.consistency_level == ConsistencyLevel.QUORUM for statement, _ in mock_async_session.executed)
 
     @pytest.mark.asyncio
     async def test_bulk_create_async_empty_list(self, mock_async_session):
@@ -191,21 +310,14 @@ class TestAsyncCRUD:
         assert result_users == []
         
         # Verificar que não foi feita nenhuma chamada ao banco
-        mock_async_session.prepare.assert_not_called()
-        mock_async_session.execute_async.assert_not_called()
+        assert mock_async_session.prepare_calls == 0
+        assert mock_async_session.exec_calls == 0
 
     @pytest.mark.asyncio
     async def test_update_async_success(self, mock_async_session, sample_user_data):
         """Testa atualização assíncrona bem-sucedida."""
         user = TestUser(**sample_user_data)
         
-        # Mock do prepare e execute_async
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        mock_async_session.execute_async.return_value = result_mock
-        
         # Executar update_async
         updated_user = await user.update_async(name='João Silva Atualizado', age=31)
         
@@ -214,8 +326,8 @@ class TestAsyncCRUD:
         assert updated_user.age == 31
         assert updated_user.email == sample_user_data['email']  # Não alterado
         
-        # Verificar se execute_async foi chamado
-        mock_async_session.execute_async.assert_called_once()
+        # Verificar se a atualização foi executada
+        assert mock_async_session.exec_calls == 1
 
     @pytest.mark.asyncio
     async def test_update_async_invalid_field(self, mock_async_session, sample_user_data):
@@ -230,35 +342,17 @@ class TestAsyncCRUD:
         """Testa deleção assíncrona bem-sucedida."""
         user = TestUser(**sample_user_data)
         
-        # Mock do prepare e execute_async
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        mock_async_session.execute_async.return_value = result_mock
-        
         # Executar delete_async
         await user.delete_async()
         
-        # Verificar se execute_async foi chamado
-        mock_async_session.execute_async.assert_called_once()
+        # Verificar se a deleção foi executada
+        assert mock_async_session.exec_calls == 1
 
     @pytest.mark.asyncio
     async def test_filter_async_success(self, mock_async_session, sample_user_data):
         """Testa filtro assíncrono bem-sucedido."""
-        # Mock do resultado da query
-        row_mock = MagicMock()
-        row_mock._asdict.return_value = sample_user_data
-        
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = [row_mock]
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
+        # Resultado da query
+        mock_async_session.rows = [sample_user_data]
         
         # Executar filter com all_async
         queryset = TestUser.filter(name='João Silva')
@@ -269,25 +363,14 @@ class TestAsyncCRUD:
         assert isinstance(results[0], TestUser)
         assert results[0].name == 'João Silva'
         
-        # Verificar se execute_async foi chamado
-        mock_async_session.execute_async.assert_called_once()
+        # Verificar se a query foi executada
+        assert mock_async_session.exec_calls == 1
 
     @pytest.mark.asyncio
     async def test_count_async_success(self, mock_async_session):
         """Testa contagem assíncrona bem-sucedida."""
-        # Mock do resultado da query COUNT
-        row_mock = MagicMock()
-        row_mock.count = 5
-        
-        result_set_mock = MagicMock()
-        result_set_mock.one.return_value = row_mock
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
+        # Resultado da query COUNT
+        mock_async_session.rows = [{'count': 5}]
         
         # Executar count_async
         queryset = TestUser.filter(age=30)
@@ -296,100 +379,21 @@ class TestAsyncCRUD:
         # Verificar resultado
         assert count == 5
         
-        # Verificar se execute_async foi chamado
-        mock_async_session.execute_async.assert_called_once()
+        # Verificar se a query foi executada
+        assert mock_async_session.exec_calls == 1
 
     @pytest.mark.asyncio
-    async def test_exists_async_true(self, mock_async_session):
-        """Testa exists_async retornando True."""
-        # Mock do resultado da query
-        row_mock = MagicMock()
-        row_mock._asdict.return_value = {'id': 'test-id'}
-        
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = [row_mock]
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
+    @pytest.mark.parametrize("rows, expected", [
+        ([{'id': '550e8400-e29b-41d4-a716-446655440000'}], True),
+        ([], False),
+    ], ids=["encontrado", "vazio"])
+    async def test_exists_async(self, mock_async_session, rows, expected):
+        """Testa exists_async com e sem linhas no resultado."""
+        mock_async_session.rows = rows
         
-        # Executar exists_async
-        queryset = TestUser.filter(name='João')
-        exists = await queryset.exists_async()
+        exists = await TestUser.filter(name='João').exists_async()
         
-        # Verificar resultado
-        assert exists is True
-
-    @pytest.mark.asyncio
-    async def test_exists_async_false(self, mock_async_session):
-        """Testa exists_async retornando False."""
-        # Mock do resultado vazio
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = []
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
-        
-        # Executar exists_async
-        queryset = TestUser.filter(name='Non-existent')
-        exists = await queryset.exists_async()
-        
-        # Verificar resultado
-        assert exists is False
-
-    @pytest.mark.asyncio
-    async def test_first_async_success(self, mock_async_session, sample_user_data):
-        """Testa first_async bem-sucedido."""
-        # Mock do resultado da query
-        row_mock = MagicMock()
-        row_mock._asdict.return_value = sample_user_data
-        
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = [row_mock]
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
-        
-        # Executar first_async
-        queryset = TestUser.filter(name='João')
-        user = await queryset.first_async()
-        
-        # Verificar resultado
-        assert user is not None
-        assert isinstance(user, TestUser)
-        assert user.name == 'João Silva'
-
-    @pytest.mark.asyncio
-    async def test_first_async_none(self, mock_async_session):
-        """Testa first_async retornando None."""
-        # Mock do resultado vazio
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = []
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
-        
-        # Executar first_async
-        queryset = TestUser.filter(name='Non-existent')
-        user = await queryset.first_async()
-        
-        # Verificar resultado
-        assert user is None
+        assert exists is expected
 
 
 class TestAsyncErrorHandling:
@@ -400,8 +404,8 @@ class TestAsyncErrorHandling:
         """Testa erro de conexão durante save_async."""
         user = TestUser(**sample_user_data)
         
-        # Mock do erro de conexão
-        mock_async_session.prepare.side_effect = Exception("Connection failed")
+        # Simula o erro de conexão
+        mock_async_session.prepare_error = Exception("Connection failed")
         
         with pytest.raises(Exception, match="Connection failed"):
             await user.save_async()
@@ -410,13 +414,29 @@ class TestAsyncErrorHandling:
     async def test_bulk_create_async_with_invalid_data(self, mock_async_session):
         """Testa erro durante bulk_create_async com dados inválidos."""
         users = [
-            TestUser(id='valid-id', name='João', email='joao@example.com'),
-            TestUser(name='Maria', email='maria@example.com')  # Sem ID
+            TestUser(id='550e8400-e29b-41d4-a716-446655440003', name='João', email='joao@example.com'),
+            TestUser(name='Maria', email='maria@example.com')
         ]
+        users[1].id = None  # Sem ID (o default uuid4 já o teria preenchido)
         
         with pytest.raises(ValueError, match="Primary key 'id' não pode ser nula"):
             await TestUser.bulk_create_async(users)
 
+    @pytest.mark.asyncio
+    async def test_bulk_create_async_null_pk_before_prepare(self, mock_async_session):
+        """Testa que a PK nula é detectada antes de preparar ou enviar qualquer statement."""
+        users = [
+            TestUser(id=str(uuid.UUID(int=i)), name=f'User {i}', email=f'user{i}@example.com')
+            for i in range(3)
+        ]
+        users[2].id = None
+        
+        with pytest.raises(ValueError, match="Primary key 'id' não pode ser nula"):
+            await TestUser.bulk_create_async(users)
+        
+        assert mock_async_session.prepare_calls == 0
+        assert mock_async_session.exec_calls == 0
+
     @pytest.mark.asyncio
     async def test_update_async_validation_error(self, mock_async_session, sample_user_data):
         """Testa erro de validação durante update_async."""
@@ -432,46 +452,42 @@ class TestAsyncPerformance:
 
     @pytest.mark.asyncio
     async def test_concurrent_save_async(self, mock_async_session):
-        """Testa salvamento concorrente de múltiplas instâncias."""
+        """Testa salvamento de múltiplas instâncias em UNLOGGED BATCHes."""
         users = [
             TestUser(
-                id=f'user-{i}',
+                id=str(uuid.UUID(int=i)),
                 name=f'User {i}',
                 email=f'user{i}@example.com'
             )
-            for i in range(5)
+            for i in range(250)
         ]
         
-        # Mock do prepare e execute_async
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
+        saved = await TestUser.bulk_save_async(users)
         
-        result_mock = MagicMock()
-        mock_async_session.execute_async.return_value = result_mock
+        # Um único INSERT preparado e um execute_async por lote de 100 usuários
+        assert saved == users
+        assert mock_async_session.prepare_calls == 1
+        assert mock_async_session.exec_calls == 3
+        batches = [statement for statement, _ in mock_async_session.executed]
+        assert all(isinstance(batch, BatchStatement) for batch in batches)
+        assert all(batch.batch_type == BatchType.UNLOGGED for batch in batches)
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+
+    @pytest.mark.asyncio
+    async def test_bulk_save_async_rejects_large_batches(self, mock_async_session):
+        """Testa que lotes acima de 100 statements são rejeitados."""
+        user = TestUser(id=str(uuid.UUID(int=1)), name='User', email='user@example.com')
         
-        # Executar saves concorrentes
-        tasks = [user.save_async() for user in users]
-        await asyncio.gather(*tasks)
+        with pytest.raises(ValueError, match="batch_size"):
+            await TestUser.bulk_save_async([user], batch_size=1000)
         
-        # Verificar que execute_async foi chamado 5 vezes
-        assert mock_async_session.execute_async.call_count == 5
+        assert mock_async_session.exec_calls == 0
 
     @pytest.mark.asyncio
     async def test_concurrent_queries(self, mock_async_session):
         """Testa execução concorrente de queries."""
-        # Mock do resultado
-        row_mock = MagicMock()
-        row_mock._asdict.return_value = {'id': 'test', 'name': 'Test'}
-        
-        result_set_mock = MagicMock()
-        result_set_mock.__iter__.return_value = [row_mock]
-        
-        prepared = MagicMock()
-        mock_async_session.prepare.return_value = prepared
-        
-        result_mock = MagicMock()
-        result_mock.result.return_value = result_set_mock
-        mock_async_session.execute_async.return_value = result_mock
+        # Resultado de cada query
+        mock_async_session.rows = [{'id': '550e8400-e29b-41d4-a716-446655440000', 'name': 'Test'}]
         
         # Executar queries concorrentes
         tasks = [
@@ -483,4 +499,3 @@ class TestAsyncPerformance:
         # Verificar que todas as queries foram executadas
         assert len(results) == 3
         assert all(len(result) == 1 for result in results)
-        assert mock_async_session.execute_async.call_count == 3 
\ No newline at end of file
@@ -11,26 +11,31 @@ from datetime import datetime
 from caspyorm import Model
 from caspyorm.fields import Text, Integer, UUID, Timestamp, List, Set
 from caspyorm.exceptions import ValidationError
+from caspyorm.utils import bulk_uuids
+
+@pytest.fixture(scope="module")
+def dynamic_user_model():
+    """Modelo criado dinamicamente uma única vez e compartilhado pelos testes do módulo."""
+    return Model.create_model(
+        name="TestUser",
+        fields={
+            "id": UUID(primary_key=True),
+            "name": Text(required=True),
+            "email": Text(index=True),
+            "age": Integer(),
+            "created_at": Timestamp(default=datetime.now),
+            "tags": List(Text()),
+            "roles": Set(Text())
+        },
+        table_name="test_users"
+    )
 
 class TestImprovements:
     """Testes para as melhorias implementadas."""
     
-    def test_create_model_dynamic(self):
+    def test_create_model_dynamic(self, dynamic_user_model):
         """Testa a criação dinâmica de modelos."""
-        # Criar modelo dinamicamente
-        UserModel = Model.create_model(
-            name="TestUser",
-            fields={
-                "id": UUID(primary_key=True),
-                "name": Text(required=True),
-                "email": Text(index=True),
-                "age": Integer(),
-                "created_at": Timestamp(default=datetime.now),
-                "tags": List(Text()),
-                "roles": Set(Text())
-            },
-            table_name="test_users"
-        )
+        UserModel = dynamic_user_model
         
         # Verificar se o modelo foi criado corretamente
         assert UserModel.__name__ == "TestUser"
@@ -53,8 +58,6 @@ class TestImprovements:
         assert UserModel.model_fields["name"].python_type == str
         assert UserModel.model_fields["age"].python_type == int
         assert UserModel.model_fields["created_at"].python_type == datetime
-        
-        return UserModel
     
     def test_create_model_validation(self):
         """Testa a validação na criação dinâmica de modelos."""
@@ -68,9 +71,9 @@ class TestImprovements:
                 }
             )
     
-    def test_dynamic_model_instantiation(self):
+    def test_dynamic_model_instantiation(self, dynamic_user_model):
         """Testa a instanciação de modelos criados dinamicamente."""
-        UserModel = self.test_create_model_dynamic()
+        UserModel = dynamic_user_model
         
         # Criar instância válida
         user_id = uuid.uuid4()
@@ -95,9 +98,9 @@ class TestImprovements:
         assert user.created_at is not None
         assert isinstance(user.created_at, datetime)
     
-    def test_dynamic_model_validation(self):
+    def test_dynamic_model_validation(self, dynamic_user_model):
         """Testa a validação em modelos criados dinamicamente."""
-        UserModel = self.test_create_model_dynamic()
+        UserModel = dynamic_user_model
         
         # Teste com campo obrigatório faltando
         with pytest.raises(ValidationError, match="Campo 'name' é obrigatório"):
@@ -116,9 +119,9 @@ class TestImprovements:
             )
     
     @pytest.mark.asyncio
-    async def test_save_async_uses_save_instance_async(self, monkeypatch):
+    async def test_save_async_uses_save_instance_async(self, monkeypatch, dynamic_user_model):
         """Testa se save_async() usa save_instance_async() internamente."""
-        UserModel = self.test_create_model_dynamic()
+        UserModel = dynamic_user_model
         
         # Mock da função save_instance_async
         async def mock_save_instance_async(instance):
@@ -167,9 +170,9 @@ class TestImprovements:
         
         assert UserModel.__table_name__ == "defaultusers"  # name.lower() + 's'
     
-    def test_dynamic_model_repr(self):
+    def test_dynamic_model_repr(self, dynamic_user_model):
         """Testa a representação string de modelos dinâmicos."""
-        UserModel = self.test_create_model_dynamic()
+        UserModel = dynamic_user_model
         
         user = UserModel(
             id=uuid.uuid4(),
@@ -184,9 +187,9 @@ class TestImprovements:
         assert "email='test@example.com'" in repr_str
         assert "age=25" in repr_str
     
-    def test_dynamic_model_model_dump(self):
+    def test_dynamic_model_model_dump(self, dynamic_user_model):
         """Testa o método model_dump() em modelos dinâmicos."""
-        UserModel = self.test_create_model_dynamic()
+        UserModel = dynamic_user_model
         
         user_id = uuid.uuid4()
         user = UserModel(
@@ -206,4 +209,11 @@ class TestImprovements:
         assert data["age"] == 25
         assert data["tags"] == ["tag1", "tag2"]
         assert data["roles"] == {"user"}
-        assert "created_at" in data  # Campo com default 
\ No newline at end of file
+        assert "created_at" in data  # Campo com default
+
+    def test_bulk_uuids(self):
+        """Testa a geração de UUIDs v4 em lote."""
+        ids = bulk_uuids(50)
+        assert len(set(ids)) == 50
+        assert all(u.version == 4 and u.variant == uuid.RFC_4122 for u in ids)
+        assert bulk_uuids(0) == []
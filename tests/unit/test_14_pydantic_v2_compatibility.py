@@ -9,6 +9,36 @@ from datetime import datetime
 from caspyorm import Model
 from caspyorm.fields import Text, Integer, UUID, Timestamp, List, Set
 
+
+# Modelos definidos uma vez por módulo: os modelos Pydantic gerados ficam em
+# cache na classe e são reaproveitados entre os testes.
+class UserModel(Model):
+    id = UUID(primary_key=True)
+    name = Text(required=True)
+    email = Text(index=True)
+    age = Integer()
+    created_at = Timestamp(default=datetime.now)
+    tags = List(Text())
+    scores = Set(Integer())
+    internal_field = Text()  # Campo a ser excluído
+
+
+class ComplexModel(Model):
+    id = UUID(primary_key=True)
+    name = Text(required=True)
+    tags = List(Text())
+    scores = Set(Integer())
+    metadata = Text()  # Simular campo adicional
+
+
+class TypeTestModel(Model):
+    id = UUID(primary_key=True)
+    name = Text(required=True)
+    age = Integer()
+    score = Integer()
+    active = Text()  # Simular boolean como text
+
+
 class TestPydanticV2Compatibility:
     """Testes para compatibilidade com Pydantic v2."""
     
@@ -19,24 +49,29 @@ class TestPydanticV2Compatibility:
         # Deve ser True se pydantic estiver instalado
         assert isinstance(PYDANTIC_V2, bool)
     
+    def test_pydantic_v1_erro_de_versao(self, monkeypatch):
+        """Testa se o Pydantic v1 gera um erro de versão, e não de pacote ausente."""
+        import pydantic
+        from caspyorm._internal import serialization
+        
+        monkeypatch.setattr(pydantic, 'VERSION', '1.10.13')
+        serialization._pydantic.cache_clear()
+        try:
+            with pytest.raises(ImportError, match=r"Pydantic v2 \(versão instalada: 1\.10\.13\)"):
+                serialization._require_pydantic()
+        finally:
+            monkeypatch.undo()
+            serialization._pydantic.cache_clear()
+        assert serialization._require_pydantic() is not None
+    
     def test_pydantic_model_generation(self):
         """Testa a geração de modelos Pydantic."""
-        # Criar modelo CaspyORM
-        class UserModel(Model):
-            id = UUID(primary_key=True)
-            name = Text(required=True)
-            email = Text(index=True)
-            age = Integer()
-            created_at = Timestamp(default=datetime.now)
-            tags = List(Text())
-            scores = Set(Integer())
-        
         # Gerar modelo Pydantic
         PydanticUser = UserModel.as_pydantic(name="PydanticUser")
         
         # Verificar se o modelo foi criado
         assert PydanticUser is not None
-        assert hasattr(PydanticUser, '__fields__') or hasattr(PydanticUser, 'model_fields')
+        assert hasattr(PydanticUser, 'model_fields')
         
         # Testar instanciação
         user_data = {
@@ -59,13 +94,6 @@ class TestPydanticV2Compatibility:
     
     def test_pydantic_model_with_exclusions(self):
         """Testa a geração de modelos Pydantic com exclusões."""
-        class UserModel(Model):
-            id = UUID(primary_key=True)
-            name = Text(required=True)
-            email = Text(index=True)
-            age = Integer()
-            internal_field = Text()  # Campo a ser excluído
-        
         # Gerar modelo Pydantic excluindo campo interno
         PydanticUser = UserModel.as_pydantic(
             name="PydanticUserExcluded", 
@@ -73,13 +101,7 @@ class TestPydanticV2Compatibility:
         )
         
         # Verificar se o campo foi excluído
-        field_names = []
-        if hasattr(PydanticUser, '__fields__'):
-            # Pydantic v1
-            field_names = list(PydanticUser.__fields__.keys())
-        elif hasattr(PydanticUser, 'model_fields'):
-            # Pydantic v2
-            field_names = list(PydanticUser.model_fields.keys())
+        field_names = PydanticUser.model_fields
         
         assert "internal_field" not in field_names
         assert "id" in field_names
@@ -89,12 +111,6 @@ class TestPydanticV2Compatibility:
     
     def test_pydantic_model_validation(self):
         """Testa a validação de modelos Pydantic gerados."""
-        class UserModel(Model):
-            id = UUID(primary_key=True)
-            name = Text(required=True)
-            email = Text(index=True)
-            age = Integer()
-        
         PydanticUser = UserModel.as_pydantic()
         
         # Testar validação com dados válidos
@@ -121,13 +137,6 @@ class TestPydanticV2Compatibility:
     
     def test_pydantic_model_serialization(self):
         """Testa a serialização de modelos Pydantic."""
-        class UserModel(Model):
-            id = UUID(primary_key=True)
-            name = Text(required=True)
-            email = Text(index=True)
-            age = Integer()
-            created_at = Timestamp(default=datetime.now)
-        
         # Criar instância CaspyORM
         caspy_user = UserModel(
             id=uuid.uuid4(),
@@ -145,21 +154,25 @@ class TestPydanticV2Compatibility:
         assert pydantic_user.age == 30
         
         # Testar serialização para dict
-        user_dict = pydantic_user.model_dump() if hasattr(pydantic_user, 'model_dump') else pydantic_user.dict()
+        user_dict = pydantic_user.model_dump()
         
         assert user_dict["name"] == "Serialization Test"
         assert user_dict["email"] == "serial@example.com"
         assert user_dict["age"] == 30
     
+    def test_to_pydantic_model_valida_atributo_reatribuido(self):
+        """Testa se a conversão valida valores reatribuídos (sem validação) na instância."""
+        caspy_user = UserModel(id=uuid.uuid4(), name="Valido")
+        caspy_user.name = 5
+        
+        with pytest.raises(ValueError):  # pydantic.ValidationError
+            caspy_user.to_pydantic_model()
+        
+        # Opt-in explícito: monta sem validar
+        assert caspy_user.to_pydantic_model(validate=False).name == 5
+    
     def test_pydantic_model_with_complex_types(self):
         """Testa modelos Pydantic com tipos complexos."""
-        class ComplexModel(Model):
-            id = UUID(primary_key=True)
-            name = Text(required=True)
-            tags = List(Text())
-            scores = Set(Integer())
-            metadata = Text()  # Simular campo adicional
-        
         # Gerar modelo Pydantic
         PydanticComplex = ComplexModel.as_pydantic()
         
@@ -181,25 +194,10 @@ class TestPydanticV2Compatibility:
     
     def test_pydantic_model_field_types(self):
         """Testa se os tipos de campo são mapeados corretamente."""
-        class TypeTestModel(Model):
-            id = UUID(primary_key=True)
-            name = Text(required=True)
-            age = Integer()
-            score = Integer()
-            active = Text()  # Simular boolean como text
-        
         PydanticTypeTest = TypeTestModel.as_pydantic()
         
         # Verificar tipos dos campos
-        field_types = {}
-        if hasattr(PydanticTypeTest, 'model_fields'):
-            # Pydantic v2
-            for field_name, field in PydanticTypeTest.model_fields.items():
-                field_types[field_name] = field.annotation
-        elif hasattr(PydanticTypeTest, '__fields__'):
-            # Pydantic v1 (deprecated)
-            for field_name, field in PydanticTypeTest.__fields__.items():
-                field_types[field_name] = field.type_
+        field_types = {name: field.annotation for name, field in PydanticTypeTest.model_fields.items()}
         
         # Verificar se os tipos estão corretos
         assert "id" in field_types